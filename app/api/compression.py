@@ -0,0 +1,130 @@
+"""
+Negotiated response compression.
+JSON responses at or above compression_min_bytes are compressed with brotli
+or gzip, whichever the client prefers (brotli on ties). Brotli needs the
+optional brotli package; without it only gzip is offered.
+"""
+import gzip
+from typing import List, Optional
+
+from starlette.datastructures import Headers, MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from app.config import settings
+
+try:
+    import brotli
+except ImportError:
+    brotli = None
+
+COMPRESSIBLE_TYPES = ("application/json",)
+
+
+def available_encodings() -> List[str]:
+    """Supported content codings, most preferred first."""
+    return ["br", "gzip"] if brotli is not None else ["gzip"]
+
+
+def negotiate_encoding(accept_encoding: Optional[str], encodings: Optional[List[str]] = None) -> Optional[str]:
+    """
+    Pick a coding from an Accept-Encoding header.
+
+    Args:
+        accept_encoding: Header value, e.g. "gzip, deflate, br;q=0.9"
+        encodings: Codings on offer, most preferred first (default available_encodings())
+
+    Returns:
+        The acceptable coding with the highest q-value, or None for identity
+    """
+    if not accept_encoding:
+        return None
+    qualities = {}
+    for part in accept_encoding.split(","):
+        coding, _, params = part.strip().partition(";")
+        quality = 1.0
+        params = params.strip()
+        if params.startswith("q="):
+            try:
+                quality = float(params[2:])
+            except ValueError:
+                quality = 0.0
+        qualities[coding.strip().lower()] = quality
+
+    best, best_quality = None, 0.0
+    for coding in encodings or available_encodings():
+        quality = qualities.get(coding, qualities.get("*", 0.0))
+        if quality > best_quality:
+            best, best_quality = coding, quality
+    return best
+
+
+def compress(body: bytes, encoding: str, level: Optional[int] = None) -> bytes:
+    """
+    body in the given coding.
+
+    Args:
+        level: gzip level (1-9) or brotli quality (0-11); defaults to the
+            compression_gzip_level/compression_brotli_quality settings
+    """
+    if encoding == "br":
+        quality = settings.compression_brotli_quality if level is None else level
+        return brotli.compress(body, quality=quality)
+    if encoding == "gzip":
+        return gzip.compress(body, compresslevel=settings.compression_gzip_level if level is None else level, mtime=0)
+    raise ValueError(f"Unsupported content coding: {encoding}")
+
+
+class CompressionMiddleware:
+    """
+    ASGI middleware compressing complete JSON response bodies. Streaming
+    responses and responses that already carry a Content-Encoding pass
+    through unchanged.
+    """
+
+    def __init__(self, app: ASGIApp, minimum_size: Optional[int] = None):
+        self.app = app
+        self.minimum_size = settings.compression_min_bytes if minimum_size is None else minimum_size
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        encoding = negotiate_encoding(Headers(scope=scope).get("accept-encoding"))
+        start = None  # type: Optional[Message]
+        passthrough = False
+
+        async def send_compressed(message: Message):
+            nonlocal start, passthrough
+            if passthrough:
+                await send(message)
+                return
+            if message["type"] == "http.response.start":
+                start = message
+                return
+
+            headers = MutableHeaders(raw=start["headers"])
+            content_type = headers.get("content-type", "").split(";")[0].strip()
+            if content_type not in COMPRESSIBLE_TYPES or "content-encoding" in headers:
+                passthrough = True
+                await send(start)
+                await send(message)
+                return
+
+            headers.add_vary_header("Accept-Encoding")
+            body = message.get("body", b"")
+            if message.get("more_body", False) or not encoding or len(body) < self.minimum_size:
+                passthrough = True
+                await send(start)
+                await send(message)
+                return
+
+            compressed = compress(body, encoding)
+            if len(compressed) < len(body):
+                headers["Content-Encoding"] = encoding
+                headers["Content-Length"] = str(len(compressed))
+                body = compressed
+            await send(start)
+            await send({"type": "http.response.body", "body": body})
+
+        await self.app(scope, receive, send_compressed)
@@ -0,0 +1,51 @@
+"""
+Conditional GET for version-counted resources.
+ETag and Last-Modified come from VersionDB counters, so an If-None-Match
+revalidation is answered with 304 after one counter lookup, without
+querying the collection behind the response.
+"""
+from datetime import datetime
+from email.utils import format_datetime
+from typing import Dict, Optional
+
+from fastapi import Request, Response
+
+from app.database.mongodb import VersionDB
+
+
+async def version_headers(key: str) -> Dict[str, str]:
+    """ETag, Last-Modified and Cache-Control headers for the current version of key."""
+    counter = await VersionDB.get(key)
+    headers = {
+        # Weak: the body may be re-encoded (e.g. compressed) without changing meaning
+        "ETag": f'W/"{counter["epoch"] or "0"}-{counter["version"]}"',
+        # Cache, but revalidate before every use
+        "Cache-Control": "no-cache"
+    }
+    if counter["modified"]:
+        headers["Last-Modified"] = format_datetime(datetime.fromisoformat(counter["modified"]), usegmt=True)
+    return headers
+
+
+def _opaque_tag(tag: str) -> str:
+    tag = tag.strip()
+    return tag[2:] if tag.startswith("W/") else tag
+
+
+def etag_matches(if_none_match: Optional[str], etag: str) -> bool:
+    """Whether an If-None-Match value names etag (weak comparison)."""
+    if not if_none_match:
+        return False
+    if if_none_match.strip() == "*":
+        return True
+    current = _opaque_tag(etag)
+    return any(_opaque_tag(tag) == current for tag in if_none_match.split(","))
+
+
+def not_modified(request: Request, headers: Dict[str, str]) -> bool:
+    """Whether the request's If-None-Match already names the current ETag."""
+    return etag_matches(request.headers.get("if-none-match"), headers["ETag"])
+
+
+def not_modified_response(headers: Dict[str, str]) -> Response:
+    return Response(status_code=304, headers=headers)
@@ -2,7 +2,7 @@
 API routes for Smart Resume Screener.
 Handles all HTTP endpoints.
 """
-from fastapi import APIRouter, UploadFile, File, HTTPException, Form
+from fastapi import APIRouter, UploadFile, File, HTTPException, Form, Query, Request
 from fastapi.responses import JSONResponse
 from typing import List, Optional
 import os
@@ -10,15 +10,27 @@ from datetime import datetime
 
 from app.services.pdf_parser import DocumentParser
 from app.services.text_extractor import TextExtractor
-from app.services.llm_service import llm_service  # Original service (backup)
-from app.services.llm_service_enhanced import enhanced_llm_service  # Enhanced Phase 4 service
+from app.services.skill_matcher import get_skill_matcher
+from app.services.llm_service_enhanced import load_enhanced_llm_service  # Enhanced Phase 4 service
 from app.services.matcher import MatcherService
-from app.database.mongodb import ResumeDB, JobDB, MatchDB
+from app.services.resume_search import ResumeSearch
+from app.services.enrichment import (
+    enrichment_worker, needs_llm, STATUS_PENDING, STATUS_READY, SOURCE_HEURISTIC, SOURCE_LLM
+)
+from app.database.mongodb import MongoDB, ResumeDB, JobDB, MatchDB, VersionDB, AnalyticsDB
+from app.database.blob_store import blob_store
+from app.database.entity_cache import entity_cache
+from app.database.indexes import get_index_stats, explain_hot_queries, get_slow_queries
+from app.api.serialization import trusted_response
+from app.api.conditional import version_headers, not_modified, not_modified_response
 from app.api.schemas import (
-    ResumeResponse, ResumeListResponse,
-    JobCreateRequest, JobResponse, JobListResponse,
-    MatchRequest, MatchResult, MatchListResponse,
-    MessageResponse, ErrorResponse, HealthResponse
+    ResumeResponse, ResumeListResponse, ResumeSearchResponse,
+    JobCreateRequest, JobResponse, JobListResponse, JobOptionsResponse,
+    MatchRequest, MatchResult, MatchListResponse, SkillOverlapResponse, ExtractionStatsResponse,
+    IndexReportResponse, CacheStatsResponse, BulkDeleteRequest, BulkDeleteResponse,
+    ScoreHistogramResponse, RecommendationDistributionResponse, MissingQualificationsResponse,
+    SkillFrequencyResponse, JobCandidateCountsResponse,
+    MessageResponse, UploadResponse, ErrorResponse, HealthResponse
 )
 from app.config import settings
 
@@ -27,19 +39,37 @@ router = APIRouter()
 # Health Check
 @router.get("/health", response_model=HealthResponse)
 async def health_check():
-    """Health check endpoint."""
+    """
+    Health check endpoint.
+    Pings the database and reports pool occupancy; responds 503 if the ping fails.
+    """
+    timestamp = datetime.utcnow().isoformat()
+    try:
+        database = await MongoDB.health()
+    except Exception as e:
+        print(f"Health check failed: {e}")
+        return JSONResponse(status_code=503, content={
+            "status": "unhealthy",
+            "timestamp": timestamp,
+            "database": "disconnected",
+            "error": str(e)
+        })
+    
     return {
-        "status": "healthy",
-        "timestamp": datetime.utcnow().isoformat(),
-        "database": "connected"
+        "status": "degraded" if database["pool"]["wait_queue"] else "healthy",
+        "timestamp": timestamp,
+        "database": "connected",
+        **database
     }
 
 # Resume Endpoints
-@router.post("/api/upload-resume", response_model=MessageResponse)
+@router.post("/api/upload-resume", response_model=UploadResponse, status_code=202)
 async def upload_resume(file: UploadFile = File(...)):
     """
     Upload and process a resume file.
     Supports PDF, DOCX, and TXT formats.
+    Returns once text is extracted; LLM enrichment completes in the background
+    and moves the resume's status from "pending" to "ready" or "failed".
     """
     try:
         # Validate file extension
@@ -61,7 +91,7 @@ async def upload_resume(file: UploadFile = File(...)):
             )
         
         # Parse document
-        text_content = DocumentParser.parse_file(file.filename, file_content)
+        text_content, extraction = DocumentParser.parse_file_with_report(file.filename, file_content)
         
         if not text_content or len(text_content) < 50:
             raise HTTPException(
@@ -70,37 +100,43 @@ async def upload_resume(file: UploadFile = File(...)):
             )
         
         # Extract basic info
-        extractor = TextExtractor()
-        name = extractor.extract_name(text_content)
-        email = extractor.extract_email(text_content)
-        phone = extractor.extract_phone(text_content)
-        basic_skills = extractor.extract_skills_basic(text_content)
-        
-        # Use Enhanced LLM to extract structured data (Phase 4 optimization)
-        parsed_data = await enhanced_llm_service.extract_structured_data(text_content)
-        
-        # Merge basic extraction with LLM results
-        if not parsed_data.get("name"):
-            parsed_data["name"] = name
-        if not parsed_data.get("email"):
-            parsed_data["email"] = email
-        if not parsed_data.get("phone"):
-            parsed_data["phone"] = phone
-        if not parsed_data.get("skills"):
-            parsed_data["skills"] = basic_skills
+        heuristics = TextExtractor.extract_all(text_content)
+        use_llm = needs_llm(heuristics)
         
-        # Save to database
+        # Save to database; LLM extraction, when needed, runs in the background worker
+        status = STATUS_PENDING if use_llm else STATUS_READY
         resume_data = {
             "filename": file.filename,
+            "file_type": file_ext.replace('.', ''),
+            "file_size": len(file_content),
+            "content_hash": blob_store.content_hash(file_content),
             "text_content": text_content,
-            "parsed_data": parsed_data
+            "parsed_data": heuristics.to_parsed_data(),
+            "extraction": extraction,
+            "sections": heuristics.sections,
+            "heuristic_confidence": heuristics.confidence,
+            "extraction_source": SOURCE_LLM if use_llm else SOURCE_HEURISTIC,
+            **get_skill_matcher().to_document_fields(heuristics.skill_ids),
+            "status": status
         }
         
         resume_id = await ResumeDB.create_resume(resume_data)
         
+        # Keep the original file; written only once the resume that references it exists
+        try:
+            await blob_store.put(file_content)
+        except Exception:
+            await ResumeDB.delete_resume(resume_id)
+            raise
+        
+        if use_llm:
+            enrichment_worker.enqueue(resume_id)
+        
         return {
             "message": f"Resume uploaded successfully. ID: {resume_id}",
-            "success": True
+            "success": True,
+            "resume_id": resume_id,
+            "status": status
         }
         
     except HTTPException as e:
@@ -110,18 +146,55 @@ async def upload_resume(file: UploadFile = File(...)):
         raise HTTPException(status_code=500, detail=str(e))
 
 @router.get("/api/resumes", response_model=ResumeListResponse)
-async def get_all_resumes():
-    """Get all uploaded resumes."""
+async def get_all_resumes(
+    request: Request,
+    limit: int = Query(50, ge=1, le=200),
+    cursor: Optional[str] = Query(None, description="next_cursor from the previous page")
+):
+    """
+    Get one page of uploaded resumes, newest first.
+    Stored summaries are already in response shape and are not revalidated.
+    Responds 304 to an If-None-Match with the current ETag.
+    """
     try:
-        resumes = await ResumeDB.get_all_resumes()
-        return {
+        headers = await version_headers(VersionDB.RESUMES)
+        if not_modified(request, headers):
+            return not_modified_response(headers)
+        resumes, next_cursor = await ResumeDB.get_resumes_page(limit, cursor)
+        return trusted_response(ResumeListResponse, {
             "resumes": resumes,
-            "total": len(resumes)
-        }
+            "total": await ResumeDB.count_resumes(),
+            "next_cursor": next_cursor
+        }, headers)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
     except Exception as e:
         print(f"Error fetching resumes: {e}")
         raise HTTPException(status_code=500, detail=str(e))
 
+@router.get("/api/resumes/search", response_model=ResumeSearchResponse)
+async def search_resumes(
+    q: str = Query(..., min_length=1, max_length=500),
+    limit: int = Query(20, ge=1, le=100),
+    offset: int = Query(0, ge=0, le=10000)
+):
+    """
+    Full-text search over resume text, names and skills, best match first.
+    Supports "quoted phrases" and -excluded words.
+    """
+    try:
+        results, total = await ResumeSearch.search(q, limit, offset)
+        return {
+            "query": q,
+            "results": results,
+            "total": total,
+            "limit": limit,
+            "offset": offset
+        }
+    except Exception as e:
+        print(f"Error searching resumes: {e}")
+        raise HTTPException(status_code=500, detail=str(e))
+
 @router.get("/api/resumes/{resume_id}", response_model=ResumeResponse)
 async def get_resume(resume_id: str):
     """Get a specific resume by ID."""
@@ -129,6 +202,7 @@ async def get_resume(resume_id: str):
         resume = await ResumeDB.get_resume(resume_id)
         if not resume:
             raise HTTPException(status_code=404, detail="Resume not found")
+        resume["text_content"] = await ResumeDB.get_resume_text(resume_id)
         return resume
     except HTTPException as e:
         raise e
@@ -136,6 +210,15 @@ async def get_resume(resume_id: str):
         print(f"Error fetching resume: {e}")
         raise HTTPException(status_code=500, detail=str(e))
 
+@router.post("/api/resumes/bulk-delete", response_model=BulkDeleteResponse)
+async def delete_resumes(request: BulkDeleteRequest):
+    """Delete several resumes with one delete_many per batch."""
+    try:
+        return await ResumeDB.delete_resumes(request.ids)
+    except Exception as e:
+        print(f"Error deleting resumes: {e}")
+        raise HTTPException(status_code=500, detail=str(e))
+
 @router.delete("/api/resumes/{resume_id}", response_model=MessageResponse)
 async def delete_resume(resume_id: str):
     """Delete a resume by ID."""
@@ -160,13 +243,15 @@ async def create_job(job: JobCreateRequest):
     try:
         # Extract requirements using Enhanced LLM if not provided (Phase 4 optimization)
         if not job.requirements:
-            requirements = await enhanced_llm_service.extract_job_requirements(job.description)
+            llm_service = await load_enhanced_llm_service()
+            requirements = await llm_service.extract_job_requirements(job.description)
             job.requirements = requirements
         
         job_data = {
             "title": job.title,
             "description": job.description,
-            "requirements": job.requirements
+            "requirements": job.requirements,
+            **MatcherService.job_skill_fields(job.description, job.requirements)
         }
         
         job_id = await JobDB.create_job(job_data)
@@ -180,18 +265,47 @@ async def create_job(job: JobCreateRequest):
         raise HTTPException(status_code=500, detail=str(e))
 
 @router.get("/api/jobs", response_model=JobListResponse)
-async def get_all_jobs():
-    """Get all job descriptions."""
+async def get_all_jobs(
+    request: Request,
+    limit: int = Query(50, ge=1, le=200),
+    cursor: Optional[str] = Query(None, description="next_cursor from the previous page")
+):
+    """
+    Get one page of job descriptions, newest first.
+    Stored summaries are already in response shape and are not revalidated.
+    Responds 304 to an If-None-Match with the current ETag.
+    """
     try:
-        jobs = await JobDB.get_all_jobs()
-        return {
+        headers = await version_headers(VersionDB.JOBS)
+        if not_modified(request, headers):
+            return not_modified_response(headers)
+        jobs, next_cursor = await JobDB.get_jobs_page(limit, cursor)
+        return trusted_response(JobListResponse, {
             "jobs": jobs,
-            "total": len(jobs)
-        }
+            "total": await JobDB.count_jobs(),
+            "next_cursor": next_cursor
+        }, headers)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
     except Exception as e:
         print(f"Error fetching jobs: {e}")
         raise HTTPException(status_code=500, detail=str(e))
 
+@router.get("/api/jobs/options", response_model=JobOptionsResponse)
+async def get_job_options(request: Request):
+    """
+    Get the ID and title of every job, newest first, for the job selector.
+    Responds 304 to an If-None-Match with the current ETag.
+    """
+    try:
+        headers = await version_headers(VersionDB.JOBS)
+        if not_modified(request, headers):
+            return not_modified_response(headers)
+        return trusted_response(JobOptionsResponse, {"jobs": await JobDB.get_job_options()}, headers)
+    except Exception as e:
+        print(f"Error fetching job options: {e}")
+        raise HTTPException(status_code=500, detail=str(e))
+
 @router.get("/api/jobs/{job_id}", response_model=JobResponse)
 async def get_job(job_id: str):
     """Get a specific job by ID."""
@@ -206,6 +320,15 @@ async def get_job(job_id: str):
         print(f"Error fetching job: {e}")
         raise HTTPException(status_code=500, detail=str(e))
 
+@router.post("/api/jobs/bulk-delete", response_model=BulkDeleteResponse)
+async def delete_jobs(request: BulkDeleteRequest):
+    """Delete several jobs with one delete_many per batch."""
+    try:
+        return await JobDB.delete_jobs(request.ids)
+    except Exception as e:
+        print(f"Error deleting jobs: {e}")
+        raise HTTPException(status_code=500, detail=str(e))
+
 @router.delete("/api/jobs/{job_id}", response_model=MessageResponse)
 async def delete_job(job_id: str):
     """Delete a job by ID."""
@@ -230,33 +353,36 @@ async def match_resumes_with_job(match_request: MatchRequest):
     Match resumes with a job description.
     If resume_ids is provided, matches only those resumes.
     Otherwise, matches all resumes.
+    Match documents are normalized when scored and are not revalidated.
     """
     try:
-        job = await JobDB.get_job(match_request.job_id)
-        if not job:
-            raise HTTPException(status_code=404, detail="Job not found")
+        # Every job/resume document is read at most once per match run
+        with entity_cache.request_scope():
+            job = await JobDB.get_job(match_request.job_id)
+            if not job:
+                raise HTTPException(status_code=404, detail="Job not found")
+            
+            if match_request.resume_ids:
+                # Match specific resumes
+                resumes = await ResumeDB.get_resumes(match_request.resume_ids)
+                matches, errors = await MatcherService.match_resumes(job, resumes)
+                found = {resume["_id"] for resume in resumes}
+                errors.extend(
+                    f"{resume_id}: Resume not found"
+                    for resume_id in match_request.resume_ids if resume_id not in found
+                )
+            else:
+                # Match all resumes
+                resumes = await ResumeDB.get_all_resumes()
+                matches, errors = await MatcherService.match_resumes(job, resumes)
         
-        if match_request.resume_ids:
-            # Match specific resumes
-            matches = []
-            for resume_id in match_request.resume_ids:
-                try:
-                    match = await MatcherService.match_single_resume(resume_id, match_request.job_id)
-                    matches.append(match)
-                except Exception as e:
-                    print(f"Error matching resume {resume_id}: {e}")
-                    continue
-            matches.sort(key=lambda x: x.get("score", 0), reverse=True)
-        else:
-            # Match all resumes
-            matches = await MatcherService.match_all_resumes_with_job(match_request.job_id)
-        
-        return {
+        return trusted_response(MatchListResponse, {
             "matches": matches,
             "total": len(matches),
             "job_id": match_request.job_id,
-            "job_title": job.get("title")
-        }
+            "job_title": job.get("title"),
+            "errors": errors
+        })
     except HTTPException as e:
         raise e
     except Exception as e:
@@ -264,23 +390,160 @@ async def match_resumes_with_job(match_request: MatchRequest):
         raise HTTPException(status_code=500, detail=str(e))
 
 @router.get("/api/matches/{job_id}", response_model=MatchListResponse)
-async def get_matches_for_job(job_id: str):
-    """Get all saved matches for a specific job."""
+async def get_matches_for_job(job_id: str, request: Request):
+    """
+    Get all saved matches for a specific job, served without revalidation.
+    Responds 304 to an If-None-Match with the job's current ETag.
+    """
     try:
+        headers = await version_headers(VersionDB.job_key(job_id))
+        if not_modified(request, headers):
+            return not_modified_response(headers)
         job = await JobDB.get_job(job_id)
         if not job:
             raise HTTPException(status_code=404, detail="Job not found")
         
         matches = await MatchDB.get_matches_by_job(job_id)
         
-        return {
+        return trusted_response(MatchListResponse, {
             "matches": matches,
             "total": len(matches),
             "job_id": job_id,
             "job_title": job.get("title")
-        }
+        }, headers)
     except HTTPException as e:
         raise e
     except Exception as e:
         print(f"Error fetching matches: {e}")
         raise HTTPException(status_code=500, detail=str(e))
+
+@router.get("/api/jobs/{job_id}/skill-overlap", response_model=SkillOverlapResponse)
+async def get_skill_overlap(job_id: str, limit: int = Query(50, ge=1, le=1000)):
+    """
+    Rank all resumes by canonical skill overlap with a job.
+    Computed from stored skill bitsets without calling the LLM.
+    """
+    try:
+        job = await JobDB.get_job(job_id)
+        if not job:
+            raise HTTPException(status_code=404, detail="Job not found")
+        
+        results, job_skill_count = await MatcherService.rank_by_skill_overlap(job, limit)
+        
+        return {
+            "job_id": job_id,
+            "job_skill_count": job_skill_count,
+            "results": results,
+            "total": len(results)
+        }
+    except HTTPException as e:
+        raise e
+    except Exception as e:
+        print(f"Error computing skill overlap: {e}")
+        raise HTTPException(status_code=500, detail=str(e))
+
+# Stats Endpoints
+@router.get("/api/stats/extraction", response_model=ExtractionStatsResponse)
+async def get_extraction_stats():
+    """Share of uploads whose parsed data came from heuristics without an LLM call."""
+    try:
+        counts = await ResumeDB.get_extraction_source_counts()
+        heuristic = counts.get(SOURCE_HEURISTIC, 0)
+        total = sum(counts.values())
+        
+        return {
+            "total": total,
+            "heuristic": heuristic,
+            "llm": counts.get(SOURCE_LLM, 0),
+            "heuristic_share": round(heuristic / total, 4) if total else 0.0,
+            "confidence_threshold": settings.llm_extraction_threshold,
+            "required_fields": settings.llm_required_fields_list
+        }
+    except Exception as e:
+        print(f"Error fetching extraction stats: {e}")
+        raise HTTPException(status_code=500, detail=str(e))
+
+# Analytics Endpoints
+@router.get("/api/analytics/jobs/{job_id}/score-histogram", response_model=ScoreHistogramResponse)
+async def get_score_histogram(job_id: str, bucket_width: float = Query(1.0, ge=0.1, le=10)):
+    """Distribution of a job's match scores in buckets of bucket_width."""
+    try:
+        buckets = await AnalyticsDB.score_histogram(job_id, bucket_width)
+        return {
+            "job_id": job_id,
+            "buckets": buckets,
+            "total": sum(bucket["count"] for bucket in buckets)
+        }
+    except Exception as e:
+        print(f"Error computing score histogram: {e}")
+        raise HTTPException(status_code=500, detail=str(e))
+
+@router.get("/api/analytics/recommendations", response_model=RecommendationDistributionResponse)
+async def get_recommendation_distribution(job_id: Optional[str] = None):
+    """Matches per recommendation label, for one job or all jobs."""
+    try:
+        return {
+            "job_id": job_id,
+            "distribution": await AnalyticsDB.recommendation_distribution(job_id)
+        }
+    except Exception as e:
+        print(f"Error computing recommendation distribution: {e}")
+        raise HTTPException(status_code=500, detail=str(e))
+
+@router.get("/api/analytics/missing-qualifications", response_model=MissingQualificationsResponse)
+async def get_missing_qualifications(
+    job_id: Optional[str] = None,
+    limit: int = Query(20, ge=1, le=200)
+):
+    """Most frequent missing qualifications, for one job or all jobs."""
+    try:
+        return {
+            "job_id": job_id,
+            "qualifications": await AnalyticsDB.top_missing_qualifications(job_id, limit)
+        }
+    except Exception as e:
+        print(f"Error computing missing qualifications: {e}")
+        raise HTTPException(status_code=500, detail=str(e))
+
+@router.get("/api/analytics/skills", response_model=SkillFrequencyResponse)
+async def get_skill_frequency(limit: int = Query(50, ge=1, le=500)):
+    """Canonical skills ranked by how many resumes have them."""
+    try:
+        matcher = get_skill_matcher()
+        skills = await AnalyticsDB.skill_frequency(limit)
+        for skill in skills:
+            # IDs from a previous taxonomy file fall back to the raw ID
+            skill_id = skill["skill_id"]
+            skill["name"] = matcher.name(skill_id) if skill_id in matcher.taxonomy else skill_id
+        return {"skills": skills}
+    except Exception as e:
+        print(f"Error computing skill frequency: {e}")
+        raise HTTPException(status_code=500, detail=str(e))
+
+@router.get("/api/analytics/jobs", response_model=JobCandidateCountsResponse)
+async def get_job_candidate_counts():
+    """Matched candidate count, average and top score per job."""
+    try:
+        return {"jobs": await AnalyticsDB.candidate_counts()}
+    except Exception as e:
+        print(f"Error computing candidate counts: {e}")
+        raise HTTPException(status_code=500, detail=str(e))
+
+# Admin Endpoints
+@router.get("/api/admin/indexes", response_model=IndexReportResponse)
+async def get_index_report():
+    """Index usage counts, winning plans of the hot queries, and recent slow queries."""
+    try:
+        return {
+            "indexes": await get_index_stats(),
+            "query_plans": await explain_hot_queries(),
+            "slow_queries": await get_slow_queries()
+        }
+    except Exception as e:
+        print(f"Error building index report: {e}")
+        raise HTTPException(status_code=500, detail=str(e))
+
+@router.get("/api/admin/cache", response_model=CacheStatsResponse)
+async def get_cache_stats():
+    """Entity cache size and hit rates for this process."""
+    return entity_cache.metrics()
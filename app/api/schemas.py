@@ -1,13 +1,16 @@
 """
 Pydantic schemas for request/response validation.
 """
-from pydantic import BaseModel, Field, EmailStr, field_validator
+from pydantic import BaseModel, Field, EmailStr
 from typing import List, Optional, Dict, Any, Union
 from datetime import datetime
 
 # Resume Schemas
 class ResumeParsedData(BaseModel):
-    """Parsed resume data structure."""
+    """
+    Parsed resume data structure.
+    Stored documents are normalized to this shape on write (resume schema v3).
+    """
     name: Optional[str] = None
     email: Optional[str] = None
     phone: Optional[str] = None
@@ -16,93 +19,66 @@ class ResumeParsedData(BaseModel):
     soft_skills: List[str] = []
     experience: List[Dict[str, Any]] = []
     education: List[Dict[str, Any]] = []
-    certifications: List[str] = []
+    certifications: List[str] = []  # Dict certifications are migrated on read (schema v2)
     total_experience_years: int = 0
-    
-    @field_validator('education', mode='before')
-    @classmethod
-    def clean_education(cls, v):
-        """Clean education data and convert None values to empty strings."""
-        if not v:
-            return []
-        result = []
-        for edu in v:
-            if isinstance(edu, dict):
-                # Convert None values to empty strings
-                cleaned_edu = {
-                    key: (value if value is not None else "")
-                    for key, value in edu.items()
-                }
-                result.append(cleaned_edu)
-            else:
-                result.append(edu)
-        return result
-    
-    @field_validator('experience', mode='before')
-    @classmethod
-    def clean_experience(cls, v):
-        """Clean experience data and convert None values to empty strings."""
-        if not v:
-            return []
-        result = []
-        for exp in v:
-            if isinstance(exp, dict):
-                # Convert None values to empty strings
-                cleaned_exp = {
-                    key: (value if value is not None else "")
-                    for key, value in exp.items()
-                }
-                result.append(cleaned_exp)
-            else:
-                result.append(exp)
-        return result
-    
-    @field_validator('total_experience_years', mode='before')
-    @classmethod
-    def round_experience(cls, v):
-        """Convert float experience to integer."""
-        if v is None:
-            return 0
-        return int(round(float(v)))
-    
-    @field_validator('certifications', mode='before')
-    @classmethod
-    def convert_certifications(cls, v):
-        """Convert certifications from dict to string if needed."""
-        if not v:
-            return []
-        result = []
-        for cert in v:
-            if isinstance(cert, dict):
-                # Old format: {name, issuer, year}
-                name = cert.get('name', 'Unknown')
-                issuer = cert.get('issuer', '')
-                year = cert.get('year', '')
-                if issuer and year:
-                    result.append(f"{name} ({issuer}, {year})")
-                elif issuer:
-                    result.append(f"{name} ({issuer})")
-                else:
-                    result.append(name)
-            else:
-                result.append(str(cert))
-        return result
 
 class ResumeResponse(BaseModel):
     """Resume response schema."""
     id: str = Field(alias="_id")
     filename: str
-    text_content: str
+    text_content: Optional[str] = None  # Only included on the detail endpoint
     parsed_data: ResumeParsedData
     upload_date: str
+    status: str = "ready"  # pending | ready | failed; legacy documents are ready
+    error: Optional[str] = None
+    extraction: Optional[Dict[str, Any]] = None  # Engine used for text extraction and why
+    file_type: Optional[str] = None
+    file_size: Optional[int] = None
+    content_hash: Optional[str] = None  # Blob store key of the original file
+    skill_ids: List[str] = []  # Canonical taxonomy skill IDs
+    sections: List[Dict[str, Any]] = []  # {"name", "start", "end"} offsets into text_content
+    
+    class Config:
+        populate_by_name = True
+
+class ResumeSummary(BaseModel):
+    """Resume fields shown in the resume list."""
+    id: str = Field(alias="_id")
+    filename: str
+    parsed_data: ResumeParsedData  # name, email, phone and skills only
+    upload_date: str
+    status: str = "ready"
+    error: Optional[str] = None
+    file_type: Optional[str] = None
+    file_size: Optional[int] = None
     
     class Config:
         populate_by_name = True
 
 class ResumeListResponse(BaseModel):
-    """List of resumes response."""
-    resumes: List[ResumeResponse]
-    total: int
+    """One page of resumes."""
+    resumes: List[ResumeSummary]
+    total: int  # All resumes, not just this page
+    next_cursor: Optional[str] = None  # Pass as ?cursor= for the next page; None on the last page
+
+class ResumeSearchResult(BaseModel):
+    """One ranked full-text search hit."""
+    resume_id: str
+    filename: str
+    name: Optional[str] = None
+    email: Optional[str] = None
+    skills: List[str] = []
+    status: str = "ready"
+    score: float  # Text index relevance; higher is better
+    snippet: str  # Text around the first query term
+
+class ResumeSearchResponse(BaseModel):
+    """One page of full-text search results."""
+    query: str
+    results: List[ResumeSearchResult]
+    total: int  # All matching resumes
+    limit: int
+    offset: int
 
 # Job Schemas
 class JobCreateRequest(BaseModel):
@@ -116,47 +92,40 @@ class JobResponse(BaseModel):
     id: str = Field(alias="_id")
     title: str
     description: str
-    requirements: List[str]
+    requirements: List[str]  # Dict requirements are migrated on read (schema v2)
     created_date: str
+    skill_ids: List[str] = []  # Canonical taxonomy skill IDs
     
-    @field_validator('requirements', mode='before')
-    @classmethod
-    def convert_requirements(cls, v):
-        """Convert requirements from dict to string list if needed."""
-        if not v:
-            return []
-        if isinstance(v, list):
-            return v
-        if isinstance(v, dict):
-            # Old format: dict with required_skills, preferred_skills, etc.
-            result = []
-            required_skills = v.get('required_skills', [])
-            preferred_skills = v.get('preferred_skills', [])
-            experience = v.get('experience_required', '')
-            education = v.get('education_required', '')
-            responsibilities = v.get('responsibilities', [])
-            
-            if required_skills:
-                result.append(f"Required Skills: {', '.join(required_skills)}")
-            if preferred_skills:
-                result.append(f"Preferred Skills: {', '.join(preferred_skills)}")
-            if experience:
-                result.append(f"Experience: {experience}")
-            if education:
-                result.append(f"Education: {education}")
-            if responsibilities:
-                result.extend([f"Responsibility: {r}" for r in responsibilities[:3]])  # Limit to 3
-            
-            return result if result else ["See job description for requirements"]
-        return [str(v)]
+    class Config:
+        populate_by_name = True
+
+class JobSummary(BaseModel):
+    """Job fields shown in the job list."""
+    id: str = Field(alias="_id")
+    title: str
+    description_preview: str = ""  # First 150 characters of the description
+    created_date: str
     
     class Config:
         populate_by_name = True
 
 class JobListResponse(BaseModel):
-    """List of jobs response."""
-    jobs: List[JobResponse]
-    total: int
+    """One page of jobs."""
+    jobs: List[JobSummary]
+    total: int  # All jobs, not just this page
+    next_cursor: Optional[str] = None  # Pass as ?cursor= for the next page; None on the last page
+
+class JobOption(BaseModel):
+    """Job fields shown in the job selector."""
+    id: str = Field(alias="_id")
+    title: str
+    
+    class Config:
+        populate_by_name = True
+
+class JobOptionsResponse(BaseModel):
+    """Every job, for the job selector."""
+    jobs: List[JobOption]
 
 # Match Schemas
 class MatchRequest(BaseModel):
@@ -188,6 +157,142 @@ class MatchListResponse(BaseModel):
     total: int
     job_id: str
     job_title: Optional[str] = None
+    errors: List[str] = []  # "<resume_id>: <reason>" for resumes that could not be matched or stored
+
+class SkillOverlapResult(BaseModel):
+    """Skill overlap between one resume and a job."""
+    resume_id: str
+    matched_skills: int
+    coverage: float  # Share of the job's skills found in the resume
+
+class SkillOverlapResponse(BaseModel):
+    """Resumes ranked by canonical skill overlap with a job."""
+    job_id: str
+    job_skill_count: int
+    results: List[SkillOverlapResult]
+    total: int
+
+# Stats Schemas
+class ExtractionStatsResponse(BaseModel):
+    """How many resumes were served by heuristics alone vs. LLM extraction."""
+    total: int
+    heuristic: int
+    llm: int
+    heuristic_share: float  # Fraction of resumes stored without an LLM call
+    confidence_threshold: float
+    required_fields: List[str]
+
+# Analytics Schemas
+class ScoreBucket(BaseModel):
+    """Matches with min <= score < max (the last bucket includes 10)."""
+    min: float
+    max: float
+    count: int
+
+class ScoreHistogramResponse(BaseModel):
+    """Score distribution of one job's matches."""
+    job_id: str
+    buckets: List[ScoreBucket]
+    total: int
+
+class RecommendationCount(BaseModel):
+    recommendation: str
+    count: int
+
+class RecommendationDistributionResponse(BaseModel):
+    """Matches per recommendation label."""
+    job_id: Optional[str] = None
+    distribution: List[RecommendationCount]
+
+class QualificationCount(BaseModel):
+    qualification: str
+    count: int
+
+class MissingQualificationsResponse(BaseModel):
+    """Most frequent missing qualifications across matches."""
+    job_id: Optional[str] = None
+    qualifications: List[QualificationCount]
+
+class SkillCount(BaseModel):
+    skill_id: str
+    name: str
+    count: int  # Resumes with this skill
+
+class SkillFrequencyResponse(BaseModel):
+    """Canonical skills by number of resumes."""
+    skills: List[SkillCount]
+
+class JobCandidateCount(BaseModel):
+    job_id: str
+    job_title: Optional[str] = None
+    candidates: int
+    average_score: float
+    top_score: float
+
+class JobCandidateCountsResponse(BaseModel):
+    """Matched candidates per job."""
+    jobs: List[JobCandidateCount]
+
+# Admin Schemas
+class IndexUsage(BaseModel):
+    """Access count of one index from $indexStats."""
+    name: str
+    key: Dict[str, Any]
+    accesses: int
+    since: str
+
+class QueryPlan(BaseModel):
+    """Winning plan stages of a hot query."""
+    name: str
+    collection: str
+    stages: List[str]
+    uses_index: bool
+
+class SlowQuery(BaseModel):
+    """Slow operation recorded by the database profiler."""
+    ns: Optional[str] = None
+    op: Optional[str] = None
+    millis: Optional[int] = None
+    plan_summary: Optional[str] = None
+    ts: Optional[str] = None
+
+class CacheKindStats(BaseModel):
+    """Entity cache counters for one document kind."""
+    hits: int
+    scope_hits: int  # Served from the current request scope
+    misses: int
+    evictions: int
+    hit_rate: float
+
+class CacheStatsResponse(BaseModel):
+    """Entity cache state of the responding process."""
+    enabled: bool
+    entries: int
+    max_entries: int
+    ttl_seconds: float
+    kinds: Dict[str, CacheKindStats]
+
+class IndexReportResponse(BaseModel):
+    """Index usage and query plan report."""
+    indexes: Dict[str, List[IndexUsage]]
+    query_plans: List[QueryPlan]
+    slow_queries: List[SlowQuery]
+
+# Bulk Schemas
+class BulkDeleteRequest(BaseModel):
+    """IDs to delete in one request."""
+    ids: List[str] = Field(..., min_length=1)
+
+class BulkError(BaseModel):
+    """One failed item of a bulk operation."""
+    index: int  # Position in the request's list
+    code: Optional[int] = None
+    message: str
+
+class BulkDeleteResponse(BaseModel):
+    """Outcome of a bulk delete; IDs that did not exist are simply not counted."""
+    deleted: int
+    errors: List[BulkError] = []
 
 # Generic Response Schemas
 class MessageResponse(BaseModel):
@@ -195,6 +300,11 @@ class MessageResponse(BaseModel):
     message: str
     success: bool = True
 
+class UploadResponse(MessageResponse):
+    """Resume upload response; enrichment continues in the background."""
+    resume_id: str
+    status: str
+
 class ErrorResponse(BaseModel):
     """Error response schema."""
     error: str
@@ -202,8 +312,25 @@ class ErrorResponse(BaseModel):
     success: bool = False
 
 # Health Check
+class PoolStats(BaseModel):
+    """MongoDB connection pool occupancy."""
+    size: int  # Open connections
+    in_use: int  # Connections checked out
+    wait_queue: int  # Operations waiting for a connection
+    max_size: int
+
+class ServerStats(BaseModel):
+    """One MongoDB server as seen by the driver's monitor."""
+    address: str
+    type: str
+    rtt_ms: Optional[float] = None  # Average heartbeat round-trip time
+
 class HealthResponse(BaseModel):
     """Health check response."""
-    status: str
+    status: str  # healthy | degraded (requests waiting for a connection) | unhealthy
     timestamp: str
     database: str = "connected"
+    ping_ms: Optional[float] = None
+    pool: Optional[PoolStats] = None
+    servers: List[ServerStats] = []
+    error: Optional[str] = None
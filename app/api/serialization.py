@@ -0,0 +1,81 @@
+"""
+Fast serialization of stored documents for list and match endpoints.
+Documents are normalized to their response shape when written and older
+ones when read (see app.database.schema), so responses are
+shaped straight from the response model's field layout instead of being
+validated again, and encoded with orjson. Documents that do not fit the
+layout fall back to validation.
+"""
+import typing
+from functools import lru_cache
+from typing import Any, Dict, List, Optional, Tuple, Type
+
+from fastapi.responses import ORJSONResponse
+from pydantic import BaseModel
+
+_REQUIRED = object()
+
+# (output key, default or _REQUIRED, nested model, nested model is a list item)
+FieldLayout = Tuple[str, Any, Optional[Type[BaseModel]], bool]
+
+
+def _nested_model(annotation: Any) -> Tuple[Optional[Type[BaseModel]], bool]:
+    if isinstance(annotation, type) and issubclass(annotation, BaseModel):
+        return annotation, False
+    args = typing.get_args(annotation)
+    if typing.get_origin(annotation) in (list, List) and args:
+        model, _ = _nested_model(args[0])
+        return model, model is not None
+    # Optional[Model]
+    models = [arg for arg in args if arg is not type(None)]
+    if len(models) == 1:
+        return _nested_model(models[0])
+    return None, False
+
+
+@lru_cache(maxsize=None)
+def _layout(model: Type[BaseModel]) -> Tuple[FieldLayout, ...]:
+    layout = []
+    for name, field in model.model_fields.items():
+        default = _REQUIRED if field.is_required() else field.get_default(call_default_factory=True)
+        nested, is_list = _nested_model(field.annotation)
+        layout.append((field.alias or name, default, nested, is_list))
+    return tuple(layout)
+
+
+def _copy_fields(model: Type[BaseModel], document: Dict[str, Any]) -> Dict[str, Any]:
+    result = {}
+    for key, default, nested, is_list in _layout(model):
+        value = document[key] if default is _REQUIRED else document.get(key, default)
+        if nested is not None and value is not None:
+            value = [_copy_fields(nested, item) for item in value] if is_list else _copy_fields(nested, value)
+        result[key] = value
+    return result
+
+
+def trusted_dump(model: Type[BaseModel], document: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    The JSON-ready dict FastAPI would produce for document as model, without
+    validation: fields are copied by alias, missing ones take the model default
+    and unknown keys are dropped. Defaults are shared, so serialize the result
+    rather than mutating it.
+
+    A document that cannot be copied (a required field missing, a nested
+    model that is not a dict) is validated instead, so it serializes if
+    Pydantic can coerce it and raises ValidationError otherwise.
+    """
+    try:
+        return _copy_fields(model, document)
+    except (KeyError, TypeError, AttributeError):
+        return model.model_validate(document).model_dump(mode="json", by_alias=True)
+
+
+def trusted_response(
+    model: Type[BaseModel], content: Dict[str, Any], headers: Optional[Dict[str, str]] = None
+) -> ORJSONResponse:
+    """
+    content shaped as model and encoded with orjson, skipping response_model
+    validation. Only for content built from documents in canonical shape;
+    keep response_model on the route for the OpenAPI schema.
+    """
+    return ORJSONResponse(content=trusted_dump(model, content), headers=headers)
@@ -0,0 +1,129 @@
+"""
+Frontend asset serving with fingerprinted URLs and precompressed variants.
+Every file under the frontend directory is loaded once at startup and
+also served under a content-hashed name (css/styles.css ->
+css/styles.<hash>.css) with a year-long immutable Cache-Control. HTML
+pages reference the hashed names and are revalidated on every load, so a
+deploy changes the URLs and nothing stale is served from browser caches.
+Text assets are precompressed with brotli (when available) and gzip at
+the highest levels and served by Accept-Encoding.
+"""
+import hashlib
+import mimetypes
+import os
+import posixpath
+from typing import Dict, Optional, Tuple
+
+from starlette.datastructures import Headers
+from starlette.types import Receive, Scope, Send
+
+from app.api.compression import available_encodings, compress, negotiate_encoding
+from app.api.conditional import etag_matches
+from app.config import settings
+
+IMMUTABLE_CACHE = "public, max-age=31536000, immutable"
+REVALIDATE_CACHE = "no-cache"
+TEXT_TYPES = ("text/", "application/javascript", "application/json", "image/svg+xml")
+MAX_LEVELS = {"br": 11, "gzip": 9}
+
+
+class Asset:
+    """One servable file: its bytes per content coding, media type and ETag."""
+
+    def __init__(self, body: bytes, media_type: str, compressible: bool):
+        self.media_type = media_type
+        # Weak: the compressed variants share it
+        self.etag = f'W/"{hashlib.sha256(body).hexdigest()[:16]}"'
+        self.variants: Dict[Optional[str], bytes] = {None: body}
+        if compressible and len(body) >= settings.compression_min_bytes:
+            for encoding in available_encodings():
+                compressed = compress(body, encoding, MAX_LEVELS[encoding])
+                if len(compressed) < len(body):
+                    self.variants[encoding] = compressed
+
+    def select(self, accept_encoding: Optional[str]) -> Tuple[Optional[str], bytes]:
+        encoding = negotiate_encoding(accept_encoding, [e for e in self.variants if e is not None])
+        return encoding, self.variants[encoding]
+
+
+def fingerprint(path: str, body: bytes) -> str:
+    """path with a content hash before its extension."""
+    root, extension = posixpath.splitext(path)
+    return f"{root}.{hashlib.sha256(body).hexdigest()[:10]}{extension}"
+
+
+class FingerprintedStaticFiles:
+    """
+    ASGI app serving a directory from memory. "/" serves index.html.
+
+    Args:
+        directory: Directory to serve; read once, at construction
+    """
+
+    def __init__(self, directory: str):
+        # Path -> (asset, Cache-Control)
+        self.assets: Dict[str, Tuple[Asset, str]] = {}
+        files: Dict[str, bytes] = {}
+        for root, _, filenames in os.walk(directory):
+            for filename in filenames:
+                full_path = os.path.join(root, filename)
+                relative = os.path.relpath(full_path, directory).replace(os.sep, "/")
+                with open(full_path, "rb") as f:
+                    files[relative] = f.read()
+
+        # Fingerprint everything but HTML, which is the entry point and links to the rest
+        self.fingerprints = {
+            path: fingerprint(path, body) for path, body in files.items() if not path.endswith(".html")
+        }
+        for path, body in files.items():
+            media_type = mimetypes.guess_type(path)[0] or "application/octet-stream"
+            compressible = media_type.startswith(TEXT_TYPES)
+            if path.endswith(".html"):
+                body = self._rewrite_links(body)
+            asset = Asset(body, media_type, compressible)
+            self.assets[path] = (asset, REVALIDATE_CACHE)
+            if path in self.fingerprints:
+                self.assets[self.fingerprints[path]] = (asset, IMMUTABLE_CACHE)
+
+    def _rewrite_links(self, html: bytes) -> bytes:
+        """Point quoted references to local assets at their fingerprinted names."""
+        text = html.decode("utf-8")
+        for path, hashed in self.fingerprints.items():
+            for quote in ('"', "'"):
+                text = text.replace(f"{quote}{path}{quote}", f"{quote}{hashed}{quote}")
+                text = text.replace(f"{quote}/{path}{quote}", f"{quote}/{hashed}{quote}")
+        return text.encode("utf-8")
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send):
+        path = scope["path"][len(scope.get("root_path", "")):].lstrip("/")
+        if not path or path.endswith("/"):
+            path += "index.html"
+        asset, cache_control = self.assets.get(path, (None, None))
+        if scope["method"] not in ("GET", "HEAD") or asset is None:
+            status = 405 if asset is not None else 404
+            await send({"type": "http.response.start", "status": status,
+                        "headers": [(b"content-type", b"text/plain; charset=utf-8")]})
+            await send({"type": "http.response.body", "body": b"Method Not Allowed" if status == 405 else b"Not Found"})
+            return
+
+        request_headers = Headers(scope=scope)
+        headers = [
+            (b"cache-control", cache_control.encode()),
+            (b"etag", asset.etag.encode()),
+            (b"vary", b"Accept-Encoding"),
+        ]
+        if etag_matches(request_headers.get("if-none-match"), asset.etag):
+            await send({"type": "http.response.start", "status": 304, "headers": headers})
+            await send({"type": "http.response.body", "body": b""})
+            return
+
+        encoding, body = asset.select(request_headers.get("accept-encoding"))
+        media_type = asset.media_type
+        if media_type.startswith("text/") or media_type == "application/javascript":
+            media_type += "; charset=utf-8"
+        headers.append((b"content-type", media_type.encode()))
+        headers.append((b"content-length", str(len(body)).encode()))
+        if encoding:
+            headers.append((b"content-encoding", encoding.encode()))
+        await send({"type": "http.response.start", "status": 200, "headers": headers})
+        await send({"type": "http.response.body", "body": body if scope["method"] == "GET" else b""})
@@ -12,8 +12,21 @@ class Settings(BaseSettings):
     """Application Settings"""
     
     # MongoDB Configuration
+    storage_backend: str = "mongodb"  # "mongodb", or "memory" for the embedded single-process store
+    memory_storage_path: str = ""  # Snapshot directory for the memory backend; empty keeps data in RAM only
     mongodb_url: str = "mongodb://localhost:27017"
     mongodb_db_name: str = "resume_screener"
+    mongodb_max_pool_size: int = 100
+    mongodb_min_pool_size: int = 0
+    mongodb_max_idle_time_ms: int = 0  # 0 keeps idle connections open
+    mongodb_wait_queue_timeout_ms: int = 0  # 0 waits for a free connection indefinitely
+    mongodb_connect_timeout_ms: int = 20000
+    mongodb_server_selection_timeout_ms: int = 30000
+    mongodb_compressors: str = ""  # Comma-separated: zlib, snappy, zstd (snappy/zstd need extra packages)
+    db_batch_size: int = 500  # Documents per insert_many/bulk_write/delete_many round-trip
+    entity_cache_size: int = 1024  # Cached job/resume documents per process; 0 disables
+    entity_cache_ttl_seconds: float = 30.0  # Bounds staleness across processes; 0 disables
+    slow_query_ms: int = 100  # Profiler entries at or above this are reported as slow
     
     # Google Gemini API
     gemini_api_key: str
@@ -22,6 +35,12 @@ class Settings(BaseSettings):
     host: str = "0.0.0.0"
     port: int = 8000
     debug: bool = True
+    workers: int = 1  # Server processes; 0 starts one per CPU core (MongoDB backend only)
+    
+    # Response Compression (brotli needs the optional brotli package)
+    compression_min_bytes: int = 1024  # JSON responses and static assets smaller than this are sent as is
+    compression_gzip_level: int = 6
+    compression_brotli_quality: int = 4  # For JSON responses; static assets are precompressed at 11
     
     # CORS Settings
     allowed_origins: str = "http://localhost:3000,http://localhost:8000,http://127.0.0.1:8000"
@@ -34,6 +53,17 @@ class Settings(BaseSettings):
     llm_model: str = "gemini-2.5-flash"  # Using stable Gemini 2.5 Flash model
     llm_temperature: float = 0.3
     max_tokens: int = 2048
+    llm_preload: bool = True  # Build the LLM client in a background thread after startup
+    
+    # Skill Taxonomy (JSON file; empty uses the bundled app/data/skills_taxonomy.json)
+    skills_taxonomy_path: str = ""
+    
+    # Background Enrichment Settings
+    enrichment_workers: int = 2  # Concurrent LLM extractions for pending resumes
+    enrichment_lease_seconds: float = 600.0  # A claimed resume is retried by another process after this
+    enrichment_sweep_seconds: float = 60.0  # Interval between scans for pending resumes; 0 = only at startup
+    llm_extraction_threshold: float = 0.8  # Heuristic confidence at or above this skips the LLM
+    llm_required_fields: str = "name,email,skills"  # Heuristic fields that must be present to skip the LLM
     
     # Computed Properties
     @property
@@ -46,6 +76,28 @@ class Settings(BaseSettings):
         """Convert comma-separated extensions to list"""
         return [ext.strip().lower() for ext in self.allowed_extensions.split(",")]
     
+    @property
+    def mongodb_client_options(self) -> dict:
+        """Pool, timeout and compression keyword arguments for the MongoDB client"""
+        options = {
+            "maxPoolSize": self.mongodb_max_pool_size,
+            "minPoolSize": self.mongodb_min_pool_size,
+            "connectTimeoutMS": self.mongodb_connect_timeout_ms,
+            "serverSelectionTimeoutMS": self.mongodb_server_selection_timeout_ms,
+        }
+        if self.mongodb_max_idle_time_ms:
+            options["maxIdleTimeMS"] = self.mongodb_max_idle_time_ms
+        if self.mongodb_wait_queue_timeout_ms:
+            options["waitQueueTimeoutMS"] = self.mongodb_wait_queue_timeout_ms
+        if self.mongodb_compressors:
+            options["compressors"] = self.mongodb_compressors
+        return options
+    
+    @property
+    def llm_required_fields_list(self) -> List[str]:
+        """Convert comma-separated required fields to list"""
+        return [field.strip() for field in self.llm_required_fields.split(",") if field.strip()]
+    
     @property
     def max_file_size_bytes(self) -> int:
         """Convert MB to bytes"""
@@ -2,6 +2,10 @@
 Database Package
 """
 
-from .mongodb import MongoDB, ResumeDB, JobDB, MatchDB
+from .mongodb import MongoDB, ResumeDB, JobDB, MatchDB, VersionDB, AnalyticsDB
+from .blob_store import BlobStore, blob_store
+from .entity_cache import EntityCache, entity_cache
+from .indexes import INDEXES, ensure_indexes
 
-__all__ = ["MongoDB", "ResumeDB", "JobDB", "MatchDB"]
+__all__ = ["MongoDB", "ResumeDB", "JobDB", "MatchDB", "VersionDB", "AnalyticsDB", "BlobStore", "blob_store",
+           "EntityCache", "entity_cache", "INDEXES", "ensure_indexes"]
@@ -0,0 +1,104 @@
+"""
+Content-addressed local blob store for original resume files.
+Files are stored once per SHA-256 digest under UPLOAD_DIR. Resumes are
+inserted before their blob is written, so a failed insert leaves no file
+behind.
+"""
+import hashlib
+import os
+import uuid
+from typing import Optional
+
+import aiofiles
+import aiofiles.os
+
+from app.config import UPLOAD_DIR
+
+
+class BlobStore:
+    """Stores file contents under their SHA-256 hex digest."""
+
+    def __init__(self, root: str = UPLOAD_DIR):
+        self.root = root
+
+    @staticmethod
+    def content_hash(content: bytes) -> str:
+        """Return the SHA-256 hex digest used as the blob key."""
+        return hashlib.sha256(content).hexdigest()
+
+    def path_for(self, digest: str) -> str:
+        """Blob path, fanned out by the first two bytes of the digest."""
+        return os.path.join(self.root, digest[:2], digest[2:4], digest)
+
+    async def put(self, content: bytes) -> str:
+        """
+        Write content asynchronously if not already stored.
+
+        Args:
+            content: File content as bytes
+
+        Returns:
+            Content hash (blob key)
+        """
+        digest = self.content_hash(content)
+        path = self.path_for(digest)
+        if await aiofiles.os.path.exists(path):
+            return digest
+
+        await aiofiles.os.makedirs(os.path.dirname(path), exist_ok=True)
+        tmp_path = f"{path}.{os.getpid()}.tmp"
+        async with aiofiles.open(tmp_path, "wb") as f:
+            await f.write(content)
+        await aiofiles.os.replace(tmp_path, path)
+        return digest
+
+    def put_sync(self, content: bytes) -> str:
+        """Blocking variant of put() for worker processes."""
+        digest = self.content_hash(content)
+        path = self.path_for(digest)
+        if os.path.exists(path):
+            return digest
+
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        tmp_path = f"{path}.{os.getpid()}.tmp"
+        with open(tmp_path, "wb") as f:
+            f.write(content)
+        os.replace(tmp_path, path)
+        return digest
+
+    async def get(self, digest: str) -> Optional[bytes]:
+        """Read a blob, or None if it does not exist."""
+        path = self.path_for(digest)
+        if not await aiofiles.os.path.exists(path):
+            return None
+        async with aiofiles.open(path, "rb") as f:
+            return await f.read()
+
+    async def detach(self, digest: str) -> Optional[str]:
+        """
+        Move a blob aside, to be restored or discarded once the caller has
+        re-checked that nothing references it (see ResumeDB.release_blobs).
+        A put() meanwhile writes a fresh copy.
+
+        Returns:
+            Path of the detached file, or None if the blob does not exist
+        """
+        path = self.path_for(digest)
+        detached = f"{path}.{uuid.uuid4().hex}.detached"
+        try:
+            await aiofiles.os.rename(path, detached)
+        except FileNotFoundError:
+            return None
+        return detached
+
+    async def restore(self, digest: str, detached: str):
+        """Put a detached blob back."""
+        await aiofiles.os.replace(detached, self.path_for(digest))
+
+    async def discard(self, detached: str):
+        """Remove a detached blob for good."""
+        await aiofiles.os.remove(detached)
+
+
+# Create a global instance
+blob_store = BlobStore()
@@ -0,0 +1,154 @@
+"""
+In-process read-through cache for single-document lookups.
+LRU with a TTL, explicit invalidation on writes, hit-rate counters, and a
+request scope in which every document is read from the database at most once.
+"""
+import copy
+import time
+from collections import OrderedDict
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Any, Awaitable, Callable, Dict, Iterable, List, Optional, Tuple
+
+from app.config import settings
+
+# Documents already read in the current request scope, keyed by (kind, id)
+_request_documents = ContextVar("request_documents", default=None)
+
+
+class EntityCache:
+    """
+    LRU/TTL cache of documents keyed by (kind, id), e.g. ("job", job_id).
+    Entries expire after ttl_seconds, which bounds staleness when several
+    processes write to the same database. Values are copied on the way in and
+    out so callers may mutate what they get back.
+    """
+
+    def __init__(self, max_entries: Optional[int] = None, ttl_seconds: Optional[float] = None):
+        self.max_entries = settings.entity_cache_size if max_entries is None else max_entries
+        self.ttl_seconds = settings.entity_cache_ttl_seconds if ttl_seconds is None else ttl_seconds
+        self._entries: "OrderedDict[Tuple[str, str], Tuple[float, Dict[str, Any]]]" = OrderedDict()
+        self.stats = {}  # type: Dict[str, Dict[str, int]]
+        # (kind, id) -> [loads in flight, invalidations since the first began]
+        self._loading: Dict[Tuple[str, str], List[int]] = {}
+
+    @property
+    def enabled(self) -> bool:
+        return self.max_entries > 0 and self.ttl_seconds > 0
+
+    def _count(self, kind: str, event: str):
+        counters = self.stats.setdefault(kind, {"hits": 0, "scope_hits": 0, "misses": 0, "evictions": 0})
+        counters[event] += 1
+
+    def get(self, kind: str, key: str) -> Optional[Dict[str, Any]]:
+        """Cached copy of a document, or None if absent or expired."""
+        scoped = _request_documents.get()
+        if scoped is not None and (kind, key) in scoped:
+            self._count(kind, "scope_hits")
+            return copy.deepcopy(scoped[(kind, key)])
+
+        entry = self._entries.get((kind, key)) if self.enabled else None
+        if entry and entry[0] > time.monotonic():
+            self._entries.move_to_end((kind, key))
+            self._count(kind, "hits")
+            if scoped is not None:
+                scoped[(kind, key)] = entry[1]
+            return copy.deepcopy(entry[1])
+        if entry:
+            del self._entries[(kind, key)]
+        self._count(kind, "misses")
+        return None
+
+    def put(self, kind: str, key: str, document: Dict[str, Any]):
+        """Store a copy of a document just read from the database."""
+        document = copy.deepcopy(document)
+        scoped = _request_documents.get()
+        if scoped is not None:
+            scoped[(kind, key)] = document
+        if not self.enabled:
+            return
+        self._entries[(kind, key)] = (time.monotonic() + self.ttl_seconds, document)
+        self._entries.move_to_end((kind, key))
+        while len(self._entries) > self.max_entries:
+            (evicted_kind, _), _ = self._entries.popitem(last=False)
+            self._count(evicted_kind, "evictions")
+
+    def invalidate(self, kind: str, *keys: str):
+        """Drop documents after an update or delete."""
+        scoped = _request_documents.get()
+        for key in keys:
+            self._entries.pop((kind, key), None)
+            if scoped is not None:
+                scoped.pop((kind, key), None)
+            loading = self._loading.get((kind, key))
+            if loading:
+                loading[1] += 1
+
+    def clear(self):
+        self._entries.clear()
+
+    @contextmanager
+    def loading(self, kind: str, keys: Iterable[str]):
+        """
+        Mark documents as being read from the database. Yields a function
+        telling whether a key was invalidated since the block began; the copy
+        loaded for it may predate that write and must not be cached.
+        """
+        started = {}
+        for key in keys:
+            loading = self._loading.setdefault((kind, key), [0, 0])
+            loading[0] += 1
+            started[key] = (loading, loading[1])
+        try:
+            yield lambda key: started[key][0][1] != started[key][1]
+        finally:
+            for key, (loading, _) in started.items():
+                loading[0] -= 1
+                if not loading[0]:
+                    del self._loading[(kind, key)]
+
+    async def read_through(
+        self, kind: str, key: str, loader: Callable[[], Awaitable[Optional[Dict[str, Any]]]]
+    ) -> Optional[Dict[str, Any]]:
+        """
+        Return the cached document or load and cache it. Missing documents are
+        not cached, nor are documents invalidated while they were loading.
+        """
+        document = self.get(kind, key)
+        if document is None:
+            with self.loading(kind, [key]) as invalidated:
+                document = await loader()
+            if document is not None and not invalidated(key):
+                self.put(kind, key, document)
+        return document
+
+    @contextmanager
+    def request_scope(self):
+        """
+        Within this block each document is read from the database at most
+        once, regardless of TTL or whether the shared cache is enabled.
+        """
+        token = _request_documents.set({})
+        try:
+            yield
+        finally:
+            _request_documents.reset(token)
+
+    def metrics(self) -> Dict[str, Any]:
+        """Hit/miss counters and hit rate per kind."""
+        kinds = {}
+        for kind, counters in self.stats.items():
+            lookups = counters["hits"] + counters["scope_hits"] + counters["misses"]
+            hits = counters["hits"] + counters["scope_hits"]
+            kinds[kind] = {**counters, "hit_rate": round(hits / lookups, 4) if lookups else 0.0}
+        return {
+            "enabled": self.enabled,
+            "entries": len(self._entries),
+            "max_entries": self.max_entries,
+            "ttl_seconds": self.ttl_seconds,
+            "kinds": kinds
+        }
+
+
+# Create a global instance
+entity_cache = EntityCache()
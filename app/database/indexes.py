@@ -0,0 +1,155 @@
+"""
+Declarative index registry.
+Every index the application's queries rely on is listed here and created
+idempotently at startup; the admin report checks they are actually used.
+"""
+from typing import Dict, Any, List
+
+from pymongo import ASCENDING, DESCENDING, TEXT, IndexModel
+from pymongo.errors import OperationFailure
+
+from app.config import settings
+from app.database.migrations import remove_duplicate_matches
+from app.database.mongodb import MongoDB
+
+# Collection name -> indexes. Names are explicit so re-running is a no-op
+# and a changed key under the same name fails loudly instead of duplicating.
+INDEXES = {
+    "matches": [
+        # get_matches_by_job: equality on job_id, sorted by score
+        IndexModel([("job_id", ASCENDING), ("score", DESCENDING)], name="job_id_score"),
+        IndexModel([("resume_id", ASCENDING)], name="resume_id"),
+        # upsert_matches key; unique so concurrent match runs cannot both insert
+        IndexModel([("job_id", ASCENDING), ("resume_id", ASCENDING)], name="job_id_resume_id_unique", unique=True),
+    ],
+    "resumes": [
+        # Blob reference checks on delete and duplicate detection
+        IndexModel([("content_hash", ASCENDING)], name="content_hash"),
+        IndexModel([("parsed_data.email", ASCENDING)], name="parsed_data_email"),
+        IndexModel([("upload_date", DESCENDING)], name="upload_date"),
+        # Re-queueing pending resumes at startup
+        IndexModel([("status", ASCENDING)], name="status"),
+    ],
+    "resume_texts": [
+        # Full-text search, kept off the hot resumes collection; name and
+        # skill hits outrank body-text hits
+        IndexModel(
+            [("terms", TEXT), ("name", TEXT), ("skills", TEXT), ("filename", TEXT)],
+            name="resume_text_search",
+            weights={"name": 10, "skills": 5, "filename": 2, "terms": 1},
+            default_language="english"
+        ),
+    ],
+}
+
+# Collection name -> cleanup that lets its unique indexes build, run when
+# index creation fails on duplicate keys
+DUPLICATE_CLEANUPS = {
+    "matches": remove_duplicate_matches,
+}
+
+# Representative shapes of the hot queries; explained for the admin report
+HOT_QUERIES = [
+    {"name": "matches_by_job", "collection": "matches",
+     "filter": {"job_id": ""}, "sort": [("score", DESCENDING)]},
+    {"name": "matches_by_resume", "collection": "matches",
+     "filter": {"resume_id": ""}, "sort": None},
+    {"name": "resume_by_content_hash", "collection": "resumes",
+     "filter": {"content_hash": ""}, "sort": None},
+    {"name": "resume_by_email", "collection": "resumes",
+     "filter": {"parsed_data.email": ""}, "sort": None},
+    {"name": "resumes_by_upload_date", "collection": "resumes",
+     "filter": {}, "sort": [("upload_date", DESCENDING)]},
+    {"name": "resumes_by_status", "collection": "resumes",
+     "filter": {"status": "pending"}, "sort": None},
+    {"name": "resume_text_search", "collection": "resume_texts",
+     "filter": {"$text": {"$search": "python"}}, "sort": None},
+]
+
+
+async def ensure_indexes():
+    """Create every registered index. Safe to run on every startup."""
+    for collection_name, models in INDEXES.items():
+        collection = MongoDB.get_collection(collection_name)
+        try:
+            try:
+                created = await collection.create_indexes(models)
+            except OperationFailure as e:
+                if e.code != 11000 or collection_name not in DUPLICATE_CLEANUPS:
+                    raise
+                print(f"⚠️  Duplicate keys in {collection_name}; removing them before building unique indexes")
+                await DUPLICATE_CLEANUPS[collection_name]()
+                created = await collection.create_indexes(models)
+            print(f"📇 Indexes ensured on {collection_name}: {', '.join(created)}")
+        except OperationFailure as e:
+            # An existing index with the same name but a different key/options
+            print(f"⚠️  Could not ensure indexes on {collection_name}: {e}")
+
+
+async def get_index_stats() -> Dict[str, List[Dict[str, Any]]]:
+    """Per-collection $indexStats: access counts since the server last started."""
+    stats = {}
+    for collection_name in INDEXES:
+        collection = MongoDB.get_collection(collection_name)
+        cursor = collection.aggregate([{"$indexStats": {}}])
+        stats[collection_name] = [
+            {
+                "name": index["name"],
+                "key": dict(index["key"]),
+                "accesses": int(index["accesses"]["ops"]),
+                "since": index["accesses"]["since"].isoformat()
+            }
+            async for index in cursor
+        ]
+    return stats
+
+
+def _plan_stages(plan: Dict[str, Any]) -> List[str]:
+    """Flatten a winning plan into its stage names, outermost first."""
+    stages = [plan.get("stage", "UNKNOWN")]
+    if "inputStage" in plan:
+        stages.extend(_plan_stages(plan["inputStage"]))
+    for child in plan.get("inputStages", []):
+        stages.extend(_plan_stages(child))
+    return stages
+
+
+async def explain_hot_queries() -> List[Dict[str, Any]]:
+    """Winning plan of each hot query; a COLLSCAN means its index is missing."""
+    plans = []
+    for query in HOT_QUERIES:
+        cursor = MongoDB.get_collection(query["collection"]).find(query["filter"])
+        if query["sort"]:
+            cursor = cursor.sort(query["sort"])
+        explain = await cursor.explain()
+        winning_plan = explain.get("queryPlanner", {}).get("winningPlan", {})
+        # Slot-based engine nests the classic plan under queryPlan
+        stages = _plan_stages(winning_plan.get("queryPlan", winning_plan))
+        plans.append({
+            "name": query["name"],
+            "collection": query["collection"],
+            "stages": stages,
+            "uses_index": "COLLSCAN" not in stages
+        })
+    return plans
+
+
+async def get_slow_queries(limit: int = 20) -> List[Dict[str, Any]]:
+    """
+    Recent operations slower than slow_query_ms from the database profiler.
+    Empty unless profiling is enabled on the server (db.setProfilingLevel).
+    """
+    cursor = MongoDB.get_collection("system.profile").find(
+        {"millis": {"$gte": settings.slow_query_ms}},
+        {"ns": 1, "op": 1, "millis": 1, "planSummary": 1, "ts": 1}
+    ).sort("ts", DESCENDING).limit(limit)
+    return [
+        {
+            "ns": entry.get("ns"),
+            "op": entry.get("op"),
+            "millis": entry.get("millis"),
+            "plan_summary": entry.get("planSummary"),
+            "ts": entry["ts"].isoformat() if entry.get("ts") else None
+        }
+        async for entry in cursor
+    ]
@@ -0,0 +1,1068 @@
+"""
+Embedded in-memory storage backend.
+Implements the subset of the Motor client/collection API that ResumeDB,
+JobDB, MatchDB, AnalyticsDB and the index registry use, so the application
+and benchmarks run without a MongoDB server (STORAGE_BACKEND=memory).
+
+Single-process only. With MEMORY_STORAGE_PATH set, collections are loaded
+from BSON snapshot files at connect and written back at close; writes since
+the last close are lost on a crash.
+"""
+import bisect
+import copy
+import itertools
+import os
+import re
+from collections import OrderedDict
+from datetime import datetime, timezone
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Set, Tuple
+
+import bson
+from bson import ObjectId
+from pymongo import UpdateOne
+from pymongo.errors import BulkWriteError, DuplicateKeyError, OperationFailure
+
+_MISSING = object()
+
+# Cross-type sort order, following MongoDB's BSON comparison order
+_TYPE_ORDER = {type(None): 0, int: 1, float: 1, str: 2, dict: 3, list: 4, bytes: 5, ObjectId: 6, bool: 7, datetime: 8}
+
+_TOKEN_PATTERN = re.compile(r"[a-z0-9][a-z0-9+#]*")
+
+
+# ---------------------------------------------------------------------------
+# Document paths and values
+# ---------------------------------------------------------------------------
+
+def _path_values(document: Any, path: str) -> List[Any]:
+    """Values at a dotted path; arrays along the path are traversed."""
+    values = [document]
+    for part in path.split("."):
+        found = []
+        for value in values:
+            if isinstance(value, dict):
+                if part in value:
+                    found.append(value[part])
+            elif isinstance(value, list):
+                for item in value:
+                    if isinstance(item, dict) and part in item:
+                        found.append(item[part])
+        values = found
+    return values
+
+
+def _get_path(document: Dict[str, Any], path: str, default: Any = _MISSING) -> Any:
+    """Single value at a dotted path, without array traversal."""
+    value = document
+    for part in path.split("."):
+        if not isinstance(value, dict) or part not in value:
+            return default
+        value = value[part]
+    return value
+
+
+def _set_path(document: Dict[str, Any], path: str, value: Any):
+    parts = path.split(".")
+    for part in parts[:-1]:
+        document = document.setdefault(part, {})
+    document[parts[-1]] = value
+
+
+def _sort_key(value: Any) -> Tuple[int, Any]:
+    if value is _MISSING:
+        value = None
+    rank = _TYPE_ORDER.get(type(value), 9)
+    if isinstance(value, (dict, list)):
+        return rank, repr(value)
+    return rank, value if value is not None else 0
+
+
+def _compare(left: Any, right: Any) -> Optional[int]:
+    """-1/0/1 for values of comparable type, None otherwise (MongoDB type bracketing)."""
+    if _TYPE_ORDER.get(type(left), 9) != _TYPE_ORDER.get(type(right), 9):
+        return None
+    try:
+        return (left > right) - (left < right)
+    except TypeError:
+        return None
+
+
+def _flatten(values: List[Any]) -> List[Any]:
+    """Array fields match element-wise as well as as a whole."""
+    flat = []
+    for value in values:
+        flat.append(value)
+        if isinstance(value, list):
+            flat.extend(value)
+    return flat
+
+
+# ---------------------------------------------------------------------------
+# Query matching
+# ---------------------------------------------------------------------------
+
+def _match_condition(values: List[Any], condition: Any) -> bool:
+    if isinstance(condition, dict) and condition and all(key.startswith("$") for key in condition):
+        return all(_match_operator(values, op, arg) for op, arg in condition.items())
+    return any(value == condition for value in _flatten(values)) or (condition is None and not values)
+
+
+def _match_operator(values: List[Any], op: str, arg: Any) -> bool:
+    flat = _flatten(values)
+    if op == "$eq":
+        return _match_condition(values, arg)
+    if op == "$ne":
+        return not _match_condition(values, arg)
+    if op == "$in":
+        return any(_match_condition(values, item) for item in arg)
+    if op == "$nin":
+        return not any(_match_condition(values, item) for item in arg)
+    if op == "$exists":
+        return bool(values) == bool(arg)
+    if op in ("$gt", "$gte", "$lt", "$lte"):
+        for value in flat:
+            result = _compare(value, arg)
+            if result is None:
+                continue
+            if (op == "$gt" and result > 0) or (op == "$gte" and result >= 0) \
+                    or (op == "$lt" and result < 0) or (op == "$lte" and result <= 0):
+                return True
+        return False
+    raise OperationFailure(f"Unsupported query operator in memory backend: {op}")
+
+
+def matches_filter(document: Dict[str, Any], query: Dict[str, Any]) -> bool:
+    """Whether a document satisfies a query filter ($text is handled by the caller)."""
+    for key, condition in query.items():
+        if key == "$text":
+            continue
+        if key == "$and":
+            if not all(matches_filter(document, sub) for sub in condition):
+                return False
+        elif key == "$or":
+            if not any(matches_filter(document, sub) for sub in condition):
+                return False
+        elif not _match_condition(_path_values(document, key), condition):
+            return False
+    return True
+
+
+# ---------------------------------------------------------------------------
+# Aggregation expressions and projection
+# ---------------------------------------------------------------------------
+
+def evaluate(document: Dict[str, Any], expression: Any) -> Any:
+    """Evaluate the aggregation expressions the application uses."""
+    if type(expression) is str and expression[:1] == "$":
+        return _get_path(document, expression[1:], None)
+    if isinstance(expression, dict) and len(expression) == 1:
+        op, arg = next(iter(expression.items()))
+        if op == "$ifNull":
+            for item in arg:
+                value = evaluate(document, item)
+                if value is not None:
+                    return value
+            return None
+        if op == "$substrCP":
+            text, start, length = (evaluate(document, item) for item in arg)
+            return (text or "")[start:start + length]
+        if op == "$literal":
+            return arg
+        if op.startswith("$"):
+            raise OperationFailure(f"Unsupported expression in memory backend: {op}")
+    if isinstance(expression, dict):
+        return {key: evaluate(document, value) for key, value in expression.items()}
+    if isinstance(expression, list):
+        return [evaluate(document, item) for item in expression]
+    return expression
+
+
+def project(document: Dict[str, Any], projection: Optional[Dict[str, Any]], score: float = 0.0) -> Dict[str, Any]:
+    """Apply an inclusion, exclusion or computed-field projection."""
+    if not projection:
+        return _clone(document)
+
+    computed = {}
+    include, exclude = [], []
+    for field, spec in projection.items():
+        if isinstance(spec, dict):
+            computed[field] = score if spec.get("$meta") == "textScore" else evaluate(document, spec)
+        elif spec and field != "_id":
+            include.append(field)
+        elif not spec:
+            exclude.append(field)
+
+    if include or (computed and not exclude):
+        result = {}
+        if projection.get("_id", 1):
+            result["_id"] = document.get("_id")
+        for field in include:
+            value = _get_path(document, field)
+            if value is not _MISSING:
+                _set_path(result, field, value)
+        result = _clone(result)
+    else:
+        result = _clone(document)
+        for field in exclude:
+            parts = field.split(".")
+            parent = _get_path(result, ".".join(parts[:-1])) if len(parts) > 1 else result
+            if isinstance(parent, dict):
+                parent.pop(parts[-1], None)
+    result.update(computed)
+    return result
+
+
+def _sort_documents(documents: List[Dict[str, Any]], spec: List[Tuple[str, Any]], score=None) -> List[Dict[str, Any]]:
+    """Stable multi-key sort, keys applied last to first. score gives each document's text score."""
+    for field, direction in reversed(spec):
+        if isinstance(direction, dict):  # {"$meta": "textScore"}: best first
+            documents = sorted(documents, key=score or (lambda document: 0.0), reverse=True)
+        else:
+            documents = sorted(
+                documents,
+                key=lambda document: _sort_key(_get_path(document, field)),
+                reverse=direction < 0
+            )
+    return documents
+
+
+def _normalize_sort(key_or_list: Any, direction: Any = None) -> List[Tuple[str, Any]]:
+    if isinstance(key_or_list, str):
+        return [(key_or_list, 1 if direction is None else direction)]
+    if isinstance(key_or_list, dict):
+        return list(key_or_list.items())
+    return list(key_or_list)
+
+
+# ---------------------------------------------------------------------------
+# Full-text search
+# ---------------------------------------------------------------------------
+
+def _parse_text_query(search: str) -> Tuple[List[str], List[str], List[str]]:
+    """Split a $search string into terms, "phrases" and -negated terms."""
+    phrases = [phrase.lower() for phrase in re.findall(r'"([^"]+)"', search)]
+    rest = re.sub(r'"[^"]*"', " ", search)
+    terms, negated = [], []
+    for word in rest.split():
+        target = negated if word.startswith("-") else terms
+        target.extend(_TOKEN_PATTERN.findall(word.lower()))
+    for phrase in phrases:
+        terms.extend(_TOKEN_PATTERN.findall(phrase))
+    return list(dict.fromkeys(terms)), phrases, negated
+
+
+def _field_text(document: Dict[str, Any], field: str) -> str:
+    values = _flatten(_path_values(document, field))
+    return " ".join(value for value in values if isinstance(value, str)).lower()
+
+
+# ---------------------------------------------------------------------------
+# Results
+# ---------------------------------------------------------------------------
+
+class InsertOneResult:
+    def __init__(self, inserted_id):
+        self.inserted_id = inserted_id
+
+
+class InsertManyResult:
+    def __init__(self, inserted_ids):
+        self.inserted_ids = inserted_ids
+
+
+class UpdateResult:
+    def __init__(self, matched_count: int, modified_count: int, upserted_id=None):
+        self.matched_count = matched_count
+        self.modified_count = modified_count
+        self.upserted_id = upserted_id
+
+
+class DeleteResult:
+    def __init__(self, deleted_count: int):
+        self.deleted_count = deleted_count
+
+
+class BulkWriteResult:
+    def __init__(self, bulk_api_result: Dict[str, Any]):
+        self.bulk_api_result = bulk_api_result
+
+
+# ---------------------------------------------------------------------------
+# Cursors
+# ---------------------------------------------------------------------------
+
+class MemoryCursor:
+    """Lazy find/aggregate cursor supporting sort/skip/limit, async iteration and to_list."""
+
+    def __init__(self, producer, planner=None):
+        self._producer = producer
+        self._planner = planner
+        self._sort = None
+        self._skip = 0
+        self._limit = 0
+        self._results = None
+
+    def sort(self, key_or_list, direction=None) -> "MemoryCursor":
+        self._sort = _normalize_sort(key_or_list, direction)
+        return self
+
+    def skip(self, count: int) -> "MemoryCursor":
+        self._skip = count
+        return self
+
+    def limit(self, count: int) -> "MemoryCursor":
+        self._limit = count
+        return self
+
+    def _evaluate(self) -> List[Dict[str, Any]]:
+        if self._results is None:
+            self._results = self._producer(self._sort, self._skip, self._limit)
+        return self._results
+
+    def __aiter__(self):
+        self._iterator = iter(self._evaluate())
+        return self
+
+    async def __anext__(self):
+        try:
+            return next(self._iterator)
+        except StopIteration:
+            raise StopAsyncIteration
+
+    async def to_list(self, length: Optional[int] = None) -> List[Dict[str, Any]]:
+        results = self._evaluate()
+        return list(results if length is None else results[:length])
+
+    async def explain(self) -> Dict[str, Any]:
+        plan = self._planner(self._sort) if self._planner else {"stage": "UNKNOWN"}
+        return {"queryPlanner": {"winningPlan": plan}}
+
+
+# ---------------------------------------------------------------------------
+# Collection
+# ---------------------------------------------------------------------------
+
+class MemoryCollection:
+    """
+    One collection: documents by row number, an _id-ordered list for range
+    scans, equality lookups on every index's leading field (multikey for
+    arrays) and an inverted term index for the text index.
+    Index buckets hold int row numbers rather than _ids because hashing an
+    ObjectId runs in Python and dominates lookup cost.
+    """
+
+    def __init__(self, name: str):
+        self.name = name
+        self._rows = {}  # type: Dict[int, Dict[str, Any]]
+        self._row_by_id = {}  # type: Dict[Any, int]
+        self._next_row = 0
+        self._ordered = None  # type: Optional[List[Dict[str, Any]]]  # Rebuilt lazily after inserts/deletes
+        self._ordered_keys = None  # type: Optional[List[Tuple[int, Any]]]
+        self._indexes = OrderedDict()  # type: OrderedDict[str, Dict[str, Any]]
+        self._lookups = {}  # type: Dict[str, Dict[Any, Set[int]]]
+        self._unhashable = {}  # type: Dict[str, Set[int]]
+        self._unique = {}  # type: Dict[str, Dict[Any, int]]  # Unique index -> key -> row
+        self._text_weights = None  # type: Optional[Dict[str, int]]
+        self._postings = {}  # type: Dict[str, Set[int]]
+        self._row_texts = {}  # type: Dict[int, Dict[str, Tuple[str, Set[str]]]]
+        self._accesses = {}  # type: Dict[str, int]
+        self._since = datetime.now(timezone.utc)
+        self._add_index({"name": "_id_", "key": {"_id": 1}, "unique": True})
+
+    # Indexes ---------------------------------------------------------------
+
+    def _add_index(self, spec: Dict[str, Any]):
+        name = spec["name"]
+        existing = self._indexes.get(name)
+        if existing and existing["key"] != spec["key"]:
+            raise OperationFailure(f"Index with name {name} already exists with a different key")
+        if spec.get("unique") and name != "_id_" and name not in self._unique:
+            keys = {}
+            for row, document in self._rows.items():
+                key = self._unique_key(spec, document)
+                if key in keys:
+                    raise DuplicateKeyError(
+                        f"E11000 duplicate key error collection: {self.name} index: {name} dup key: {key}",
+                        code=11000
+                    )
+                keys[key] = row
+            self._unique[name] = keys
+        self._indexes[name] = spec
+        self._accesses.setdefault(name, 0)
+
+        if "text" in spec["key"].values():
+            if self._text_weights is None:
+                self._text_weights = spec.get("weights") or {field: 1 for field in spec["key"]}
+                for row, document in self._rows.items():
+                    self._index_text(row, document)
+            return
+        field = next(iter(spec["key"]))
+        if field != "_id" and field not in self._lookups:
+            self._lookups[field] = {}
+            self._unhashable[field] = set()
+            for row, document in self._rows.items():
+                self._index_field(field, row, document)
+
+    def _index_field(self, field: str, row: int, document: Dict[str, Any], remove: bool = False):
+        lookup = self._lookups[field]
+        for value in _flatten(_path_values(document, field)) or [None]:
+            if not _hashable(value):
+                bucket = self._unhashable[field]
+            elif remove:
+                bucket = lookup.get(value, set())
+            else:
+                bucket = lookup.setdefault(value, set())
+            if remove:
+                bucket.discard(row)
+            else:
+                bucket.add(row)
+
+    @staticmethod
+    def _unique_key(spec: Dict[str, Any], document: Dict[str, Any]) -> Any:
+        values = tuple(_get_path(document, field, None) for field in spec["key"])
+        return values if _hashable(values) else repr(values)
+
+    def _check_unique(self, document: Dict[str, Any], row: Optional[int]):
+        """Raise DuplicateKeyError if document would collide with another row on a unique index."""
+        for name, keys in self._unique.items():
+            key = self._unique_key(self._indexes[name], document)
+            if keys.get(key, row) != row:
+                raise DuplicateKeyError(
+                    f"E11000 duplicate key error collection: {self.name} index: {name} dup key: {key}",
+                    code=11000
+                )
+
+    def _index_text(self, row: int, document: Dict[str, Any], remove: bool = False):
+        if remove:
+            fields = self._row_texts.pop(row, {})
+        else:
+            fields = {}
+            for field in self._text_weights:
+                text = _field_text(document, field)
+                fields[field] = (text, set(_TOKEN_PATTERN.findall(text)))
+            self._row_texts[row] = fields
+        for token in set().union(*(tokens for _, tokens in fields.values())):
+            if remove:
+                self._postings.get(token, set()).discard(row)
+            else:
+                self._postings.setdefault(token, set()).add(row)
+
+    def _reindex(self, row: int, remove: bool = False):
+        document = self._rows[row]
+        for field in self._lookups:
+            self._index_field(field, row, document, remove)
+        for name, keys in self._unique.items():
+            key = self._unique_key(self._indexes[name], document)
+            if remove:
+                keys.pop(key, None)
+            else:
+                keys[key] = row
+        if self._text_weights is not None:
+            self._index_text(row, document, remove)
+
+    def _index_for(self, field: str) -> str:
+        for name, spec in self._indexes.items():
+            if next(iter(spec["key"])) == field:
+                return name
+        return "_id_"
+
+    def _text_index_name(self) -> str:
+        for name, spec in self._indexes.items():
+            if "text" in spec["key"].values():
+                return name
+        raise OperationFailure("text index required for $text query")
+
+    def _sorted(self) -> List[Dict[str, Any]]:
+        """All documents in ascending _id order."""
+        if self._ordered is None:
+            self._ordered = sorted(self._rows.values(), key=lambda document: _sort_key(document["_id"]))
+            self._ordered_keys = [_sort_key(document["_id"]) for document in self._ordered]
+        return self._ordered
+
+    async def create_indexes(self, models: Iterable[Any]) -> List[str]:
+        names = []
+        for model in models:
+            document = dict(model.document)
+            document["key"] = dict(document["key"])
+            self._add_index(document)
+            names.append(document["name"])
+        return names
+
+    # Candidate selection ---------------------------------------------------
+
+    def _id_range(self, condition: Dict[str, Any]) -> List[Dict[str, Any]]:
+        """Documents whose _id is inside a $gt/$gte/$lt/$lte range, ascending."""
+        documents = self._sorted()
+        low, high = 0, len(documents)
+        for op, bound in condition.items():
+            key = _sort_key(bound)
+            if op == "$gt":
+                low = max(low, bisect.bisect_right(self._ordered_keys, key))
+            elif op == "$gte":
+                low = max(low, bisect.bisect_left(self._ordered_keys, key))
+            elif op == "$lt":
+                high = min(high, bisect.bisect_left(self._ordered_keys, key))
+            else:
+                high = min(high, bisect.bisect_right(self._ordered_keys, key))
+        return documents[low:high]
+
+    def _equality_rows(self, field: str, condition: Any) -> Optional[Set[int]]:
+        """Rows an equality or $in condition can match, or None when no lookup applies."""
+        if isinstance(condition, dict) and any(key.startswith("$") for key in condition):
+            if set(condition) != {"$in"}:
+                return None
+            wanted = list(condition["$in"])
+        else:
+            wanted = [condition]
+        if not all(_hashable(value) for value in wanted):
+            return None
+        if field == "_id":
+            return {self._row_by_id[value] for value in wanted if value in self._row_by_id}
+        rows = set(self._unhashable[field])
+        for value in wanted:
+            rows |= self._lookups[field].get(value, set())
+        return rows
+
+    def _candidates(self, query: Dict[str, Any]) -> Tuple[List[Dict[str, Any]], Dict[str, Any], bool, Optional[str]]:
+        """
+        Documents worth testing against the filter, the plan that chose them,
+        whether they are already in ascending _id order, and the query field
+        the index answered exactly (None if every condition must still be checked).
+        """
+        if "$text" in query:
+            name = self._text_index_name()
+            terms, phrases, _ = _parse_text_query(query["$text"].get("$search", ""))
+            rows = set()
+            for term in terms:
+                rows |= self._postings.get(term, set())
+            self._accesses[name] += 1
+            plan = {"stage": "TEXT_MATCH", "inputStage": _ixscan(name)}
+            return [self._rows[row] for row in rows], plan, False, None
+
+        best, best_field = None, None
+        for field, condition in query.items():
+            if field != "_id" and field not in self._lookups:
+                continue
+            rows = self._equality_rows(field, condition)
+            if rows is not None and (best is None or len(rows) < len(best)):
+                best, best_field = rows, field
+        if best is not None:
+            name = self._index_for(best_field)
+            self._accesses[name] += 1
+            # Array and unhashable values need the full comparison
+            exact = best_field == "_id" or not self._unhashable[best_field]
+            # Like MongoDB, no particular order without a sort
+            return [self._rows[row] for row in best], _ixscan(name), False, best_field if exact else None
+
+        condition = query.get("_id")
+        if isinstance(condition, dict) and condition and set(condition) <= {"$gt", "$gte", "$lt", "$lte"}:
+            self._accesses["_id_"] += 1
+            return self._id_range(condition), _ixscan("_id_"), True, "_id"
+        return self._sorted(), {"stage": "COLLSCAN"}, True, None
+
+    def _select(self, query: Optional[Dict[str, Any]]) -> Tuple[List[Dict[str, Any]], Optional[Dict[int, float]], Dict[str, Any], bool]:
+        """
+        Matching documents, their text scores keyed by id(document) for $text
+        queries (else None), the plan, and whether documents are in _id order.
+        """
+        query = query or {}
+        candidates, plan, ordered, covered = self._candidates(query)
+        residual = {key: condition for key, condition in query.items() if key != covered}
+        text = residual.pop("$text", None)
+        if residual:
+            candidates = [document for document in candidates if matches_filter(document, residual)]
+        if text is None:
+            return candidates, None, plan, ordered
+
+        terms, phrases, negated = _parse_text_query(text.get("$search", ""))
+        documents, scores = [], {}
+        for document in candidates:
+            score = self._text_score(self._row_by_id[document["_id"]], terms, phrases, negated)
+            if score > 0:
+                documents.append(document)
+                scores[id(document)] = score
+        return documents, scores, plan, False
+
+    def _text_score(self, row: int, terms: List[str], phrases: List[str], negated: List[str]) -> float:
+        """Sum of field weights over matched terms; 0 when a phrase is missing or an excluded term is present."""
+        fields = self._row_texts.get(row, {})
+        if negated and any(term in tokens for _, tokens in fields.values() for term in negated):
+            return 0.0
+        if phrases and not all(any(phrase in text for text, _ in fields.values()) for phrase in phrases):
+            return 0.0
+        return float(sum(
+            self._text_weights[field] for field, (_, tokens) in fields.items() for term in terms if term in tokens
+        ))
+
+    # Reads -----------------------------------------------------------------
+
+    def find(self, query: Optional[Dict[str, Any]] = None, projection: Optional[Dict[str, Any]] = None) -> MemoryCursor:
+        query = query or {}
+
+        def produce(sort, skip, limit):
+            documents, scores, _, _ = self._select(query)
+            scores = scores or {}
+            if sort:
+                documents = _sort_documents(documents, sort, score=lambda document: scores[id(document)])
+            documents = documents[skip:skip + limit] if limit else documents[skip:]
+            return [project(document, projection, scores.get(id(document), 0.0)) for document in documents]
+
+        return MemoryCursor(produce, lambda sort: self._plan(query, sort))
+
+    def _plan(self, query: Dict[str, Any], sort: Optional[List[Tuple[str, Any]]]) -> Dict[str, Any]:
+        """Winning plan in the shape of a find explain; an index on the sort key replaces a COLLSCAN."""
+        plan = self._select(query)[2]
+        if plan["stage"] == "COLLSCAN" and sort and sort[0][0] in self._lookups:
+            plan = _ixscan(self._index_for(sort[0][0]))
+        return {"stage": "FETCH", "inputStage": plan} if plan["stage"] == "IXSCAN" else plan
+
+    async def find_one(self, query: Optional[Dict[str, Any]] = None, projection: Optional[Dict[str, Any]] = None):
+        results = await self.find(query, projection).limit(1).to_list(1)
+        return results[0] if results else None
+
+    async def count_documents(self, query: Dict[str, Any]) -> int:
+        return len(self._select(query)[0])
+
+    async def estimated_document_count(self) -> int:
+        return len(self._rows)
+
+    async def distinct(self, field: str, query: Optional[Dict[str, Any]] = None) -> List[Any]:
+        values = []
+        for document in self._select(query)[0]:
+            for value in _flatten(_path_values(document, field)):
+                if not isinstance(value, list) and value not in values:
+                    values.append(value)
+        return values
+
+    def aggregate(self, pipeline: List[Dict[str, Any]], allowDiskUse: bool = False) -> MemoryCursor:
+        def produce(sort, skip, limit):
+            rows = self._run_pipeline(pipeline)
+            if sort:
+                rows = _sort_documents(rows, sort)
+            rows = rows[skip:]
+            return rows[:limit] if limit else rows
+        return MemoryCursor(produce)
+
+    def _run_pipeline(self, pipeline: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """
+        Stages pass stored documents by reference and never mutate them;
+        only the final rows are copied. $match, $project and $unwind stream,
+        so e.g. $unwind + $group never holds every unwound row at once.
+        """
+        rows, ordered, copied = None, False, False
+        for stage in pipeline:
+            (op, arg), = stage.items()
+            if op == "$indexStats":
+                rows = [
+                    {"name": name, "key": dict(spec["key"]),
+                     "accesses": {"ops": self._accesses.get(name, 0), "since": self._since}}
+                    for name, spec in self._indexes.items()
+                ]
+                continue
+            if rows is None:
+                if op == "$match":
+                    rows, _, _, ordered = self._select(arg)
+                else:
+                    rows, ordered = self._sorted(), True
+                fields = _pipeline_fields(pipeline)
+                if fields is not None:
+                    # Only carry the fields later stages read, as MongoDB's dependency analysis does
+                    rows = [{field: row[field] for field in fields if field in row} for row in rows]
+                if op == "$match":
+                    continue
+
+            if op == "$match":
+                rows = (row for row in rows if matches_filter(row, arg))
+            elif op == "$sort" and ordered and list(arg) == ["_id"]:
+                # Already in _id order from the range scan or the ordered collection
+                rows = list(rows) if arg["_id"] > 0 else list(rows)[::-1]
+            elif op == "$sort":
+                rows = _sort_documents(list(rows), list(arg.items()))
+            elif op == "$limit":
+                rows = list(itertools.islice(rows, arg))
+            elif op == "$skip":
+                rows = list(itertools.islice(rows, arg, None))
+            elif op == "$project":
+                rows = (project(row, arg) for row in rows)
+            elif op == "$unwind":
+                path = arg if isinstance(arg, str) else arg["path"]
+                rows = _unwind(rows, path[1:])
+            elif op == "$group":
+                rows = _group(rows, arg)
+            elif op == "$bucket":
+                rows = _bucket(rows, arg)
+            else:
+                raise OperationFailure(f"Unsupported pipeline stage in memory backend: {op}")
+            ordered = ordered and op in ("$match", "$limit", "$skip")
+            # $project output is already a copy; later row-preserving stages keep it one
+            copied = op == "$project" or (copied and op in ("$match", "$sort", "$limit", "$skip"))
+        return [row if copied else _clone(row) for row in rows or []]
+
+    # Writes ----------------------------------------------------------------
+
+    def _insert(self, document: Dict[str, Any]):
+        document.setdefault("_id", ObjectId())
+        if document["_id"] in self._row_by_id:
+            raise DuplicateKeyError(
+                f"E11000 duplicate key error collection: {self.name} dup key: {{ _id: {document['_id']} }}",
+                code=11000
+            )
+        self._check_unique(document, None)
+        row = self._next_row
+        self._next_row += 1
+        self._rows[row] = _clone(document)
+        self._row_by_id[document["_id"]] = row
+        self._ordered = None
+        self._reindex(row)
+
+    async def insert_one(self, document: Dict[str, Any]) -> InsertOneResult:
+        self._insert(document)
+        return InsertOneResult(document["_id"])
+
+    async def insert_many(self, documents: List[Dict[str, Any]], ordered: bool = True) -> InsertManyResult:
+        inserted, errors = [], []
+        for index, document in enumerate(documents):
+            try:
+                self._insert(document)
+                inserted.append(document["_id"])
+            except DuplicateKeyError as e:
+                errors.append({"index": index, "code": 11000, "errmsg": str(e), "op": document})
+                if ordered:
+                    break
+        if errors:
+            raise BulkWriteError({
+                "writeErrors": errors, "writeConcernErrors": [], "nInserted": len(inserted),
+                "nUpserted": 0, "nMatched": 0, "nModified": 0, "nRemoved": 0, "upserted": []
+            })
+        return InsertManyResult(inserted)
+
+    @staticmethod
+    def _apply_update(document: Dict[str, Any], update: Dict[str, Any], inserting: bool = False) -> bool:
+        """
+        Apply $set/$unset/$inc, and $setOnInsert when inserting, in place;
+        returns whether anything changed.
+        """
+        modified = False
+        for op, fields in update.items():
+            if op == "$setOnInsert" and not inserting:
+                continue
+            for path in fields:
+                before = _get_path(document, path)
+                if op in ("$set", "$setOnInsert"):
+                    after = copy.deepcopy(fields[path])
+                elif op == "$unset":
+                    after = _MISSING
+                elif op == "$inc":
+                    after = (0 if before is _MISSING else before) + fields[path]
+                else:
+                    raise OperationFailure(f"Unsupported update operator in memory backend: {op}")
+                if after == before:
+                    continue
+                modified = True
+                if after is _MISSING:
+                    parts = path.split(".")
+                    parent = _get_path(document, ".".join(parts[:-1])) if len(parts) > 1 else document
+                    parent.pop(parts[-1], None)
+                else:
+                    _set_path(document, path, after)
+        return modified
+
+    def _update(self, document: Dict[str, Any], update: Dict[str, Any]) -> bool:
+        row = self._row_by_id[document["_id"]]
+        if self._unique:
+            candidate = _clone(document)
+            self._apply_update(candidate, update)
+            self._check_unique(candidate, row)
+        self._reindex(row, remove=True)
+        modified = self._apply_update(document, update)
+        self._reindex(row)
+        return modified
+
+    async def update_one(self, query: Dict[str, Any], update: Dict[str, Any], upsert: bool = False) -> UpdateResult:
+        selected = self._select(query)[0]
+        if selected:
+            modified = self._update(selected[0], update)
+            return UpdateResult(1, int(modified))
+        if upsert:
+            document = {key: value for key, value in query.items()
+                        if not key.startswith("$") and not isinstance(value, dict)}
+            self._apply_update(document, update, inserting=True)
+            self._insert(document)
+            return UpdateResult(0, 0, document["_id"])
+        return UpdateResult(0, 0)
+
+    async def update_many(self, query: Dict[str, Any], update: Dict[str, Any]) -> UpdateResult:
+        selected = self._select(query)[0]
+        modified = 0
+        for document in selected:
+            modified += self._update(document, update)
+        return UpdateResult(len(selected), modified)
+
+    async def bulk_write(self, operations: List[Any], ordered: bool = True) -> BulkWriteResult:
+        summary = {"nInserted": 0, "nUpserted": 0, "nMatched": 0, "nModified": 0, "nRemoved": 0,
+                   "upserted": [], "writeErrors": [], "writeConcernErrors": []}
+        for index, operation in enumerate(operations):
+            if not isinstance(operation, UpdateOne):
+                raise OperationFailure("Only UpdateOne is supported by the memory backend's bulk_write")
+            try:
+                result = await self.update_one(operation._filter, operation._doc, upsert=operation._upsert)
+            except DuplicateKeyError as e:
+                summary["writeErrors"].append({"index": index, "code": 11000, "errmsg": str(e)})
+                if ordered:
+                    break
+                continue
+            summary["nMatched"] += result.matched_count
+            summary["nModified"] += result.modified_count
+            if result.upserted_id is not None:
+                summary["nUpserted"] += 1
+                summary["upserted"].append({"index": index, "_id": result.upserted_id})
+        if summary["writeErrors"]:
+            raise BulkWriteError(summary)
+        return BulkWriteResult(summary)
+
+    def _remove(self, document: Dict[str, Any]):
+        row = self._row_by_id.pop(document["_id"])
+        self._reindex(row, remove=True)
+        del self._rows[row]
+        self._ordered = None
+
+    async def delete_one(self, query: Dict[str, Any]) -> DeleteResult:
+        selected = self._select(query)[0]
+        if not selected:
+            return DeleteResult(0)
+        self._remove(selected[0])
+        return DeleteResult(1)
+
+    async def delete_many(self, query: Dict[str, Any]) -> DeleteResult:
+        selected = self._select(query)[0]
+        for document in selected:
+            self._remove(document)
+        return DeleteResult(len(selected))
+
+    async def find_one_and_delete(self, query: Dict[str, Any], projection: Optional[Dict[str, Any]] = None):
+        selected = self._select(query)[0]
+        if not selected:
+            return None
+        document = selected[0]
+        self._remove(document)
+        return project(document, projection)
+
+    # Persistence -----------------------------------------------------------
+
+    def load(self, path: str):
+        with open(path, "rb") as f:
+            for document in bson.decode_all(f.read()):
+                self._insert(document)
+
+    def save(self, path: str):
+        tmp_path = f"{path}.tmp"
+        with open(tmp_path, "wb") as f:
+            for document in self._rows.values():
+                f.write(bson.encode(document))
+        os.replace(tmp_path, path)
+
+
+def _clone(document: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Independent copy of a document via a BSON round-trip, several times faster
+    than deepcopy. Values come back as MongoDB would return them (e.g. naive
+    UTC datetimes, tuples as lists).
+    """
+    return bson.decode(bson.encode(document))
+
+
+def _pipeline_fields(pipeline: List[Dict[str, Any]]) -> Optional[Set[str]]:
+    """
+    Top-level fields a pipeline reads before its first $group/$bucket, or
+    None when whole documents may reach the output.
+    """
+    fields = set()
+
+    def collect(value: Any):
+        if isinstance(value, str) and value.startswith("$"):
+            fields.add(value[1:].split(".")[0])
+        elif isinstance(value, dict):
+            for item in value.values():
+                collect(item)
+        elif isinstance(value, list):
+            for item in value:
+                collect(item)
+
+    for stage in pipeline:
+        (op, arg), = stage.items()
+        if op in ("$match", "$sort"):
+            if any(key.startswith("$") for key in arg):
+                return None
+            fields.update(key.split(".")[0] for key in arg)
+        elif op in ("$unwind", "$limit", "$skip"):
+            collect(arg)
+        elif op in ("$group", "$bucket"):
+            collect(arg)
+            return fields
+        else:
+            return None
+    return None
+
+
+def _hashable(value: Any) -> bool:
+    try:
+        hash(value)
+        return True
+    except TypeError:
+        return False
+
+
+def _ixscan(name: str) -> Dict[str, Any]:
+    return {"stage": "IXSCAN", "indexName": name}
+
+
+def _unwind(rows: Iterable[Dict[str, Any]], field: str) -> Iterator[Dict[str, Any]]:
+    """One row per array element; rows without the field (or with null) are dropped."""
+    for row in rows:
+        value = _get_path(row, field, None)
+        if isinstance(value, list):
+            for item in value:
+                yield _with_path(row, field, item)
+        elif value is not None:
+            yield row
+
+
+def _with_path(row: Dict[str, Any], field: str, value: Any) -> Dict[str, Any]:
+    """Shallow copy of row with value at field; dicts along the path are copied, not shared."""
+    parts = field.split(".")
+    row = dict(row)
+    parent = row
+    for part in parts[:-1]:
+        parent[part] = dict(parent.get(part) or {})
+        parent = parent[part]
+    parent[parts[-1]] = value
+    return row
+
+
+def _group(rows: List[Dict[str, Any]], spec: Dict[str, Any]) -> List[Dict[str, Any]]:
+    groups = OrderedDict()
+    for row in rows:
+        key = evaluate(row, spec["_id"])
+        hashable_key = repr(key) if not _hashable(key) else key
+        state = groups.setdefault(hashable_key, {"_id": key, "__count__": {}})
+        for field, accumulator in spec.items():
+            if field == "_id":
+                continue
+            (op, expression), = accumulator.items()
+            value = evaluate(row, expression)
+            if op == "$sum":
+                state[field] = state.get(field, 0) + (value if isinstance(value, (int, float)) else 0)
+            elif op == "$first":
+                state.setdefault(field, value)
+            elif op == "$last":
+                state[field] = value
+            elif op in ("$max", "$min"):
+                current = state.get(field)
+                if value is not None and (current is None or (value > current if op == "$max" else value < current)):
+                    state[field] = value
+                state.setdefault(field, None)
+            elif op == "$avg":
+                if isinstance(value, (int, float)):
+                    total, count = state["__count__"].get(field, (0, 0))
+                    state["__count__"][field] = (total + value, count + 1)
+            elif op == "$push":
+                state.setdefault(field, []).append(value)
+            else:
+                raise OperationFailure(f"Unsupported accumulator in memory backend: {op}")
+    results = []
+    for state in groups.values():
+        for field, (total, count) in state.pop("__count__").items():
+            state[field] = total / count if count else None
+        for field, accumulator in spec.items():
+            if field != "_id" and "$avg" in accumulator:
+                state.setdefault(field, None)
+        results.append(state)
+    return results
+
+
+def _bucket(rows: List[Dict[str, Any]], spec: Dict[str, Any]) -> List[Dict[str, Any]]:
+    boundaries = spec["boundaries"]
+    counts = OrderedDict((low, 0) for low in boundaries[:-1])
+    default = spec.get("default", _MISSING)
+    for row in rows:
+        value = evaluate(row, spec["groupBy"])
+        for low, high in zip(boundaries, boundaries[1:]):
+            if isinstance(value, (int, float)) and low <= value < high:
+                counts[low] += 1
+                break
+        else:
+            if default is _MISSING:
+                raise OperationFailure("$bucket value outside boundaries and no default")
+            counts[default] = counts.get(default, 0) + 1
+    return [{"_id": key, "count": count} for key, count in counts.items() if count]
+
+
+# ---------------------------------------------------------------------------
+# Client and database
+# ---------------------------------------------------------------------------
+
+class MemoryDatabase:
+    """Collections by name, created on first access."""
+
+    def __init__(self, name: str):
+        self.name = name
+        self._collections = {}  # type: Dict[str, MemoryCollection]
+
+    def __getitem__(self, name: str) -> MemoryCollection:
+        if name not in self._collections:
+            self._collections[name] = MemoryCollection(name)
+        return self._collections[name]
+
+    async def command(self, name: str, *args, **kwargs) -> Dict[str, Any]:
+        if name == "ping":
+            return {"ok": 1.0}
+        raise OperationFailure(f"Unsupported command in memory backend: {name}")
+
+    def load(self, directory: str):
+        """Load every <collection>.bson snapshot in directory."""
+        for filename in sorted(os.listdir(directory)):
+            if filename.endswith(".bson"):
+                self[filename[:-len(".bson")]].load(os.path.join(directory, filename))
+
+    def save(self, directory: str):
+        """Write every collection to <collection>.bson in directory."""
+        os.makedirs(directory, exist_ok=True)
+        for name, collection in self._collections.items():
+            if not name.startswith("system."):
+                collection.save(os.path.join(directory, f"{name}.bson"))
+
+
+class _TopologyDescription:
+    """No servers to monitor."""
+
+    def server_descriptions(self) -> Dict[Any, Any]:
+        return {}
+
+
+class MemoryClient:
+    """Stands in for AsyncIOMotorClient when STORAGE_BACKEND=memory."""
+
+    def __init__(self, storage_path: str = ""):
+        self.storage_path = storage_path
+        self._databases = {}  # type: Dict[str, MemoryDatabase]
+        self.admin = MemoryDatabase("admin")
+        self.topology_description = _TopologyDescription()
+
+    def __getitem__(self, name: str) -> MemoryDatabase:
+        if name not in self._databases:
+            database = MemoryDatabase(name)
+            path = self._database_path(name)
+            if path and os.path.isdir(path):
+                database.load(path)
+            self._databases[name] = database
+        return self._databases[name]
+
+    def _database_path(self, name: str) -> str:
+        return os.path.join(self.storage_path, name) if self.storage_path else ""
+
+    def close(self):
+        """Write snapshots when a storage path is configured."""
+        for name, database in self._databases.items():
+            path = self._database_path(name)
+            if path:
+                database.save(path)
@@ -0,0 +1,167 @@
+"""
+Batched schema migration runner.
+Upgrades every outdated document with unordered bulk_write batches in _id
+order, checkpointing the last _id of each batch so an interrupted run
+resumes where it stopped.
+"""
+import json
+import os
+from typing import Any, Callable, Dict, List, Optional
+
+from bson import ObjectId
+
+from app.config import settings
+from app.database.mongodb import MongoDB, VersionDB, load_migration_inputs, write_migrations
+from app.database.schema import SCHEMA_VERSIONS, outdated_filter
+
+# Bulky fields left out of the scan; a migration that needs one lists it in
+# MIGRATION_INPUTS and it is loaded for the documents that still need it
+MIGRATION_PROJECTIONS = {
+    "resumes": {"text_content": 0, "skill_bits": 0},
+    "jobs": None,
+    "matches": None,
+}
+
+
+def load_checkpoint(path: Optional[str]) -> Dict[str, str]:
+    """Collection -> last migrated _id from a previous interrupted run."""
+    if not path or not os.path.exists(path):
+        return {}
+    with open(path, encoding="utf-8") as f:
+        return json.load(f)
+
+
+def save_checkpoint(path: Optional[str], checkpoint: Dict[str, str]):
+    if not path:
+        return
+    if not checkpoint:
+        if os.path.exists(path):
+            os.remove(path)
+        return
+    tmp_path = f"{path}.tmp"
+    with open(tmp_path, "w", encoding="utf-8") as f:
+        json.dump(checkpoint, f)
+    os.replace(tmp_path, path)
+
+
+async def migrate_collection(
+    collection_name: str,
+    checkpoint: Dict[str, str],
+    checkpoint_path: Optional[str] = None,
+    batch_size: Optional[int] = None,
+    progress: Callable[[str], None] = print
+) -> Dict[str, Any]:
+    """
+    Upgrade the outdated documents of one collection.
+
+    Args:
+        collection_name: Collection with an entry in SCHEMA_VERSIONS
+        checkpoint: Shared checkpoint; updated after every batch
+        checkpoint_path: Where to persist the checkpoint (None keeps it in memory)
+        batch_size: Documents per bulk_write (default db_batch_size)
+        progress: Receives one line per batch
+
+    Returns:
+        {"migrated": n, "errors": [{"index", "code", "message"}]}
+    """
+    collection = MongoDB.get_collection(collection_name)
+    query = outdated_filter(collection_name)
+    if checkpoint.get(collection_name):
+        query["_id"] = {"$gt": ObjectId(checkpoint[collection_name])}
+
+    total = await collection.count_documents(query)
+    summary = {"migrated": 0, "errors": []}  # type: Dict[str, Any]
+    if not total:
+        progress(f"   {collection_name}: up to date (v{SCHEMA_VERSIONS[collection_name]})")
+        return summary
+
+    batch_size = max(1, batch_size or settings.db_batch_size)
+    done = 0
+
+    async def flush(batch: List[Dict[str, Any]]):
+        nonlocal done
+        await load_migration_inputs(collection_name, batch)
+        result = await write_migrations(collection_name, batch)
+        summary["migrated"] += result["migrated"]
+        summary["errors"].extend({**error, "index": done + error["index"]} for error in result["errors"])
+        done += len(batch)
+        checkpoint[collection_name] = str(batch[-1]["_id"])
+        save_checkpoint(checkpoint_path, checkpoint)
+        progress(f"   {collection_name}: {done}/{total} documents")
+
+    batch = []
+    cursor = collection.find(query, MIGRATION_PROJECTIONS[collection_name]).sort("_id", 1)
+    async for document in cursor:
+        batch.append(document)
+        if len(batch) == batch_size:
+            await flush(batch)
+            batch = []
+    if batch:
+        await flush(batch)
+
+    checkpoint.pop(collection_name, None)
+    save_checkpoint(checkpoint_path, checkpoint)
+    return summary
+
+
+async def run_migrations(
+    collection_names: Optional[List[str]] = None,
+    checkpoint_path: Optional[str] = None,
+    batch_size: Optional[int] = None,
+    progress: Callable[[str], None] = print
+) -> Dict[str, Dict[str, Any]]:
+    """Migrate every (or the given) versioned collection; see migrate_collection."""
+    checkpoint = load_checkpoint(checkpoint_path)
+    results = {}
+    for collection_name in collection_names or list(SCHEMA_VERSIONS):
+        results[collection_name] = await migrate_collection(
+            collection_name, checkpoint, checkpoint_path, batch_size, progress
+        )
+    return results
+
+
+async def remove_duplicate_matches(
+    batch_size: Optional[int] = None,
+    progress: Callable[[str], None] = print
+) -> int:
+    """
+    Delete all but the newest match per (job_id, resume_id). Match runs used
+    to insert a new row for every result, so older databases hold several
+    per pair; the unique job_id_resume_id_unique index cannot be built until
+    they are gone.
+
+    Returns:
+        Number of matches deleted
+    """
+    collection = MongoDB.get_collection("matches")
+    batch_size = max(1, batch_size or settings.db_batch_size)
+    cursor = collection.aggregate([
+        {"$sort": {"timestamp": -1, "_id": -1}},
+        {"$group": {
+            "_id": {"job_id": "$job_id", "resume_id": "$resume_id"},
+            "ids": {"$push": "$_id"},
+            "count": {"$sum": 1}
+        }},
+        {"$match": {"count": {"$gt": 1}}}
+    ], allowDiskUse=True)
+
+    deleted = 0
+    stale, job_ids = [], set()
+
+    async def flush():
+        nonlocal deleted, stale
+        result = await collection.delete_many({"_id": {"$in": stale}})
+        deleted += result.deleted_count
+        stale = []
+        progress(f"   matches: {deleted} duplicate(s) removed")
+
+    async for group in cursor:
+        stale.extend(group["ids"][1:])
+        job_ids.add(group["_id"]["job_id"])
+        if len(stale) >= batch_size:
+            await flush()
+    if stale:
+        await flush()
+    if deleted:
+        await VersionDB.bump(*(VersionDB.job_key(job_id) for job_id in job_ids))
+    return deleted
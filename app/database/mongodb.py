@@ -3,10 +3,233 @@ MongoDB database connection and operations.
 Handles all database interactions using Motor (async MongoDB driver).
 """
 from motor.motor_asyncio import AsyncIOMotorClient, AsyncIOMotorDatabase
-from typing import Optional, List, Dict, Any, ClassVar
-from datetime import datetime, timezone
+from typing import Optional, List, Dict, Any, ClassVar, Iterable, Tuple
+from datetime import datetime, timedelta, timezone
 from bson import ObjectId
+from bson.errors import InvalidId
+from pymongo import UpdateOne
+from pymongo.errors import BulkWriteError
+import base64
+import binascii
+import math
+import secrets
+import time
 from app.config import settings
+from app.database.blob_store import blob_store
+from app.database.entity_cache import entity_cache
+from app.database.memory_backend import MemoryClient
+from app.database.pool_monitor import pool_monitor
+from app.database.schema import (
+    SCHEMA_VERSIONS, compress_text, decompress_text, migration_inputs,
+    migration_update, normalize_fields, schema_version, search_fields, search_terms, stamp_new
+)
+
+
+
+def encode_cursor(object_id: ObjectId) -> str:
+    """Opaque page cursor for the last _id of a page."""
+    return base64.urlsafe_b64encode(object_id.binary).decode("ascii").rstrip("=")
+
+
+def decode_cursor(cursor: str) -> ObjectId:
+    """
+    Decode a cursor from encode_cursor.
+
+    Raises:
+        ValueError: If the cursor is malformed
+    """
+    try:
+        return ObjectId(base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4)))
+    except (binascii.Error, TypeError, ValueError) as e:
+        raise ValueError("Invalid cursor") from e
+
+
+def batched(items: List[Any], size: Optional[int] = None) -> List[List[Any]]:
+    """Split items into chunks of at most size (default db_batch_size)."""
+    size = max(1, size or settings.db_batch_size)
+    return [items[start:start + size] for start in range(0, len(items), size)]
+
+
+def write_errors(error: BulkWriteError, offset: int = 0) -> List[Dict[str, Any]]:
+    """
+    Per-document failures of an unordered bulk write.
+
+    Args:
+        error: Raised BulkWriteError
+        offset: Position of the batch within the caller's full list
+
+    Returns:
+        List of {"index", "code", "message"} with indexes into the full list
+    """
+    return [
+        {"index": offset + item["index"], "code": item.get("code"), "message": item.get("errmsg", "")}
+        for item in error.details.get("writeErrors", [])
+    ]
+
+
+def parse_object_ids(ids: List[str]) -> Tuple[List[ObjectId], List[Dict[str, Any]]]:
+    """Convert ID strings to ObjectIds, reporting the malformed ones as errors."""
+    object_ids, errors = [], []
+    for index, value in enumerate(ids):
+        try:
+            object_ids.append(ObjectId(value))
+        except (InvalidId, TypeError):
+            errors.append({"index": index, "code": None, "message": f"Invalid ID: {value}"})
+    return object_ids, errors
+
+
+async def find_page(
+    collection_name: str,
+    projection: Dict[str, Any],
+    limit: int,
+    cursor: Optional[str] = None
+) -> Tuple[List[Dict[str, Any]], Optional[str]]:
+    """
+    Keyset pagination over _id, newest first. Each page is an index range
+    scan on _id, so deep pages cost the same as the first.
+
+    Args:
+        collection_name: Collection to page through
+        projection: $project stage applied to each document
+        limit: Maximum documents per page
+        cursor: Cursor returned with the previous page
+
+    Returns:
+        Tuple of documents and the cursor for the next page (None on the last page)
+    """
+    pipeline = []
+    if cursor:
+        pipeline.append({"$match": {"_id": {"$lt": decode_cursor(cursor)}}})
+    pipeline.extend([
+        {"$sort": {"_id": -1}},
+        {"$limit": limit + 1},  # One extra to learn whether another page exists
+        {"$project": {**projection, "schema_version": 1}}
+    ])
+    documents = await MongoDB.get_collection(collection_name).aggregate(pipeline).to_list(None)
+    
+    next_cursor = None
+    if len(documents) > limit:
+        documents = documents[:limit]
+        next_cursor = encode_cursor(documents[-1]["_id"])
+    documents = await upgrade_projected(collection_name, projection, documents)
+    for document in documents:
+        document["_id"] = str(document["_id"])
+    return documents, next_cursor
+
+
+async def load_migration_inputs(collection_name: str, documents: List[Dict[str, Any]]):
+    """
+    Add to outdated documents the fields their migrations read that the
+    reader projected away (see MIGRATION_INPUTS), in one query.
+    """
+    fields = set()
+    outdated = {}
+    for document in documents:
+        needed = migration_inputs(collection_name, schema_version(document))
+        if needed:
+            fields |= needed
+            outdated[document["_id"]] = document
+    if not outdated:
+        return
+    cursor = MongoDB.get_collection(collection_name).find(
+        {"_id": {"$in": list(outdated)}}, {field: 1 for field in fields}
+    )
+    async for stored in cursor:
+        for field in fields:
+            if field in stored:
+                outdated[stored["_id"]][field] = stored[field]
+
+
+async def write_migrations(collection_name: str, documents: List[Dict[str, Any]]) -> Dict[str, Any]:
+    """
+    Upgrade documents in place and persist them: side writes first, one
+    unordered bulk_write per collection, then the updates of the documents
+    whose side writes all succeeded.
+
+    Returns:
+        {"migrated": n, "errors": [...]} with indexes into documents
+    """
+    summary = {"migrated": 0, "errors": []}
+    updates = {}  # Position in documents -> update
+    side_writes = {}  # Collection -> [(position, write)]
+    for index, document in enumerate(documents):
+        migration = migration_update(collection_name, document)
+        if migration is not None:
+            updates[index] = migration[0]
+            for side_collection, write in migration[1]:
+                side_writes.setdefault(side_collection, []).append((index, write))
+    
+    for side_collection, writes in side_writes.items():
+        try:
+            await MongoDB.get_collection(side_collection).bulk_write([write for _, write in writes], ordered=False)
+        except BulkWriteError as e:
+            for error in write_errors(e):
+                error["index"] = writes[error["index"]][0]
+                if updates.pop(error["index"], None) is not None:
+                    summary["errors"].append(error)
+    
+    if updates:
+        positions = list(updates)
+        try:
+            result = await MongoDB.get_collection(collection_name).bulk_write(list(updates.values()), ordered=False)
+            summary["migrated"] += result.bulk_api_result.get("nModified", 0)
+        except BulkWriteError as e:
+            summary["migrated"] += e.details.get("nModified", 0)
+            for error in write_errors(e):
+                error["index"] = positions[error["index"]]
+                summary["errors"].append(error)
+    return summary
+
+
+async def upgrade_documents(collection_name: str, documents: List[Dict[str, Any]]):
+    """
+    Bring documents read at an old schema version up to date in place and
+    write them back. Fields a migration reads but the reader projected away
+    are fetched first; those migrations move the fields out, so they do not
+    end up in the reader's copy.
+    """
+    outdated = [
+        document for document in documents
+        if schema_version(document) < SCHEMA_VERSIONS[collection_name]
+    ]
+    if not outdated:
+        return
+    await load_migration_inputs(collection_name, outdated)
+    result = await write_migrations(collection_name, outdated)
+    if result["errors"]:
+        # Readers already have the upgraded copy; the next read retries the write
+        print(f"⚠️  Lazy migration of {collection_name} failed for {len(result['errors'])} document(s)")
+
+
+async def upgrade_projected(
+    collection_name: str,
+    projection: Dict[str, Any],
+    documents: List[Dict[str, Any]]
+) -> List[Dict[str, Any]]:
+    """
+    upgrade_documents for documents read through a $project that keeps only
+    some fields (plus schema_version). Migrating those partial copies would
+    stamp the fields they lack as current, so outdated documents are
+    upgraded in full and read back through the same projection.
+
+    Returns:
+        The documents in the same order, current ones as read, without schema_version
+    """
+    outdated = [
+        document["_id"] for document in documents
+        if schema_version(document) < SCHEMA_VERSIONS[collection_name]
+    ]
+    if outdated:
+        collection = MongoDB.get_collection(collection_name)
+        full = await collection.find({"_id": {"$in": outdated}}).to_list(None)
+        await upgrade_documents(collection_name, full)
+        cursor = collection.aggregate([{"$match": {"_id": {"$in": outdated}}}, {"$project": projection}])
+        upgraded = {document["_id"]: document async for document in cursor}
+        documents = [upgraded.get(document["_id"], document) for document in documents]
+    for document in documents:
+        document.pop("schema_version", None)
+    return documents
+
 
 class MongoDB:
     """MongoDB database handler with async operations."""
@@ -16,13 +239,22 @@ class MongoDB:
     
     @classmethod
     async def connect_db(cls):
-        """Establish connection to MongoDB Atlas."""
+        """Establish connection to MongoDB Atlas, or open the embedded memory store."""
         try:
-            cls.client = AsyncIOMotorClient(settings.mongodb_url)
+            if settings.storage_backend == "memory":
+                cls.client = MemoryClient(settings.memory_storage_path)
+            elif settings.storage_backend == "mongodb":
+                cls.client = AsyncIOMotorClient(
+                    settings.mongodb_url,
+                    event_listeners=[pool_monitor],
+                    **settings.mongodb_client_options
+                )
+            else:
+                raise ValueError(f"Unknown storage backend: {settings.storage_backend}")
             cls.database = cls.client[settings.mongodb_db_name]
             # Test connection
             await cls.client.admin.command('ping')
-            print(f"✅ Connected to MongoDB: {settings.mongodb_db_name}")
+            print(f"✅ Connected to {settings.storage_backend}: {settings.mongodb_db_name}")
         except Exception as e:
             print(f"❌ MongoDB connection error: {e}")
             raise e
@@ -31,8 +263,40 @@ class MongoDB:
     async def close_db(cls):
         """Close MongoDB connection."""
         if cls.client:
+            # The memory backend writes its snapshot here
             cls.client.close()
-            print("🔌 MongoDB connection closed")
+            print(f"🔌 {settings.storage_backend} connection closed")
+    
+    @classmethod
+    async def health(cls) -> Dict[str, Any]:
+        """
+        Ping latency, pool occupancy and per-server round-trip times.
+
+        Raises:
+            Exception: If the ping fails
+        """
+        start = time.perf_counter()
+        await cls.client.admin.command("ping")
+        ping_ms = (time.perf_counter() - start) * 1000
+        
+        servers = []
+        for server in cls.client.topology_description.server_descriptions().values():
+            host, port = server.address
+            rtt = server.round_trip_time
+            servers.append({
+                "address": f"{host}:{port}",
+                "type": server.server_type_name,
+                "rtt_ms": round(rtt * 1000, 2) if rtt is not None else None
+            })
+        
+        return {
+            "ping_ms": round(ping_ms, 2),
+            "pool": {
+                **pool_monitor.snapshot(settings.mongodb_max_pool_size),
+                "max_size": settings.mongodb_max_pool_size
+            },
+            "servers": servers
+        }
     
     @classmethod
     def get_collection(cls, collection_name: str):
@@ -41,112 +305,650 @@ class MongoDB:
 
 
 class ResumeDB:
-    """Resume collection operations."""
+    """
+    Resume collection operations.
+    The hot "resumes" collection holds metadata and parsed_data only; the
+    extracted text lives zlib-compressed in "resume_texts" under the same _id,
+    next to its distinct words and copies of the name, skills and filename
+    that back the full-text index.
+    """
+    
+    # Bulky fields no reader of a whole resume document needs
+    DETAIL_EXCLUDE: ClassVar[Dict[str, Any]] = {"text_content": 0}
+    # Fields the resume list needs; parsed_data details, sections and skill bits stay behind
+    LIST_PROJECTION: ClassVar[Dict[str, Any]] = {
+        "filename": 1, "upload_date": 1, "status": 1, "error": 1,
+        "file_type": 1, "file_size": 1,
+        "parsed_data.name": 1, "parsed_data.email": 1,
+        "parsed_data.phone": 1, "parsed_data.skills": 1
+    }
+    
+    @staticmethod
+    def _split_text(resume_data: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        Assign an _id and move text_content into a text document holding the
+        compressed text and the text index fields.
+        """
+        resume_data.setdefault("_id", ObjectId())
+        text_content = resume_data.pop("text_content", "") or ""
+        return {
+            "_id": resume_data["_id"],
+            "text_z": compress_text(text_content),
+            "terms": search_terms(text_content),
+            **search_fields({"parsed_data": resume_data.get("parsed_data"), "filename": resume_data.get("filename")})
+        }
     
     @staticmethod
     async def create_resume(resume_data: Dict[str, Any]) -> str:
         """Insert a new resume document."""
         collection = MongoDB.get_collection("resumes")
         resume_data["upload_date"] = datetime.now(timezone.utc).isoformat()
+        text_doc = ResumeDB._split_text(resume_data)
+        stamp_new("resumes", resume_data)
+        await MongoDB.get_collection("resume_texts").insert_one(text_doc)
         result = await collection.insert_one(resume_data)
+        await VersionDB.bump(VersionDB.RESUMES)
         return str(result.inserted_id)
     
     @staticmethod
-    async def get_resume(resume_id: str) -> Optional[Dict[str, Any]]:
-        """Retrieve a resume by ID."""
+    async def create_resumes(resumes_data: List[Dict[str, Any]]) -> Dict[str, Any]:
+        """
+        Insert resume documents with unordered insert_many, db_batch_size per round-trip.
+        A failing document does not stop the rest of its batch.
+
+        Returns:
+            {"inserted_ids": [...], "errors": [{"index", "code", "message"}]}
+        """
         collection = MongoDB.get_collection("resumes")
-        resume = await collection.find_one({"_id": ObjectId(resume_id)})
-        if resume:
-            resume["_id"] = str(resume["_id"])
-        return resume
+        texts = MongoDB.get_collection("resume_texts")
+        upload_date = datetime.now(timezone.utc).isoformat()
+        inserted_ids, errors = [], []
+        
+        batch_size = max(1, settings.db_batch_size)
+        for offset in range(0, len(resumes_data), batch_size):
+            batch = resumes_data[offset:offset + batch_size]
+            text_docs = []
+            for resume_data in batch:
+                resume_data["upload_date"] = upload_date
+                text_docs.append(ResumeDB._split_text(resume_data))
+                stamp_new("resumes", resume_data)
+            
+            failed = {}
+            try:
+                await texts.insert_many(text_docs, ordered=False)
+            except BulkWriteError as e:
+                failed.update((error["index"], error) for error in write_errors(e))
+            
+            # A resume without its text document would be unreadable; skip it
+            positions = [i for i in range(len(batch)) if i not in failed]
+            try:
+                if positions:
+                    await collection.insert_many([batch[i] for i in positions], ordered=False)
+            except BulkWriteError as e:
+                orphaned = []
+                for error in write_errors(e):
+                    error["index"] = positions[error["index"]]
+                    failed[error["index"]] = error
+                    orphaned.append(batch[error["index"]]["_id"])
+                # Drop text documents whose resume insert failed
+                await texts.delete_many({"_id": {"$in": orphaned}})
+            
+            for i, resume_data in enumerate(batch):
+                if i in failed:
+                    errors.append({**failed[i], "index": offset + i})
+                else:
+                    inserted_ids.append(str(resume_data["_id"]))
+        if inserted_ids:
+            await VersionDB.bump(VersionDB.RESUMES)
+        return {"inserted_ids": inserted_ids, "errors": errors}
     
     @staticmethod
-    async def get_all_resumes() -> List[Dict[str, Any]]:
-        """Retrieve all resumes."""
+    async def get_resumes(resume_ids: List[str]) -> List[Dict[str, Any]]:
+        """Retrieve several resumes (without text_content) in one query."""
+        object_ids, _ = parse_object_ids(resume_ids)
         collection = MongoDB.get_collection("resumes")
+        cached = {}
+        for object_id in object_ids:
+            resume = entity_cache.get("resume", str(object_id))
+            if resume is not None:
+                cached[resume["_id"]] = resume
+        missing = [object_id for object_id in object_ids if str(object_id) not in cached]
+        
+        resumes = list(cached.values())
+        if missing:
+            with entity_cache.loading("resume", [str(object_id) for object_id in missing]) as invalidated:
+                loaded = await collection.find({"_id": {"$in": missing}}, ResumeDB.DETAIL_EXCLUDE).to_list(None)
+                await upgrade_documents("resumes", loaded)
+            for resume in loaded:
+                resume["_id"] = str(resume["_id"])
+                if not invalidated(resume["_id"]):
+                    entity_cache.put("resume", resume["_id"], resume)
+                resumes.append(resume)
+        return resumes
+    
+    @staticmethod
+    async def get_resume(resume_id: str) -> Optional[Dict[str, Any]]:
+        """Retrieve a resume by ID (without text_content), through the entity cache."""
+        async def load():
+            collection = MongoDB.get_collection("resumes")
+            resume = await collection.find_one({"_id": ObjectId(resume_id)}, ResumeDB.DETAIL_EXCLUDE)
+            if resume:
+                await upgrade_documents("resumes", [resume])
+                resume["_id"] = str(resume["_id"])
+            return resume
+        return await entity_cache.read_through("resume", resume_id, load)
+    
+    @staticmethod
+    async def get_resume_text(resume_id: str) -> Optional[str]:
+        """Retrieve and decompress the extracted text of a resume."""
+        text_doc = await MongoDB.get_collection("resume_texts").find_one({"_id": ObjectId(resume_id)})
+        if text_doc and "text_z" in text_doc:
+            return decompress_text(text_doc["text_z"])
+        # Legacy documents embed the text in the resume itself
+        resume = await MongoDB.get_collection("resumes").find_one(
+            {"_id": ObjectId(resume_id)}, {"text_content": 1}
+        )
+        return resume.get("text_content") if resume else None
+    
+    @staticmethod
+    async def get_resume_texts(resume_ids: List[str]) -> Dict[str, str]:
+        """Retrieve and decompress the texts of several resumes in one query."""
+        object_ids, _ = parse_object_ids(resume_ids)
+        texts = {}
+        cursor = MongoDB.get_collection("resume_texts").find(
+            {"_id": {"$in": object_ids}, "text_z": {"$exists": True}}, {"text_z": 1}
+        )
+        async for text_doc in cursor:
+            texts[str(text_doc["_id"])] = decompress_text(text_doc["text_z"])
+        legacy = [object_id for object_id in object_ids if str(object_id) not in texts]
+        if legacy:
+            cursor = MongoDB.get_collection("resumes").find(
+                {"_id": {"$in": legacy}, "text_content": {"$exists": True}}, {"text_content": 1}
+            )
+            async for resume in cursor:
+                texts[str(resume["_id"])] = resume["text_content"] or ""
+        return texts
+    
+    @staticmethod
+    async def search_resumes(query: str, limit: int, offset: int = 0) -> Tuple[List[Dict[str, Any]], int]:
+        """
+        Full-text search over the text index on resume_texts, best match
+        first. One page of hits is ranked there, then joined back to the
+        resume summaries in one query.
+
+        Args:
+            query: MongoDB $text search string ("quoted phrases" and -exclusions allowed)
+            limit: Maximum results
+            offset: Results to skip
+
+        Returns:
+            Tuple of resume summaries with a "score" field and the total match count
+        """
+        texts = MongoDB.get_collection("resume_texts")
+        text_filter = {"$text": {"$search": query}}
+        score = {"$meta": "textScore"}
+        cursor = texts.find(text_filter, {"score": score}).sort([("score", score)]).skip(offset).limit(limit)
+        hits = [(hit["_id"], hit["score"]) async for hit in cursor]
+        
+        summaries = {}
+        if hits:
+            cursor = MongoDB.get_collection("resumes").find(
+                {"_id": {"$in": [resume_id for resume_id, _ in hits]}},
+                {**ResumeDB.LIST_PROJECTION, "schema_version": 1}
+            )
+            found = await upgrade_projected("resumes", ResumeDB.LIST_PROJECTION, await cursor.to_list(None))
+            summaries = {resume["_id"]: resume for resume in found}
         resumes = []
-        cursor = collection.find({})
-        async for resume in cursor:
+        for resume_id, hit_score in hits:
+            resume = summaries.get(resume_id)
+            if resume is not None:  # Text documents outlive a failed resume insert only briefly
+                resume["_id"] = str(resume_id)
+                resume["score"] = hit_score
+                resumes.append(resume)
+        return resumes, await texts.count_documents(text_filter)
+    
+    @staticmethod
+    async def get_all_resumes() -> List[Dict[str, Any]]:
+        """Retrieve all resumes (without text_content)."""
+        collection = MongoDB.get_collection("resumes")
+        resumes = await collection.find({}, ResumeDB.DETAIL_EXCLUDE).to_list(None)
+        await upgrade_documents("resumes", resumes)
+        for resume in resumes:
             resume["_id"] = str(resume["_id"])
-            resumes.append(resume)
         return resumes
     
+    @staticmethod
+    async def get_resumes_page(
+        limit: int, cursor: Optional[str] = None
+    ) -> Tuple[List[Dict[str, Any]], Optional[str]]:
+        """Retrieve one page of resume summaries, newest first."""
+        return await find_page("resumes", ResumeDB.LIST_PROJECTION, limit, cursor)
+    
+    @staticmethod
+    async def count_resumes() -> int:
+        """Approximate resume count from collection metadata."""
+        return await MongoDB.get_collection("resumes").estimated_document_count()
+    
+    @staticmethod
+    async def get_skill_bitsets() -> List[Tuple[str, bytes]]:
+        """Retrieve (resume_id, skill_bits) for every resume."""
+        collection = MongoDB.get_collection("resumes")
+        cursor = collection.find({}, {"skill_bits": 1})
+        return [(str(resume["_id"]), resume.get("skill_bits") or b"") async for resume in cursor]
+    
+    @staticmethod
+    async def get_resume_ids_by_status(status: str) -> List[str]:
+        """Retrieve the IDs of all resumes in a given processing status."""
+        collection = MongoDB.get_collection("resumes")
+        cursor = collection.find({"status": status}, {"_id": 1})
+        return [str(resume["_id"]) async for resume in cursor]
+    
+    @staticmethod
+    async def get_extraction_source_counts() -> Dict[str, int]:
+        """Count resumes by extraction_source; documents without one count as "llm"."""
+        collection = MongoDB.get_collection("resumes")
+        cursor = collection.aggregate([
+            {"$group": {"_id": {"$ifNull": ["$extraction_source", "llm"]}, "count": {"$sum": 1}}}
+        ])
+        return {group["_id"]: group["count"] async for group in cursor}
+    
+    @staticmethod
+    async def claim_for_enrichment(resume_id: str, status: str, lease_seconds: Optional[float] = None) -> bool:
+        """
+        Take a resume still in status for enrichment unless another worker
+        process holds an unexpired lease on it. Every process queues pending
+        resumes at startup and on each periodic sweep; the lease keeps each one
+        from being sent to the LLM more than once.
+        """
+        lease_seconds = settings.enrichment_lease_seconds if lease_seconds is None else lease_seconds
+        now = datetime.now(timezone.utc)
+        result = await MongoDB.get_collection("resumes").update_one(
+            {
+                "_id": ObjectId(resume_id),
+                "status": status,
+                "$or": [
+                    {"enrichment_lease": {"$exists": False}},
+                    {"enrichment_lease": {"$lt": now.isoformat()}}
+                ]
+            },
+            {"$set": {"enrichment_lease": (now + timedelta(seconds=lease_seconds)).isoformat()}}
+        )
+        return result.modified_count > 0
+    
+    @staticmethod
+    async def update_resume(resume_id: str, fields: Dict[str, Any]) -> bool:
+        """Set fields on an existing resume."""
+        collection = MongoDB.get_collection("resumes")
+        result = await collection.update_one(
+            {"_id": ObjectId(resume_id)},
+            {"$set": normalize_fields("resumes", fields)}
+        )
+        entity_cache.invalidate("resume", resume_id)
+        indexed = search_fields(fields)
+        if indexed and result.matched_count:
+            # Keep the text index copies of name, skills and filename current
+            await MongoDB.get_collection("resume_texts").update_one({"_id": ObjectId(resume_id)}, {"$set": indexed})
+        if result.modified_count:
+            await VersionDB.bump(VersionDB.RESUMES)
+        return result.matched_count > 0
+    
+    @staticmethod
+    async def release_blobs(content_hashes: Iterable[str]):
+        """
+        Remove the original files no resume references any more. An upload of
+        the same file may insert a reference between the check and the
+        removal, so each file is moved aside first and put back if a
+        reference appeared meanwhile; an upload inserted after that re-check
+        writes its blob again itself.
+        """
+        hashes = {content_hash for content_hash in content_hashes if content_hash}
+        if not hashes:
+            return
+        collection = MongoDB.get_collection("resumes")
+        referenced = set(await collection.distinct("content_hash", {"content_hash": {"$in": list(hashes)}}))
+        for content_hash in hashes - referenced:
+            detached = await blob_store.detach(content_hash)
+            if detached is None:
+                continue  # Already removed by a concurrent delete
+            if await collection.find_one({"content_hash": content_hash}, {"_id": 1}):
+                await blob_store.restore(content_hash, detached)
+            else:
+                await blob_store.discard(detached)
+    
     @staticmethod
     async def delete_resume(resume_id: str) -> bool:
-        """Delete a resume by ID."""
+        """Delete a resume, its text and its original file if no longer referenced."""
         collection = MongoDB.get_collection("resumes")
-        result = await collection.delete_one({"_id": ObjectId(resume_id)})
-        return result.deleted_count > 0
+        resume = await collection.find_one_and_delete(
+            {"_id": ObjectId(resume_id)}, {"content_hash": 1}
+        )
+        entity_cache.invalidate("resume", resume_id)
+        if not resume:
+            return False
+        await VersionDB.bump(VersionDB.RESUMES)
+        await MongoDB.get_collection("resume_texts").delete_one({"_id": ObjectId(resume_id)})
+        await ResumeDB.release_blobs([resume.get("content_hash")])
+        return True
+    
+    @staticmethod
+    async def delete_resumes(resume_ids: List[str]) -> Dict[str, Any]:
+        """
+        Delete several resumes, their texts and unreferenced originals with delete_many.
+
+        Returns:
+            {"deleted": n, "errors": [...]} where malformed IDs are reported as errors
+        """
+        object_ids, errors = parse_object_ids(resume_ids)
+        entity_cache.invalidate("resume", *(str(object_id) for object_id in object_ids))
+        collection = MongoDB.get_collection("resumes")
+        deleted = 0
+        for batch in batched(object_ids):
+            hashes = {
+                resume["content_hash"]
+                async for resume in collection.find(
+                    {"_id": {"$in": batch}, "content_hash": {"$ne": None}}, {"content_hash": 1}
+                )
+            }
+            result = await collection.delete_many({"_id": {"$in": batch}})
+            deleted += result.deleted_count
+            await MongoDB.get_collection("resume_texts").delete_many({"_id": {"$in": batch}})
+            await ResumeDB.release_blobs(hashes)
+        if deleted:
+            await VersionDB.bump(VersionDB.RESUMES)
+        return {"deleted": deleted, "errors": errors}
 
 
 class JobDB:
     """Job description collection operations."""
     
+    DESCRIPTION_PREVIEW_CHARS: ClassVar[int] = 150
+    # Job list fields; the full description is only sent by the detail endpoint
+    LIST_PROJECTION: ClassVar[Dict[str, Any]] = {
+        "title": 1, "created_date": 1,
+        "description_preview": {"$substrCP": ["$description", 0, DESCRIPTION_PREVIEW_CHARS]}
+    }
+    
     @staticmethod
     async def create_job(job_data: Dict[str, Any]) -> str:
         """Insert a new job description."""
         collection = MongoDB.get_collection("jobs")
         job_data["created_date"] = datetime.now(timezone.utc).isoformat()
-        result = await collection.insert_one(job_data)
+        result = await collection.insert_one(stamp_new("jobs", job_data))
+        await VersionDB.bump(VersionDB.JOBS)
         return str(result.inserted_id)
     
     @staticmethod
     async def get_job(job_id: str) -> Optional[Dict[str, Any]]:
-        """Retrieve a job by ID."""
-        collection = MongoDB.get_collection("jobs")
-        job = await collection.find_one({"_id": ObjectId(job_id)})
-        if job:
-            job["_id"] = str(job["_id"])
-        return job
+        """Retrieve a job by ID, through the entity cache."""
+        async def load():
+            collection = MongoDB.get_collection("jobs")
+            job = await collection.find_one({"_id": ObjectId(job_id)})
+            if job:
+                await upgrade_documents("jobs", [job])
+                job["_id"] = str(job["_id"])
+            return job
+        return await entity_cache.read_through("job", job_id, load)
     
     @staticmethod
     async def get_all_jobs() -> List[Dict[str, Any]]:
         """Retrieve all job descriptions."""
         collection = MongoDB.get_collection("jobs")
-        jobs = []
-        cursor = collection.find({})
-        async for job in cursor:
+        jobs = await collection.find({}).to_list(None)
+        await upgrade_documents("jobs", jobs)
+        for job in jobs:
+            job["_id"] = str(job["_id"])
+        return jobs
+    
+    @staticmethod
+    async def get_jobs_page(
+        limit: int, cursor: Optional[str] = None
+    ) -> Tuple[List[Dict[str, Any]], Optional[str]]:
+        """Retrieve one page of job summaries, newest first."""
+        return await find_page("jobs", JobDB.LIST_PROJECTION, limit, cursor)
+    
+    @staticmethod
+    async def get_job_options() -> List[Dict[str, Any]]:
+        """Retrieve the _id and title of every job, newest first."""
+        collection = MongoDB.get_collection("jobs")
+        jobs = await collection.find({}, {"title": 1}).sort("_id", -1).to_list(None)
+        for job in jobs:
             job["_id"] = str(job["_id"])
-            jobs.append(job)
         return jobs
     
+    @staticmethod
+    async def count_jobs() -> int:
+        """Approximate job count from collection metadata."""
+        return await MongoDB.get_collection("jobs").estimated_document_count()
+    
     @staticmethod
     async def delete_job(job_id: str) -> bool:
         """Delete a job by ID."""
         collection = MongoDB.get_collection("jobs")
         result = await collection.delete_one({"_id": ObjectId(job_id)})
+        entity_cache.invalidate("job", job_id)
+        if result.deleted_count:
+            await VersionDB.bump(VersionDB.JOBS, VersionDB.job_key(job_id))
         return result.deleted_count > 0
+    
+    @staticmethod
+    async def delete_jobs(job_ids: List[str]) -> Dict[str, Any]:
+        """
+        Delete several jobs with delete_many.
+
+        Returns:
+            {"deleted": n, "errors": [...]} where malformed IDs are reported as errors
+        """
+        object_ids, errors = parse_object_ids(job_ids)
+        entity_cache.invalidate("job", *(str(object_id) for object_id in object_ids))
+        collection = MongoDB.get_collection("jobs")
+        deleted = 0
+        for batch in batched(object_ids):
+            result = await collection.delete_many({"_id": {"$in": batch}})
+            deleted += result.deleted_count
+        if deleted:
+            await VersionDB.bump(VersionDB.JOBS, *(VersionDB.job_key(str(object_id)) for object_id in object_ids))
+        return {"deleted": deleted, "errors": errors}
 
 
 class MatchDB:
     """Match results collection operations."""
     
     @staticmethod
-    async def create_match(match_data: Dict[str, Any]) -> str:
-        """Insert a new match result."""
+    async def upsert_matches(matches_data: List[Dict[str, Any]]) -> Dict[str, Any]:
+        """
+        Store match results with unordered bulk_write upserts keyed on
+        (job_id, resume_id), db_batch_size per round-trip. Re-matching a
+        resume replaces its previous result for the job. Sets "_id" on
+        every stored match.
+
+        Returns:
+            {"upserted": n, "modified": n, "errors": [{"index", "code", "message"}]}
+        """
         collection = MongoDB.get_collection("matches")
-        match_data["timestamp"] = datetime.now(timezone.utc).isoformat()
-        result = await collection.insert_one(match_data)
-        return str(result.inserted_id)
+        timestamp = datetime.now(timezone.utc).isoformat()
+        summary = {"upserted": 0, "modified": 0, "errors": []}
+        
+        batch_size = max(1, settings.db_batch_size)
+        for offset in range(0, len(matches_data), batch_size):
+            batch = matches_data[offset:offset + batch_size]
+            operations = []
+            for match_data in batch:
+                match_data.pop("_id", None)
+                match_data["timestamp"] = timestamp
+                stamp_new("matches", match_data)
+                operations.append(UpdateOne(
+                    {"job_id": match_data["job_id"], "resume_id": match_data["resume_id"]},
+                    {"$set": match_data},
+                    upsert=True
+                ))
+            try:
+                result = await collection.bulk_write(operations, ordered=False)
+                details = result.bulk_api_result
+            except BulkWriteError as e:
+                details = e.details
+                summary["errors"].extend(write_errors(e, offset))
+            summary["upserted"] += details.get("nUpserted", 0)
+            summary["modified"] += details.get("nModified", 0)
+            
+            # Updated matches keep their existing _id; look all of them up in one query
+            for job_id in {match_data["job_id"] for match_data in batch}:
+                resume_ids = [m["resume_id"] for m in batch if m["job_id"] == job_id]
+                cursor = collection.find(
+                    {"job_id": job_id, "resume_id": {"$in": resume_ids}}, {"resume_id": 1}
+                )
+                ids = {match["resume_id"]: str(match["_id"]) async for match in cursor}
+                for match_data in batch:
+                    if match_data["job_id"] == job_id and match_data["resume_id"] in ids:
+                        match_data["_id"] = ids[match_data["resume_id"]]
+        if summary["upserted"] or summary["modified"]:
+            await VersionDB.bump(*(VersionDB.job_key(match_data["job_id"]) for match_data in matches_data))
+        return summary
     
     @staticmethod
     async def get_matches_by_job(job_id: str) -> List[Dict[str, Any]]:
-        """Retrieve all matches for a specific job."""
+        """
+        Retrieve all matches for a specific job, highest score first. Matches
+        stored by older releases are upgraded to the served shape.
+        """
         collection = MongoDB.get_collection("matches")
-        matches = []
-        cursor = collection.find({"job_id": job_id}).sort("score", -1)
-        async for match in cursor:
+        matches = await collection.find({"job_id": job_id}).sort("score", -1).to_list(None)
+        await upgrade_documents("matches", matches)
+        for match in matches:
             match["_id"] = str(match["_id"])
-            matches.append(match)
+        # Upgraded scores may have been out of range or not numbers
+        matches.sort(key=lambda match: match["score"], reverse=True)
         return matches
+
+
+class VersionDB:
+    """
+    Change counters behind the ETag/Last-Modified headers of the list and
+    match endpoints. One document per key in "versions": "resumes", "jobs"
+    and "job:<id>" for a job's matches. Writers bump after writing and
+    readers read before querying, so a response is never tagged with a
+    version newer than its data. The random epoch set when a counter is
+    created keeps tags from repeating if the counters are ever reset.
+    """
+    
+    RESUMES: ClassVar[str] = "resumes"
+    JOBS: ClassVar[str] = "jobs"
     
     @staticmethod
-    async def get_all_matches() -> List[Dict[str, Any]]:
-        """Retrieve all matches."""
-        collection = MongoDB.get_collection("matches")
-        matches = []
-        cursor = collection.find({})
-        async for match in cursor:
-            match["_id"] = str(match["_id"])
-            matches.append(match)
-        return matches
+    def job_key(job_id: str) -> str:
+        return f"job:{job_id}"
+    
+    @staticmethod
+    async def bump(*keys: str):
+        """Increment the counters of keys in one unordered bulk_write."""
+        if not keys:
+            return
+        modified = datetime.now(timezone.utc).isoformat()
+        await MongoDB.get_collection("versions").bulk_write([
+            UpdateOne(
+                {"_id": key},
+                {"$inc": {"version": 1}, "$set": {"modified": modified},
+                 "$setOnInsert": {"epoch": secrets.token_hex(4)}},
+                upsert=True
+            )
+            for key in dict.fromkeys(keys)
+        ], ordered=False)
+    
+    @staticmethod
+    async def get(key: str) -> Dict[str, Any]:
+        """
+        Current counter of key.
+
+        Returns:
+            {"version", "epoch", "modified"}; version 0 with no epoch or
+            modified time if nothing has been written since counters existed
+        """
+        document = await MongoDB.get_collection("versions").find_one({"_id": key})
+        if not document:
+            return {"version": 0, "epoch": None, "modified": None}
+        return {"version": document["version"], "epoch": document.get("epoch"), "modified": document.get("modified")}
+
+
+class AnalyticsDB:
+    """Aggregations computed server-side so only summaries leave the database."""
+    
+    @staticmethod
+    async def score_histogram(job_id: str, bucket_width: float = 1.0) -> List[Dict[str, Any]]:
+        """
+        Count a job's matches per score bucket over the 0-10 scale.
+
+        Returns:
+            List of {"min", "max", "count"} for every bucket, empty buckets included
+        """
+        bucket_count = math.ceil(10 / bucket_width - 1e-9)
+        boundaries = [round(i * bucket_width, 6) for i in range(bucket_count)]
+        # Upper bound is exclusive; nudge it so a perfect 10 lands in the last bucket
+        boundaries.append(10.000001)
+        
+        cursor = MongoDB.get_collection("matches").aggregate([
+            {"$match": {"job_id": job_id}},
+            {"$bucket": {"groupBy": "$score", "boundaries": boundaries, "default": "other"}}
+        ])
+        counts = {bucket["_id"]: bucket["count"] async for bucket in cursor}
+        return [
+            {"min": low, "max": min(high, 10.0), "count": counts.get(low, 0)}
+            for low, high in zip(boundaries, boundaries[1:])
+        ]
+    
+    @staticmethod
+    async def recommendation_distribution(job_id: Optional[str] = None) -> List[Dict[str, Any]]:
+        """Count matches per recommendation, optionally for one job, most common first."""
+        pipeline = [{"$match": {"job_id": job_id}}] if job_id else []
+        pipeline.extend([
+            {"$group": {"_id": {"$ifNull": ["$recommendation", "Unknown"]}, "count": {"$sum": 1}}},
+            {"$sort": {"count": -1, "_id": 1}}
+        ])
+        cursor = MongoDB.get_collection("matches").aggregate(pipeline)
+        return [{"recommendation": group["_id"], "count": group["count"]} async for group in cursor]
+    
+    @staticmethod
+    async def top_missing_qualifications(job_id: Optional[str] = None, limit: int = 20) -> List[Dict[str, Any]]:
+        """Most frequent missing_qualifications across matches, optionally for one job."""
+        pipeline = [{"$match": {"job_id": job_id}}] if job_id else []
+        pipeline.extend([
+            {"$unwind": "$missing_qualifications"},
+            {"$group": {"_id": "$missing_qualifications", "count": {"$sum": 1}}},
+            {"$sort": {"count": -1, "_id": 1}},
+            {"$limit": limit}
+        ])
+        cursor = MongoDB.get_collection("matches").aggregate(pipeline)
+        return [{"qualification": group["_id"], "count": group["count"]} async for group in cursor]
+    
+    @staticmethod
+    async def skill_frequency(limit: int = 50) -> List[Dict[str, Any]]:
+        """Number of resumes having each canonical skill, most common first."""
+        cursor = MongoDB.get_collection("resumes").aggregate([
+            {"$unwind": "$skill_ids"},
+            {"$group": {"_id": "$skill_ids", "count": {"$sum": 1}}},
+            {"$sort": {"count": -1, "_id": 1}},
+            {"$limit": limit}
+        ])
+        return [{"skill_id": group["_id"], "count": group["count"]} async for group in cursor]
+    
+    @staticmethod
+    async def candidate_counts() -> List[Dict[str, Any]]:
+        """Matched candidates per job with average and best score."""
+        cursor = MongoDB.get_collection("matches").aggregate([
+            {"$group": {
+                "_id": "$job_id",
+                "job_title": {"$first": "$job_title"},
+                "candidates": {"$sum": 1},
+                "average_score": {"$avg": "$score"},
+                "top_score": {"$max": "$score"}
+            }},
+            {"$sort": {"candidates": -1, "_id": 1}}
+        ])
+        return [
+            {
+                "job_id": group["_id"],
+                "job_title": group.get("job_title"),
+                "candidates": group["candidates"],
+                "average_score": round(group["average_score"] or 0, 2),
+                "top_score": group["top_score"] or 0
+            }
+            async for group in cursor
+        ]
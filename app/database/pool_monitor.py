@@ -0,0 +1,94 @@
+"""
+Connection pool monitoring.
+Counts driver pool events so /health can report pool occupancy without
+reaching into driver internals.
+"""
+import threading
+from typing import Dict
+
+from pymongo import monitoring
+
+
+class PoolMonitor(monitoring.ConnectionPoolListener):
+    """
+    Tracks open connections, checkouts in use and checkouts in progress per
+    server. Driver events arrive on background threads, so counters are
+    lock-protected.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._open = {}  # type: Dict[str, int]
+        self._in_use = {}  # type: Dict[str, int]
+        self._pending = {}  # type: Dict[str, int]
+
+    @staticmethod
+    def _key(event) -> str:
+        host, port = event.address
+        return f"{host}:{port}"
+
+    def _add(self, counter: Dict[str, int], event, delta: int):
+        key = self._key(event)
+        with self._lock:
+            counter[key] = max(0, counter.get(key, 0) + delta)
+
+    def snapshot(self, max_pool_size: int) -> Dict[str, int]:
+        """
+        Totals across all servers. Every operation starts a checkout, so only
+        checkouts beyond a server's free connections count as waiting
+        (none when max_pool_size is 0, i.e. unlimited).
+        """
+        max_pool_size = max_pool_size or float("inf")
+        with self._lock:
+            return {
+                "size": sum(self._open.values()),
+                "in_use": sum(self._in_use.values()),
+                "wait_queue": int(sum(
+                    max(0, self._in_use.get(key, 0) + pending - max_pool_size)
+                    for key, pending in self._pending.items()
+                ))
+            }
+
+    # Pool lifecycle
+    def pool_created(self, event):
+        pass
+
+    def pool_ready(self, event):
+        pass
+
+    def pool_cleared(self, event):
+        pass
+
+    def pool_closed(self, event):
+        key = self._key(event)
+        with self._lock:
+            for counter in (self._open, self._in_use, self._pending):
+                counter.pop(key, None)
+
+    # Connection lifecycle
+    def connection_created(self, event):
+        self._add(self._open, event, 1)
+
+    def connection_ready(self, event):
+        pass
+
+    def connection_closed(self, event):
+        self._add(self._open, event, -1)
+
+    # Checkouts: started -> (checked_out | failed) -> checked_in
+    def connection_check_out_started(self, event):
+        self._add(self._pending, event, 1)
+
+    def connection_check_out_failed(self, event):
+        self._add(self._pending, event, -1)
+
+    def connection_checked_out(self, event):
+        self._add(self._pending, event, -1)
+        self._add(self._in_use, event, 1)
+
+    def connection_checked_in(self, event):
+        self._add(self._in_use, event, -1)
+
+
+# Create a global instance
+pool_monitor = PoolMonitor()
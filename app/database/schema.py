@@ -0,0 +1,368 @@
+"""
+Document schema versions and migrations.
+Documents without schema_version are version 1. Each migration upgrades a
+document by one version and returns the fields it changed as $set paths
+(UNSET removes a field). A migration that moves data to another collection
+also has side writes, applied before the document's own update.
+New documents are stamped with the current version on write, old ones are
+upgraded lazily when read in full (see upgrade_documents in mongodb.py) or
+in bulk by the migration runner, so readers only ever see current shapes.
+"""
+import re
+import zlib
+from datetime import datetime
+from typing import Any, Callable, Dict, List, Optional, Set, Tuple
+
+from bson import ObjectId
+from pymongo import UpdateOne
+
+# Change value that removes the field ($unset)
+UNSET = object()
+
+# Words indexed for full-text search (2+ characters)
+SEARCH_TOKEN_PATTERN = re.compile(r"[a-z0-9][a-z0-9+#]+")
+
+
+def compress_text(text: str) -> bytes:
+    """Compress text for storage."""
+    return zlib.compress(text.encode("utf-8"), 6)
+
+
+def decompress_text(data: bytes) -> str:
+    """Decompress text stored by compress_text."""
+    return zlib.decompress(data).decode("utf-8")
+
+
+def search_terms(text: str) -> str:
+    """
+    Distinct lowercase words of text in first-seen order, for the resume
+    text index. Much smaller than the text itself while every word remains
+    searchable.
+    """
+    return " ".join(dict.fromkeys(SEARCH_TOKEN_PATTERN.findall(text.lower())))
+
+
+def search_fields(resume: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Resume fields copied onto its resume_texts document for the weighted
+    text index, from a resume or from the top-level fields of a $set.
+    """
+    fields = {}
+    if "parsed_data" in resume:
+        parsed_data = resume["parsed_data"] or {}
+        fields["name"] = parsed_data.get("name") or ""
+        fields["skills"] = parsed_data.get("skills") or []
+    if "filename" in resume:
+        fields["filename"] = resume["filename"] or ""
+    return fields
+
+
+def _object_id(document: Dict[str, Any]) -> Any:
+    document_id = document["_id"]
+    if isinstance(document_id, str) and ObjectId.is_valid(document_id):
+        return ObjectId(document_id)
+    return document_id
+
+
+def certification_strings(certifications: Any) -> List[str]:
+    """Old {name, issuer, year} certifications as "Name (Issuer, Year)" strings."""
+    result = []
+    for cert in certifications or []:
+        if isinstance(cert, dict):
+            name = cert.get("name", "Unknown")
+            issuer = cert.get("issuer", "")
+            year = cert.get("year", "")
+            if issuer and year:
+                result.append(f"{name} ({issuer}, {year})")
+            elif issuer:
+                result.append(f"{name} ({issuer})")
+            else:
+                result.append(name)
+        else:
+            result.append(str(cert))
+    return result
+
+
+def requirement_strings(requirements: Any) -> List[str]:
+    """The LLM's structured requirements dict as a flat list of requirement strings."""
+    if not requirements:
+        return []
+    if isinstance(requirements, list):
+        return [str(requirement) for requirement in requirements]
+    if not isinstance(requirements, dict):
+        return [str(requirements)]
+
+    result = []
+    required_skills = requirements.get("required_skills", [])
+    preferred_skills = requirements.get("preferred_skills", [])
+    experience = requirements.get("experience_required", "")
+    education = requirements.get("education_required", "")
+    responsibilities = requirements.get("responsibilities", [])
+
+    if required_skills:
+        result.append(f"Required Skills: {', '.join(required_skills)}")
+    if preferred_skills:
+        result.append(f"Preferred Skills: {', '.join(preferred_skills)}")
+    if experience:
+        result.append(f"Experience: {experience}")
+    if education:
+        result.append(f"Education: {education}")
+    if responsibilities:
+        result.extend([f"Responsibility: {r}" for r in responsibilities[:3]])  # Limit to 3
+    return result or ["See job description for requirements"]
+
+
+def _blank_nones(entries: Any) -> List[Any]:
+    """Experience/education entries with None values replaced by empty strings."""
+    return [
+        {key: "" if value is None else value for key, value in entry.items()} if isinstance(entry, dict) else entry
+        for entry in entries or []
+    ]
+
+
+def _whole_years(years: Any) -> int:
+    try:
+        return int(round(float(years)))
+    except (TypeError, ValueError):
+        return 0
+
+
+def _resume_v2(document: Dict[str, Any]) -> Dict[str, Any]:
+    """parsed_data.certifications becomes a list of strings."""
+    parsed_data = document.get("parsed_data")
+    if not isinstance(parsed_data, dict) or "certifications" not in parsed_data:
+        return {}
+    return {"parsed_data.certifications": certification_strings(parsed_data["certifications"])}
+
+
+# parsed_data lists that readers expect to be lists, never None
+PARSED_LIST_FIELDS = ("skills", "technical_skills", "soft_skills", "certifications")
+
+
+def _resume_v3(document: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    parsed_data takes the shape the API serves: no None values inside
+    experience/education entries or list fields, whole experience years.
+    """
+    parsed_data = document.get("parsed_data")
+    if not isinstance(parsed_data, dict):
+        return {}
+    changes = {}
+    for field in ("experience", "education"):
+        if field in parsed_data:
+            cleaned = _blank_nones(parsed_data[field])
+            if cleaned != parsed_data[field]:
+                changes[f"parsed_data.{field}"] = cleaned
+    for field in PARSED_LIST_FIELDS:
+        if field in parsed_data and parsed_data[field] is None:
+            changes[f"parsed_data.{field}"] = []
+    if "total_experience_years" in parsed_data:
+        years = parsed_data["total_experience_years"]
+        if type(years) is not int:
+            changes["parsed_data.total_experience_years"] = _whole_years(years)
+    return changes
+
+
+def _resume_v4(document: Dict[str, Any]) -> Dict[str, Any]:
+    """Embedded text_content moves to resume_texts (see _resume_v4_text)."""
+    return {"text_content": UNSET} if "text_content" in document else {}
+
+
+def _resume_v4_text(document: Dict[str, Any]) -> List[Tuple[str, UpdateOne]]:
+    """
+    The resume's text document: the compressed embedded text_content with its
+    search terms, and the fields the weighted text index covers.
+    """
+    fields = search_fields(document)
+    if "text_content" in document:
+        text = document["text_content"] or ""
+        fields["text_z"] = compress_text(text)
+        fields["terms"] = search_terms(text)
+    if not fields:
+        return []
+    return [("resume_texts", UpdateOne({"_id": _object_id(document)}, {"$set": fields}, upsert=True))]
+
+
+def _job_v2(document: Dict[str, Any]) -> Dict[str, Any]:
+    """requirements becomes a list of strings."""
+    if "requirements" not in document:
+        return {}
+    return {"requirements": requirement_strings(document["requirements"])}
+
+
+def string_list(value: Any) -> List[str]:
+    """A list of strings, from LLM output or an old match document."""
+    if not isinstance(value, list):
+        return []
+    return [item if isinstance(item, str) else str(item) for item in value]
+
+
+def clamped_score(value: Any) -> float:
+    """A match score as a float on the 0-10 scale."""
+    try:
+        return max(0.0, min(10.0, float(value)))
+    except (TypeError, ValueError):
+        return 0.0
+
+
+# Match string and list fields that MatchResult requires
+MATCH_TEXT_FIELDS = ("justification", "resume_filename", "job_title")
+MATCH_LIST_FIELDS = ("matching_points", "missing_qualifications", "strengths")
+
+
+def _match_timestamp(document: Dict[str, Any]) -> str:
+    timestamp = document.get("timestamp")
+    if isinstance(timestamp, str):
+        return timestamp
+    if isinstance(timestamp, datetime):
+        return timestamp.isoformat()
+    # Missing: when the match was inserted
+    document_id = document.get("_id")
+    if isinstance(document_id, ObjectId):
+        return document_id.generation_time.isoformat()
+    return ""
+
+
+def _match_v2(document: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Matches take the shape MatchResult serves: every required field present,
+    a float score on the 0-10 scale, a candidate name, strings and lists of
+    strings instead of None, an ISO timestamp.
+    """
+    changes = {}
+    score = document.get("score")
+    if type(score) is not float or clamped_score(score) != score:
+        changes["score"] = clamped_score(score)
+    if not isinstance(document.get("candidate_name"), str) or not document["candidate_name"]:
+        changes["candidate_name"] = "Unknown"
+    for field in MATCH_TEXT_FIELDS:
+        value = document.get(field)
+        if not isinstance(value, str):
+            changes[field] = "" if value is None else str(value)
+    for field in MATCH_LIST_FIELDS:
+        value = document.get(field)
+        if string_list(value) != value:
+            changes[field] = string_list(value)
+    timestamp = _match_timestamp(document)
+    if timestamp != document.get("timestamp"):
+        changes["timestamp"] = timestamp
+    return changes
+
+
+# Collection -> current version
+SCHEMA_VERSIONS = {"resumes": 4, "jobs": 2, "matches": 2}
+
+# Collection -> {target version: migration}. A migration only reads the fields
+# it converts and must be idempotent, because it also normalizes new writes.
+MIGRATIONS: Dict[str, Dict[int, Callable[[Dict[str, Any]], Dict[str, Any]]]] = {
+    "resumes": {2: _resume_v2, 3: _resume_v3, 4: _resume_v4},
+    "jobs": {2: _job_v2},
+    "matches": {2: _match_v2},
+}
+
+# Collection -> {target version: writes to other collections}, computed from
+# the document as it is before that version's migration
+SIDE_WRITES: Dict[str, Dict[int, Callable[[Dict[str, Any]], List[Tuple[str, UpdateOne]]]]] = {
+    "resumes": {4: _resume_v4_text},
+}
+
+# Collection -> {target version: fields that migration reads which readers
+# project away}; loaded separately for documents below that version
+MIGRATION_INPUTS: Dict[str, Dict[int, Tuple[str, ...]]] = {
+    "resumes": {4: ("text_content",)},
+}
+
+
+def schema_version(document: Dict[str, Any]) -> int:
+    return document.get("schema_version", 1)
+
+
+def migration_inputs(collection_name: str, from_version: int) -> Set[str]:
+    """Fields the migrations after from_version read that readers may have projected away."""
+    fields = set()
+    for version, names in MIGRATION_INPUTS.get(collection_name, {}).items():
+        if version > from_version:
+            fields.update(names)
+    return fields
+
+
+def _set_path(document: Dict[str, Any], path: str, value: Any):
+    parts = path.split(".")
+    for part in parts[:-1]:
+        document = document.setdefault(part, {})
+    if value is UNSET:
+        document.pop(parts[-1], None)
+    else:
+        document[parts[-1]] = value
+
+
+def apply_migrations(
+    collection_name: str,
+    document: Dict[str, Any],
+    from_version: int = 1,
+    side_writes: Optional[List[Tuple[str, UpdateOne]]] = None
+) -> Dict[str, Any]:
+    """
+    Run every migration after from_version on document in place.
+
+    Args:
+        side_writes: Collects the (collection, write) pairs of migrations that move data
+
+    Returns:
+        The changed fields as $set paths, UNSET for removed fields
+    """
+    changes = {}
+    for version in range(from_version + 1, SCHEMA_VERSIONS[collection_name] + 1):
+        if side_writes is not None and version in SIDE_WRITES.get(collection_name, {}):
+            side_writes.extend(SIDE_WRITES[collection_name][version](document))
+        for path, value in MIGRATIONS[collection_name][version](document).items():
+            _set_path(document, path, value)
+            changes[path] = value
+    return changes
+
+
+def stamp_new(collection_name: str, document: Dict[str, Any]) -> Dict[str, Any]:
+    """Normalize a document about to be inserted and mark it current."""
+    apply_migrations(collection_name, document)
+    document["schema_version"] = SCHEMA_VERSIONS[collection_name]
+    return document
+
+
+def normalize_fields(collection_name: str, fields: Dict[str, Any]) -> Dict[str, Any]:
+    """Normalize the top-level fields of a $set so updates never reintroduce old shapes."""
+    apply_migrations(collection_name, fields)
+    return fields
+
+
+def migration_update(
+    collection_name: str, document: Dict[str, Any]
+) -> Optional[Tuple[UpdateOne, List[Tuple[str, UpdateOne]]]]:
+    """
+    Upgrade a full document in place and return the write that persists it
+    with the side writes that must succeed first, or None if it is already
+    current. The write only applies if the stored document is still at the
+    version that was read; side writes are idempotent.
+    """
+    version = schema_version(document)
+    current = SCHEMA_VERSIONS[collection_name]
+    if version >= current:
+        return None
+
+    side_writes = []
+    changes = apply_migrations(collection_name, document, version, side_writes)
+    changes["schema_version"] = document["schema_version"] = current
+
+    update = {"$set": {path: value for path, value in changes.items() if value is not UNSET}}
+    removed = {path: "" for path, value in changes.items() if value is UNSET}
+    if removed:
+        update["$unset"] = removed
+    stored_version = {"$exists": False} if version == 1 else version
+    return UpdateOne({"_id": _object_id(document), "schema_version": stored_version}, update), side_writes
+
+
+def outdated_filter(collection_name: str) -> Dict[str, Any]:
+    """Query for documents below the current schema version."""
+    return {"$or": [
+        {"schema_version": {"$exists": False}},
+        {"schema_version": {"$lt": SCHEMA_VERSIONS[collection_name]}}
+    ]}
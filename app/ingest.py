@@ -0,0 +1,332 @@
+"""
+Command-line backfill tool for importing large resume directories.
+
+Usage:
+    python -m app.ingest <directory> [--workers N] [--batch-size N]
+                                     [--llm-concurrency N] [--llm-rate R]
+                                     [--skip-llm] [--checkpoint PATH]
+
+Files are parsed in a process pool, enriched with the LLM under a rate
+limit, and written to MongoDB in batches; the originals of inserted
+resumes are then copied to the blob store. After each batch is written its
+paths are recorded in a checkpoint file, so an interrupted run resumes
+where it stopped. Files that fail to parse are recorded separately with
+their error and retried on the next run.
+"""
+import argparse
+import asyncio
+import json
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+from typing import Dict, Any, List, Optional, Set
+
+from app.config import settings
+from app.database.mongodb import MongoDB, ResumeDB
+from app.database.blob_store import blob_store
+from app.services.pdf_parser import DocumentParser
+from app.services.text_extractor import TextExtractor
+from app.services.section_segmenter import SectionSegmenter
+from app.services.skill_matcher import get_skill_matcher
+from app.services.llm_service_enhanced import load_enhanced_llm_service
+from app.services.enrichment import (
+    EnrichmentWorker, needs_llm, STATUS_PENDING, STATUS_READY, STATUS_FAILED,
+    SOURCE_HEURISTIC, SOURCE_LLM
+)
+
+
+class RateLimiter:
+    """Spaces out calls to at most `rate` per second across concurrent tasks."""
+
+    def __init__(self, rate: float):
+        self.interval = 1.0 / rate if rate > 0 else 0.0
+        self._next_slot = 0.0
+        self._lock = asyncio.Lock()
+
+    async def wait(self):
+        """Block until the caller may make its next call."""
+        async with self._lock:
+            now = asyncio.get_running_loop().time()
+            delay = self._next_slot - now
+            self._next_slot = max(now, self._next_slot) + self.interval
+        if delay > 0:
+            await asyncio.sleep(delay)
+
+
+class Checkpoint:
+    """
+    Already-ingested relative paths, plus the last parse error of files that
+    could not be ingested (not skipped by later runs), persisted as JSON.
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        self.done: Set[str] = set()
+        self.failed: Dict[str, str] = {}
+        if os.path.exists(path):
+            with open(path, encoding="utf-8") as f:
+                data = json.load(f)
+            self.done = set(data.get("done", []))
+            self.failed = dict(data.get("failed", {}))
+
+    def mark(self, relative_paths: List[str], failed: Optional[Dict[str, str]] = None):
+        """Record paths as ingested and parse failures by path, and persist atomically."""
+        self.done.update(relative_paths)
+        for path in relative_paths:
+            self.failed.pop(path, None)
+        self.failed.update(failed or {})
+        tmp_path = self.path + ".tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump({"done": sorted(self.done), "failed": dict(sorted(self.failed.items()))}, f)
+        os.replace(tmp_path, self.path)
+
+
+def discover_files(directory: str) -> List[str]:
+    """Return relative paths of all supported resume files under directory."""
+    found = []
+    for root, _, filenames in os.walk(directory):
+        for filename in filenames:
+            extension = filename.rsplit('.', 1)[-1].lower()
+            if extension in settings.allowed_extensions_list:
+                found.append(os.path.relpath(os.path.join(root, filename), directory))
+    return sorted(found)
+
+
+def parse_resume_file(path: str) -> Dict[str, Any]:
+    """
+    Parse one file and run heuristic extraction (runs in a worker process).
+
+    Returns:
+        Resume document fields, or {"error": ...} if the file is unusable
+    """
+    try:
+        with open(path, "rb") as f:
+            file_content = f.read()
+        if len(file_content) > settings.max_file_size_bytes:
+            return {"error": "file too large"}
+
+        filename = os.path.basename(path)
+        text_content, extraction = DocumentParser.parse_file_with_report(filename, file_content)
+        if not text_content or len(text_content) < 50:
+            return {"error": "no meaningful text"}
+
+        heuristics = TextExtractor.extract_all(text_content)
+        return {
+            "filename": filename,
+            "file_type": filename.rsplit('.', 1)[-1].lower(),
+            "file_size": len(file_content),
+            "content_hash": blob_store.content_hash(file_content),
+            "text_content": text_content,
+            "parsed_data": heuristics.to_parsed_data(),
+            "extraction": extraction,
+            "sections": heuristics.sections,
+            "heuristic_confidence": heuristics.confidence,
+            "extraction_source": SOURCE_LLM if needs_llm(heuristics) else SOURCE_HEURISTIC,
+            **get_skill_matcher().to_document_fields(heuristics.skill_ids)
+        }
+    except Exception as e:
+        return {"error": str(e)}
+
+
+def store_original(path: str) -> str:
+    """Copy one file into the blob store (runs in a worker process)."""
+    with open(path, "rb") as f:
+        return blob_store.put_sync(f.read())
+
+
+class Ingester:
+    """Batch pipeline: parallel parse -> rate-limited LLM -> batched insert."""
+
+    def __init__(
+        self,
+        directory: str,
+        checkpoint_path: str,
+        workers: int,
+        batch_size: int,
+        llm_concurrency: int,
+        llm_rate: float,
+        skip_llm: bool
+    ):
+        self.directory = directory
+        self.checkpoint = Checkpoint(checkpoint_path)
+        self.workers = workers
+        self.batch_size = batch_size
+        self.skip_llm = skip_llm
+        self.llm_semaphore = asyncio.Semaphore(llm_concurrency)
+        self.rate_limiter = RateLimiter(llm_rate)
+        self.stats = {
+            "discovered": 0, "skipped": 0, "inserted": 0,
+            "parse_failed": 0, "llm_failed": 0, "write_failed": 0, "heuristic_only": 0,
+            "parse_seconds": 0.0, "llm_seconds": 0.0, "write_seconds": 0.0
+        }
+
+    async def _enrich(self, resume_data: Dict[str, Any]) -> Dict[str, Any]:
+        """Run LLM extraction for one parsed resume under the rate limit."""
+        async with self.llm_semaphore:
+            await self.rate_limiter.wait()
+            try:
+                llm_service = await load_enhanced_llm_service()
+                llm_data = await llm_service.extract_structured_data(
+                    SectionSegmenter.labeled_text(resume_data["text_content"], resume_data["sections"])
+                )
+            except Exception as e:
+                self.stats["llm_failed"] += 1
+                resume_data["status"] = STATUS_FAILED
+                resume_data["error"] = str(e)
+                return resume_data
+        resume_data["parsed_data"] = EnrichmentWorker.merge_parsed_data(resume_data["parsed_data"], llm_data)
+        resume_data.update(EnrichmentWorker.skill_fields(resume_data["parsed_data"], resume_data["skill_ids"]))
+        resume_data["status"] = STATUS_READY
+        return resume_data
+
+    async def run(self):
+        """Ingest every file not yet recorded in the checkpoint."""
+        all_files = discover_files(self.directory)
+        pending = [path for path in all_files if path not in self.checkpoint.done]
+        self.stats["discovered"] = len(all_files)
+        self.stats["skipped"] = len(all_files) - len(pending)
+
+        loop = asyncio.get_running_loop()
+        with ProcessPoolExecutor(max_workers=self.workers) as pool:
+            for start in range(0, len(pending), self.batch_size):
+                batch = pending[start:start + self.batch_size]
+
+                parse_start = time.perf_counter()
+                parsed = await asyncio.gather(*[
+                    loop.run_in_executor(pool, parse_resume_file, os.path.join(self.directory, path))
+                    for path in batch
+                ])
+                self.stats["parse_seconds"] += time.perf_counter() - parse_start
+
+                documents = []
+                parse_errors = {}
+                for path, resume_data in zip(batch, parsed):
+                    if "error" in resume_data:
+                        self.stats["parse_failed"] += 1
+                        parse_errors[path] = resume_data["error"]
+                        print(f"   ⚠️  Skipped {path}: {resume_data['error']}")
+                        continue
+                    resume_data["source_path"] = path
+                    documents.append(resume_data)
+
+                # Confident heuristic results are stored as-is
+                llm_documents = []
+                for resume_data in documents:
+                    if resume_data["extraction_source"] == SOURCE_HEURISTIC:
+                        resume_data["status"] = STATUS_READY
+                        self.stats["heuristic_only"] += 1
+                    else:
+                        llm_documents.append(resume_data)
+
+                if self.skip_llm:
+                    # Left pending for the server's background enrichment worker
+                    for resume_data in llm_documents:
+                        resume_data["status"] = STATUS_PENDING
+                else:
+                    llm_start = time.perf_counter()
+                    await asyncio.gather(*[self._enrich(doc) for doc in llm_documents])
+                    self.stats["llm_seconds"] += time.perf_counter() - llm_start
+
+                write_start = time.perf_counter()
+                result = await ResumeDB.create_resumes(list(documents))
+                self.stats["write_seconds"] += time.perf_counter() - write_start
+                self.stats["inserted"] += len(result["inserted_ids"])
+                self.stats["write_failed"] += len(result["errors"])
+                failed_paths = set()
+                for error in result["errors"]:
+                    path = documents[error["index"]]["source_path"]
+                    failed_paths.add(path)
+                    print(f"   ⚠️  Insert failed for {path}: {error['message']}")
+
+                # Originals are stored only for inserted resumes; a resume whose
+                # original could not be stored is removed and retried
+                inserted = [doc for doc in documents if doc["source_path"] not in failed_paths]
+                stored = await asyncio.gather(*[
+                    loop.run_in_executor(pool, store_original, os.path.join(self.directory, doc["source_path"]))
+                    for doc in inserted
+                ], return_exceptions=True)
+                unstored = []
+                for resume_data, outcome in zip(inserted, stored):
+                    if isinstance(outcome, Exception):
+                        unstored.append(str(resume_data["_id"]))
+                        failed_paths.add(resume_data["source_path"])
+                        print(f"   ⚠️  Storing {resume_data['source_path']} failed: {outcome}")
+                if unstored:
+                    self.stats["inserted"] -= len(unstored)
+                    self.stats["write_failed"] += len(unstored)
+                    await ResumeDB.delete_resumes(unstored)
+
+                # Files whose parse or insert failed are retried on the next run
+                failed_paths.update(parse_errors)
+                self.checkpoint.mark([path for path in batch if path not in failed_paths], parse_errors)
+                print(f"   ✅ {start + len(batch)}/{len(pending)} files processed")
+
+    def print_summary(self, elapsed: float):
+        """Print a throughput summary for the run."""
+        stats = self.stats
+        processed = stats["discovered"] - stats["skipped"]
+        print("\n" + "=" * 70)
+        print("📊 INGEST SUMMARY")
+        print("=" * 70)
+        print(f"Files discovered:     {stats['discovered']}")
+        print(f"Skipped (checkpoint): {stats['skipped']}")
+        print(f"Inserted:             {stats['inserted']}")
+        print(f"Parse failures:       {stats['parse_failed']}")
+        print(f"LLM failures:         {stats['llm_failed']}")
+        print(f"Insert failures:      {stats['write_failed']}")
+        print(f"Served without LLM:   {stats['heuristic_only']} "
+              f"({stats['heuristic_only'] / max(stats['inserted'], 1):.0%} of inserted)")
+        print(f"Elapsed:              {elapsed:.1f}s")
+        print(f"Throughput:           {processed / max(elapsed, 1e-9):.2f} files/s")
+        print(f"Time in parse/LLM/write: {stats['parse_seconds']:.1f}s / "
+              f"{stats['llm_seconds']:.1f}s / {stats['write_seconds']:.1f}s")
+        print("=" * 70)
+
+
+def build_arg_parser() -> argparse.ArgumentParser:
+    """Command-line arguments for the ingester."""
+    parser = argparse.ArgumentParser(description="Bulk-import a directory of resumes")
+    parser.add_argument("directory", help="Directory to scan recursively for PDF/DOCX/TXT resumes")
+    parser.add_argument("--checkpoint", default=None,
+                        help="Checkpoint file (default: <directory>/.ingest_checkpoint.json)")
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 1,
+                        help="Parser processes")
+    parser.add_argument("--batch-size", type=int, default=100,
+                        help="Documents per MongoDB insert and checkpoint")
+    parser.add_argument("--llm-concurrency", type=int, default=4,
+                        help="Concurrent LLM extractions")
+    parser.add_argument("--llm-rate", type=float, default=2.0,
+                        help="Maximum LLM requests per second (0 = unlimited)")
+    parser.add_argument("--skip-llm", action="store_true",
+                        help="Store resumes as pending; a running server picks them up "
+                             "within ENRICHMENT_SWEEP_SECONDS")
+    return parser
+
+
+async def main(argv: Optional[List[str]] = None):
+    """Run the ingester."""
+    args = build_arg_parser().parse_args(argv)
+    directory = os.path.abspath(args.directory)
+    checkpoint_path = args.checkpoint or os.path.join(directory, ".ingest_checkpoint.json")
+
+    ingester = Ingester(
+        directory=directory,
+        checkpoint_path=checkpoint_path,
+        workers=args.workers,
+        batch_size=args.batch_size,
+        llm_concurrency=args.llm_concurrency,
+        llm_rate=args.llm_rate,
+        skip_llm=args.skip_llm
+    )
+
+    await MongoDB.connect_db()
+    start = time.perf_counter()
+    try:
+        await ingester.run()
+    finally:
+        ingester.print_summary(time.perf_counter() - start)
+        await MongoDB.close_db()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -3,13 +3,17 @@ FastAPI application entry point for Smart Resume Screener.
 """
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.staticfiles import StaticFiles
 from contextlib import asynccontextmanager
 import os
 
 from app.config import settings
 from app.database.mongodb import MongoDB
+from app.database.indexes import ensure_indexes
+from app.services.enrichment import enrichment_worker
+from app.warmup import warm_up
 from app.api.routes import router
+from app.api.compression import CompressionMiddleware
+from app.api.static_assets import FingerprintedStaticFiles
 
 # Lifespan context manager for startup/shutdown events
 @asynccontextmanager
@@ -17,13 +21,18 @@ async def lifespan(app: FastAPI):
     """Handle startup and shutdown events."""
     # Startup
     print("🚀 Starting Smart Resume Screener...")
+    # Runs in every worker process: connections are created after the fork
     await MongoDB.connect_db()
+    await ensure_indexes()
+    await warm_up()
+    await enrichment_worker.start()
     print("✅ Application ready!")
     
     yield
     
     # Shutdown
     print("🔌 Shutting down...")
+    await enrichment_worker.stop()
     await MongoDB.close_db()
     print("👋 Goodbye!")
 
@@ -42,15 +51,19 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=["ETag"],  # Read by the frontend for If-None-Match
 )
 
+# Compress JSON responses above compression_min_bytes
+app.add_middleware(CompressionMiddleware)
+
 # Include API routes
 app.include_router(router)
 
-# Serve frontend static files
+# Serve frontend static files (fingerprinted and precompressed at startup)
 frontend_path = os.path.join(os.path.dirname(os.path.dirname(__file__)), "frontend")
 if os.path.exists(frontend_path):
-    app.mount("/", StaticFiles(directory=frontend_path, html=True), name="frontend")
+    app.mount("/", FingerprintedStaticFiles(frontend_path), name="frontend")
 
 # Root endpoint
 @app.get("/api")
@@ -63,11 +76,28 @@ async def root():
         "health": "/health"
     }
 
-if __name__ == "__main__":
+def worker_count() -> int:
+    """Server processes to start: WORKERS, or one per CPU core when 0."""
+    return settings.workers if settings.workers > 0 else os.cpu_count() or 1
+
+def serve():
+    """
+    Run the server. With more than one worker, uvicorn spawns fresh processes
+    that each import the app and run the lifespan, so no database client,
+    socket or LLM client is shared across processes.
+    """
     import uvicorn
+    
+    workers = worker_count()
+    if workers > 1 and settings.storage_backend == "memory":
+        raise SystemExit("The memory storage backend is single-process; set WORKERS=1")
     uvicorn.run(
         "app.main:app",
         host=settings.host,
         port=settings.port,
-        reload=settings.debug
+        workers=workers,
+        reload=settings.debug and workers == 1
     )
+
+if __name__ == "__main__":
+    serve()
@@ -1,11 +1,24 @@
 """
 Services Package
 Business logic and processing services
+
+Exports are imported on first access, so importing one service module
+does not load the others (or langchain, through the LLM services).
 """
+from importlib import import_module
 
-from .pdf_parser import DocumentParser
-from .text_extractor import TextExtractor
-from .llm_service import LLMService, llm_service
-from .matcher import MatcherService
+_EXPORTS = {
+    "DocumentParser": ".pdf_parser",
+    "TextExtractor": ".text_extractor",
+    "LLMService": ".llm_service",
+    "llm_service": ".llm_service",
+    "MatcherService": ".matcher",
+}
 
 __all__ = ["DocumentParser", "TextExtractor", "LLMService", "llm_service", "MatcherService"]
+
+
+def __getattr__(name: str):
+    if name not in _EXPORTS:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    return getattr(import_module(_EXPORTS[name], __name__), name)
@@ -0,0 +1,178 @@
+"""
+Background resume enrichment service.
+Fills parsed_data with LLM-extracted fields after the upload response has returned.
+"""
+import asyncio
+from typing import Dict, Any, List, Optional, Set
+
+from app.services.llm_service_enhanced import load_enhanced_llm_service
+from app.services.section_segmenter import SectionSegmenter
+from app.services.skill_matcher import get_skill_matcher
+from app.services.text_extractor import HeuristicResult
+from app.database.mongodb import ResumeDB
+from app.config import settings
+
+# Resume processing states stored on the document's "status" field
+STATUS_PENDING = "pending"
+STATUS_READY = "ready"
+STATUS_FAILED = "failed"
+
+# Where a resume's parsed_data came from, stored on "extraction_source"
+SOURCE_HEURISTIC = "heuristic"
+SOURCE_LLM = "llm"
+
+
+def needs_llm(heuristics: HeuristicResult) -> bool:
+    """
+    Whether heuristic extraction is too weak to serve on its own: confidence
+    below llm_extraction_threshold or a required field missing.
+    """
+    if heuristics.confidence < settings.llm_extraction_threshold:
+        return True
+    return any(not getattr(heuristics, field, None) for field in settings.llm_required_fields_list)
+
+
+class EnrichmentWorker:
+    """Queue-backed worker pool that runs LLM extraction for pending resumes."""
+
+    def __init__(self, concurrency: Optional[int] = None):
+        """Initialize the worker; tasks are started in start()."""
+        self.concurrency = concurrency or settings.enrichment_workers
+        self.queue = None  # type: asyncio.Queue | None
+        self._tasks = []  # type: List[asyncio.Task]
+        self._queued: Set[str] = set()  # Queued or in progress in this process
+
+    async def start(self):
+        """
+        Start worker tasks, re-queue resumes left pending by a previous run
+        and start the periodic pending sweep.
+        """
+        self.queue = asyncio.Queue()
+        self._queued = set()
+        self._tasks = [
+            asyncio.create_task(self._run())
+            for _ in range(max(1, self.concurrency))
+        ]
+
+        requeued = await self.sweep()
+        if requeued:
+            print(f"🔁 Re-queued {requeued} pending resume(s) for enrichment")
+        if settings.enrichment_sweep_seconds > 0:
+            self._tasks.append(asyncio.create_task(self._sweep_periodically()))
+
+    async def sweep(self) -> int:
+        """
+        Queue every pending resume not already queued in this process, e.g.
+        ones stored pending by `python -m app.ingest --skip-llm` or whose
+        lease expired in a process that died. Another process may queue the
+        same resumes; the enrichment lease lets only one of them run each.
+
+        Returns:
+            Number of resumes queued
+        """
+        queued = 0
+        for resume_id in await ResumeDB.get_resume_ids_by_status(STATUS_PENDING):
+            if resume_id not in self._queued:
+                self.enqueue(resume_id)
+                queued += 1
+        return queued
+
+    async def _sweep_periodically(self):
+        while True:
+            await asyncio.sleep(settings.enrichment_sweep_seconds)
+            try:
+                queued = await self.sweep()
+                if queued:
+                    print(f"🔁 Queued {queued} pending resume(s) for enrichment")
+            except Exception as e:
+                print(f"Pending resume sweep failed: {e}")
+
+    async def stop(self):
+        """Cancel worker tasks. Unfinished resumes stay pending for the next start."""
+        for task in self._tasks:
+            task.cancel()
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+        self._tasks = []
+
+    def enqueue(self, resume_id: str):
+        """Schedule a resume for enrichment."""
+        if self.queue is None:
+            raise RuntimeError("Enrichment worker is not running")
+        self._queued.add(resume_id)
+        self.queue.put_nowait(resume_id)
+
+    async def _run(self):
+        """Worker loop: take resume IDs off the queue and enrich them."""
+        while True:
+            resume_id = await self.queue.get()
+            try:
+                await self.enrich_resume(resume_id)
+            except Exception as e:
+                print(f"Error enriching resume {resume_id}: {e}")
+            finally:
+                self._queued.discard(resume_id)
+                self.queue.task_done()
+
+    async def enrich_resume(self, resume_id: str):
+        """
+        Run LLM extraction for one resume and store the result.
+
+        Args:
+            resume_id: Resume document ID
+        """
+        if not await ResumeDB.claim_for_enrichment(resume_id, STATUS_PENDING):
+            return  # Not pending, or another worker process has it
+        resume = await ResumeDB.get_resume(resume_id)
+        if not resume:
+            return
+
+        try:
+            text_content = await ResumeDB.get_resume_text(resume_id) or ""
+            llm_service = await load_enhanced_llm_service()
+            llm_data = await llm_service.extract_structured_data(
+                SectionSegmenter.labeled_text(text_content, resume.get("sections"))
+            )
+        except Exception as e:
+            print(f"LLM extraction failed for resume {resume_id}: {e}")
+            await ResumeDB.update_resume(resume_id, {
+                "status": STATUS_FAILED,
+                "error": str(e)
+            })
+            return
+
+        parsed_data = self.merge_parsed_data(resume.get("parsed_data") or {}, llm_data)
+        await ResumeDB.update_resume(resume_id, {
+            "parsed_data": parsed_data,
+            **self.skill_fields(parsed_data, resume.get("skill_ids", [])),
+            "status": STATUS_READY
+        })
+
+    @staticmethod
+    def merge_parsed_data(heuristic_data: Dict[str, Any], llm_data: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        Merge LLM results with the heuristic fields captured at upload.
+        LLM values win; heuristic values fill fields the LLM left empty.
+        """
+        merged = dict(llm_data)
+        for field in ("name", "email", "phone", "skills"):
+            if not merged.get(field):
+                merged[field] = heuristic_data.get(field)
+        return merged
+
+    @staticmethod
+    def skill_fields(parsed_data: Dict[str, Any], skill_ids: List[str]) -> Dict[str, Any]:
+        """
+        Canonical skill fields after enrichment: heuristic skill IDs plus the
+        LLM's skill lists mapped through the taxonomy's synonyms.
+        """
+        matcher = get_skill_matcher()
+        skills = []
+        for field in ("skills", "technical_skills", "tools_technologies"):
+            skills.extend(parsed_data.get(field) or [])
+        combined = dict.fromkeys(skill_ids)
+        combined.update(dict.fromkeys(matcher.canonicalize(skills)))
+        return matcher.to_document_fields(list(combined))
+
+
+# Create a global instance
+enrichment_worker = EnrichmentWorker()
@@ -1,6 +1,8 @@
 """
 LangChain + Gemini LLM integration service.
 Handles all LLM-based operations for resume analysis and matching.
+Legacy: the application uses llm_service_enhanced; this module (and
+langchain with it) is only loaded when imported explicitly.
 """
 from langchain_google_genai import ChatGoogleGenerativeAI
 from langchain.prompts import PromptTemplate
@@ -8,6 +10,7 @@ from langchain.chains import LLMChain
 from app.config import settings
 import json
 import re
+from functools import lru_cache
 from typing import Dict, Any, List
 
 class LLMService:
@@ -260,5 +263,14 @@ Focus on: skills, experience, education, certifications.
             return []
 
 
-# Global LLM service instance
-llm_service = LLMService()
+@lru_cache(maxsize=1)
+def get_llm_service() -> LLMService:
+    """Shared legacy service, with its Gemini client created on first use."""
+    return LLMService()
+
+
+def __getattr__(name: str):
+    # Former module-level instance, now built on first access
+    if name == "llm_service":
+        return get_llm_service()
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
@@ -2,11 +2,9 @@
 Enhanced LLM Service with optimized prompts and structured output validation.
 Phase 4: LLM Optimization & Prompt Engineering
 """
-from langchain_google_genai import ChatGoogleGenerativeAI
-from langchain_core.prompts import ChatPromptTemplate
-from langchain_core.output_parsers import JsonOutputParser
 import json
 import re
+import threading
 from typing import Dict, Any, Optional, List
 from pydantic import ValidationError
 import asyncio
@@ -27,6 +25,8 @@ class EnhancedLLMService:
     
     def __init__(self):
         """Initialize the Gemini LLM with optimized settings."""
+        # Lazy import: langchain and the Gemini SDK take seconds to import
+        from langchain_google_genai import ChatGoogleGenerativeAI
         self.llm = ChatGoogleGenerativeAI(
             model=settings.llm_model,
             google_api_key=settings.gemini_api_key,
@@ -471,5 +471,35 @@ Return a valid JSON object following the exact structure from the examples.
             "interviewer_notes": None
         }
 
-# Create a global instance
-enhanced_llm_service = EnhancedLLMService()
+_service: Optional[EnhancedLLMService] = None
+_service_lock = threading.Lock()
+
+
+def get_enhanced_llm_service() -> EnhancedLLMService:
+    """
+    Shared service, with its Gemini client created on first use. Blocks
+    while langchain is imported; async code uses load_enhanced_llm_service.
+    """
+    global _service
+    with _service_lock:
+        if _service is None:
+            _service = EnhancedLLMService()
+        return _service
+
+
+async def load_enhanced_llm_service() -> EnhancedLLMService:
+    """
+    Shared service for async callers. The first call builds it in a worker
+    thread, so the seconds-long langchain and Gemini SDK import does not
+    stall every other request on the event loop.
+    """
+    if _service is not None:
+        return _service
+    return await asyncio.to_thread(get_enhanced_llm_service)
+
+
+def __getattr__(name: str):
+    # Former module-level instance, now built on first access
+    if name == "enhanced_llm_service":
+        return get_enhanced_llm_service()
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
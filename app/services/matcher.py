@@ -3,14 +3,60 @@ Resume-job matching service.
 Orchestrates the matching process between resumes and job descriptions.
 Enhanced with Phase 4 LLM optimization.
 """
-from typing import Dict, Any, List
-from app.services.llm_service import llm_service  # Original service (backup)
-from app.services.llm_service_enhanced import enhanced_llm_service  # Enhanced Phase 4 service
+from typing import Dict, Any, List, Tuple
+import numpy as np
+from app.services.llm_service_enhanced import load_enhanced_llm_service  # Enhanced Phase 4 service
+from app.services.skill_matcher import get_skill_matcher
+from app.services.skill_overlap import bits_matrix, skill_overlap
 from app.database.mongodb import ResumeDB, JobDB, MatchDB
+from app.database.schema import clamped_score, string_list
+from app.database.entity_cache import entity_cache
+
 
 class MatcherService:
     """Service for matching resumes with job descriptions."""
     
+    @staticmethod
+    async def score_resume(resume: Dict[str, Any], job: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        Run LLM matching for one resume and build its match document (not saved).
+        The document is normalized to the MatchResult shape here, once, so
+        match responses can be served without revalidation.
+        
+        Args:
+            resume: Resume document
+            job: Job document
+            
+        Returns:
+            Match result dictionary
+        """
+        # Perform Enhanced LLM-based matching (Phase 4 optimization)
+        llm_service = await load_enhanced_llm_service()
+        match_result = await llm_service.match_resume_with_job(
+            resume_data=resume.get("parsed_data", {}),
+            job_description=job.get("description", "")
+        )
+        
+        # Prepare match document with enhanced analysis
+        return {
+            "resume_id": resume["_id"],
+            "job_id": job["_id"],
+            "candidate_name": (resume.get("parsed_data") or {}).get("name") or "Unknown",
+            "score": clamped_score(match_result.get("score", 0)),
+            "recommendation": match_result.get("recommendation", "Moderate Match"),
+            "confidence_level": match_result.get("confidence_level", 0.7),
+            "score_breakdown": match_result.get("score_breakdown", {}),
+            "skills_analysis": match_result.get("skills_analysis", {}),
+            "matching_points": string_list(match_result.get("matching_points")),
+            "missing_qualifications": string_list(match_result.get("missing_qualifications")),
+            "strengths": string_list(match_result.get("strengths")),
+            "concerns": string_list(match_result.get("concerns")),
+            "justification": str(match_result.get("justification") or ""),
+            "interviewer_notes": match_result.get("interviewer_notes"),
+            "resume_filename": resume.get("filename") or "",
+            "job_title": job.get("title") or ""
+        }
+    
     @staticmethod
     async def match_single_resume(resume_id: str, job_id: str) -> Dict[str, Any]:
         """
@@ -32,72 +78,72 @@ class MatcherService:
         if not job:
             raise ValueError(f"Job not found: {job_id}")
         
-        # Perform Enhanced LLM-based matching (Phase 4 optimization)
-        match_result = await enhanced_llm_service.match_resume_with_job(
-            resume_data=resume.get("parsed_data", {}),
-            job_description=job.get("description", "")
-        )
-        
-        # Prepare match document with enhanced analysis
-        match_data = {
-            "resume_id": resume_id,
-            "job_id": job_id,
-            "candidate_name": resume.get("parsed_data", {}).get("name", "Unknown"),
-            "score": match_result.get("score", 0),
-            "recommendation": match_result.get("recommendation", "Moderate Match"),
-            "confidence_level": match_result.get("confidence_level", 0.7),
-            "score_breakdown": match_result.get("score_breakdown", {}),
-            "skills_analysis": match_result.get("skills_analysis", {}),
-            "matching_points": match_result.get("matching_points", []),
-            "missing_qualifications": match_result.get("missing_qualifications", []),
-            "strengths": match_result.get("strengths", []),
-            "concerns": match_result.get("concerns", []),
-            "justification": match_result.get("justification", ""),
-            "interviewer_notes": match_result.get("interviewer_notes"),
-            "resume_filename": resume.get("filename", ""),
-            "job_title": job.get("title", "")
-        }
+        match_data = await MatcherService.score_resume(resume, job)
         
         # Save match to database
-        match_id = await MatchDB.create_match(match_data)
-        match_data["_id"] = match_id
+        result = await MatchDB.upsert_matches([match_data])
+        if result["errors"]:
+            raise RuntimeError(result["errors"][0]["message"])
         
         return match_data
     
     @staticmethod
-    async def match_all_resumes_with_job(job_id: str) -> List[Dict[str, Any]]:
+    async def match_resumes(
+        job: Dict[str, Any], resumes: List[Dict[str, Any]]
+    ) -> Tuple[List[Dict[str, Any]], List[str]]:
         """
-        Match all resumes with a specific job description.
+        Match resumes with a job and store every result in one bulk upsert.
         
         Args:
-            job_id: Job document ID
+            job: Job document
+            resumes: Resume documents
             
         Returns:
-            List of match results, sorted by score (highest first)
+            Tuple of stored match results sorted by score (highest first)
+            and per-resume error messages for those that failed
         """
-        # Get all resumes
-        resumes = await ResumeDB.get_all_resumes()
-        
-        if not resumes:
-            return []
-        
-        # Match each resume
-        matches = []
+        matches, errors = [], []
         for resume in resumes:
             try:
-                match_result = await MatcherService.match_single_resume(
-                    resume_id=resume["_id"],
-                    job_id=job_id
-                )
-                matches.append(match_result)
+                matches.append(await MatcherService.score_resume(resume, job))
             except Exception as e:
                 print(f"Error matching resume {resume['_id']}: {e}")
-                continue
+                errors.append(f"{resume['_id']}: {e}")
+        
+        result = await MatchDB.upsert_matches(matches)
+        failed = set()
+        for error in result["errors"]:
+            failed.add(error["index"])
+            errors.append(f"{matches[error['index']]['resume_id']}: {error['message']}")
+        matches = [match for i, match in enumerate(matches) if i not in failed]
         
         # Sort by score (descending)
         matches.sort(key=lambda x: x.get("score", 0), reverse=True)
+        return matches, errors
+    
+    @staticmethod
+    async def match_all_resumes_with_job(job_id: str) -> Tuple[List[Dict[str, Any]], List[str]]:
+        """
+        Match all resumes with a specific job description.
         
-        return matches
+        Args:
+            job_id: Job document ID
+            
+        Returns:
+            Tuple of match results sorted by score (highest first) and error messages
+        """
+        with entity_cache.request_scope():
+            job = await JobDB.get_job(job_id)
+            if not job:
+                raise ValueError(f"Job not found: {job_id}")
+            
+            # Get all resumes
+            resumes = await ResumeDB.get_all_resumes()
+            
+            if not resumes:
+                return [], []
+            
+            return await MatcherService.match_resumes(job, resumes)
     
     @staticmethod
     async def get_top_candidates(job_id: str, top_n: int = 10) -> List[Dict[str, Any]]:
@@ -113,3 +159,59 @@ class MatcherService:
         """
         matches = await MatchDB.get_matches_by_job(job_id)
         return matches[:top_n]
+    
+    @staticmethod
+    def job_skill_fields(description: str, requirements: Any) -> Dict[str, Any]:
+        """
+        Canonical skill fields for a job from its description and requirements.
+        
+        Args:
+            description: Job description text
+            requirements: Requirement strings, or the LLM's requirements dict
+            
+        Returns:
+            Dictionary with skill_ids and skill_bits
+        """
+        matcher = get_skill_matcher()
+        if isinstance(requirements, dict):
+            requirements = (requirements.get("required_skills") or []) + (requirements.get("preferred_skills") or [])
+        skill_ids = dict.fromkeys(matcher.find(description))
+        skill_ids.update(dict.fromkeys(matcher.canonicalize(list(requirements or []))))
+        return matcher.to_document_fields(list(skill_ids))
+    
+    @staticmethod
+    async def rank_by_skill_overlap(job: Dict[str, Any], limit: int = 50) -> Tuple[List[Dict[str, Any]], int]:
+        """
+        Rank all resumes by how many of the job's canonical skills they have.
+        One vectorized bitset operation over every stored resume.
+        
+        Args:
+            job: Job document
+            limit: Number of results to return
+            
+        Returns:
+            Tuple of ranked results and the job's skill count
+        """
+        job_bits = job.get("skill_bits")
+        if not job_bits:
+            job_bits = MatcherService.job_skill_fields(
+                job.get("description", ""), job.get("requirements")
+            )["skill_bits"]
+        
+        bitsets = await ResumeDB.get_skill_bitsets()
+        if not bitsets:
+            return [], 0
+        
+        matrix = bits_matrix([bits for _, bits in bitsets], get_skill_matcher().bitset_size)
+        matched, job_skill_count = skill_overlap(job_bits, matrix)
+        
+        top = np.argsort(-matched, kind="stable")[:limit]
+        results = [
+            {
+                "resume_id": bitsets[i][0],
+                "matched_skills": int(matched[i]),
+                "coverage": round(float(matched[i]) / job_skill_count, 3) if job_skill_count else 0.0
+            }
+            for i in top
+        ]
+        return results, job_skill_count
@@ -2,76 +2,285 @@
 PDF and DOCX parsing service.
 Extracts text content from resume files.
 """
-import pdfplumber
-from docx import Document
-from typing import Optional
+from typing import Dict, Any, Tuple
+import xml.etree.ElementTree as ET
+import unicodedata
+import zipfile
 import io
 
+# WordprocessingML element names used by the streaming DOCX extractor
+_W_NS = "{http://schemas.openxmlformats.org/wordprocessingml/2006/main}"
+_W_BODY = _W_NS + "body"
+_W_P = _W_NS + "p"
+_W_T = _W_NS + "t"
+_W_TAB = _W_NS + "tab"
+_W_BR = _W_NS + "br"
+_W_CR = _W_NS + "cr"
+_W_TBL = _W_NS + "tbl"
+_W_TC = _W_NS + "tc"
+_W_VMERGE = _W_NS + "vMerge"
+_W_VAL = _W_NS + "val"
+_W_POS = _W_NS + "pos"
+# Markup-compatibility alternative kept for older readers; duplicates mc:Choice
+_MC_FALLBACK = "{http://schemas.openxmlformats.org/markup-compatibility/2006}Fallback"
+
 class DocumentParser:
     """Parse PDF and DOCX files to extract text content."""
     
+    # Quality thresholds the fast pypdf pass must meet to skip pdfplumber
+    MIN_CHARS_PER_PAGE = 200
+    MAX_GARBAGE_RATIO = 0.02
+    MAX_BROKEN_WORD_RATIO = 0.25
+    
     @staticmethod
-    def parse_pdf(file_content: bytes) -> str:
+    def score_text_quality(text: str, page_count: int) -> Dict[str, float]:
         """
-        Extract text from PDF file.
-        Uses pdfplumber for better text extraction.
+        Score extracted PDF text on cheap signals of a bad extraction.
+        
+        Args:
+            text: Extracted text
+            page_count: Number of pages in the PDF
+            
+        Returns:
+            Dictionary with chars_per_page, garbage_ratio and broken_word_ratio
+        """
+        chars_per_page = len(text) / max(page_count, 1)
+        
+        # Replacement characters, control/private-use code points and
+        # unmapped glyph markers like "(cid:12)" indicate a font decoding failure
+        garbage = sum(
+            1 for c in text
+            if c == '\ufffd' or (c not in '\n\r\t' and unicodedata.category(c) in ('Cc', 'Co', 'Cs'))
+        )
+        garbage += 6 * text.count('(cid:')
+        garbage_ratio = garbage / max(len(text), 1)
+        
+        # Letter-spaced ("S o f t w a r e") or run-together words
+        words = text.split()
+        broken = sum(
+            1 for w in words
+            if (len(w) == 1 and w.isalpha() and w not in ('a', 'A', 'I')) or (len(w) > 30 and w.isalpha())
+        )
+        broken_word_ratio = broken / max(len(words), 1)
+        
+        return {
+            "chars_per_page": round(chars_per_page, 1),
+            "garbage_ratio": round(garbage_ratio, 4),
+            "broken_word_ratio": round(broken_word_ratio, 4)
+        }
+    
+    @staticmethod
+    def _parse_pdf_pypdf(file_content: bytes) -> Tuple[str, int]:
+        """Extract text with pypdf (fast). Returns the text and page count."""
+        # Lazy import to avoid xml.dom.NodeFilter bug
+        from pypdf import PdfReader
+        pdf_reader = PdfReader(io.BytesIO(file_content))
+        text = ""
+        for page in pdf_reader.pages:
+            text += (page.extract_text() or "") + "\n"
+        return text.strip(), len(pdf_reader.pages)
+    
+    @staticmethod
+    def _parse_pdf_pdfplumber(file_content: bytes) -> str:
+        """Extract text with pdfplumber (slower, layout-aware)."""
+        # Lazy import: only needed when the pypdf pass fails its quality checks
+        import pdfplumber
+        text = ""
+        with pdfplumber.open(io.BytesIO(file_content)) as pdf:
+            for page in pdf.pages:
+                page_text = page.extract_text()
+                if page_text:
+                    text += page_text + "\n"
+        return text.strip()
+    
+    @staticmethod
+    def parse_pdf_with_report(file_content: bytes) -> Tuple[str, Dict[str, Any]]:
+        """
+        Extract text from PDF file, choosing the engine adaptively.
+        Tries pypdf first and escalates to pdfplumber only when the
+        pypdf output fails the quality checks in score_text_quality.
         
         Args:
             file_content: PDF file content as bytes
             
         Returns:
-            Extracted text as string
+            Tuple of extracted text and a report with the chosen engine,
+            the reason for choosing it and the fast-pass quality scores
         """
+        fast_text = ""
+        quality = None
         try:
-            text = ""
-            with pdfplumber.open(io.BytesIO(file_content)) as pdf:
-                for page in pdf.pages:
-                    page_text = page.extract_text()
-                    if page_text:
-                        text += page_text + "\n"
-            return text.strip()
+            fast_text, page_count = DocumentParser._parse_pdf_pypdf(file_content)
+            quality = DocumentParser.score_text_quality(fast_text, page_count)
+            
+            if quality["chars_per_page"] < DocumentParser.MIN_CHARS_PER_PAGE:
+                reason = f"low text density ({quality['chars_per_page']} chars/page)"
+            elif quality["garbage_ratio"] > DocumentParser.MAX_GARBAGE_RATIO:
+                reason = f"high garbage ratio ({quality['garbage_ratio']})"
+            elif quality["broken_word_ratio"] > DocumentParser.MAX_BROKEN_WORD_RATIO:
+                reason = f"high broken word ratio ({quality['broken_word_ratio']})"
+            else:
+                return fast_text, {
+                    "engine": "pypdf",
+                    "reason": "pypdf output passed quality checks",
+                    "quality": quality
+                }
+        except Exception as e:
+            print(f"Error parsing PDF with pypdf: {e}")
+            reason = f"pypdf failed: {e}"
+        
+        try:
+            text = DocumentParser._parse_pdf_pdfplumber(file_content)
+            return text, {"engine": "pdfplumber", "reason": reason, "quality": quality}
         except Exception as e:
             print(f"Error parsing PDF with pdfplumber: {e}")
-            # Fallback to pypdf (lazy import to avoid xml.dom.NodeFilter bug)
-            try:
-                from pypdf import PdfReader
-                pdf_reader = PdfReader(io.BytesIO(file_content))
-                text = ""
-                for page in pdf_reader.pages:
-                    text += page.extract_text() + "\n"
-                return text.strip()
-            except Exception as e2:
-                print(f"pypdf fallback also failed: {e2}")
-                raise Exception("Failed to parse PDF file")
+            if fast_text:
+                return fast_text, {
+                    "engine": "pypdf",
+                    "reason": f"{reason}; pdfplumber failed: {e}",
+                    "quality": quality
+                }
+            raise Exception("Failed to parse PDF file")
     
     @staticmethod
-    def parse_docx(file_content: bytes) -> str:
+    def parse_pdf(file_content: bytes) -> str:
+        """
+        Extract text from PDF file.
+        See parse_pdf_with_report for the engine selection strategy.
+        
+        Args:
+            file_content: PDF file content as bytes
+            
+        Returns:
+            Extracted text as string
+        """
+        text, _ = DocumentParser.parse_pdf_with_report(file_content)
+        return text
+    
+    @staticmethod
+    def _parse_docx_stream(file_content: bytes) -> str:
+        """
+        Extract DOCX text by stream-parsing word/document.xml from the ZIP.
+        Emits paragraphs and table cells in document order. Vertically merged
+        continuation cells are skipped, so merged cells appear once. Text box
+        content follows the paragraph it is anchored in, read once from
+        mc:Choice (the mc:Fallback copy is skipped).
+        """
+        lines = []
+        # Open paragraphs [_W_P, runs, anchored lines] and cells [_W_TC, lines, skip];
+        # text boxes nest paragraphs and tables inside a paragraph
+        frames = []
+        fallback_depth = 0
+        
+        def emit(new_lines):
+            if not frames:
+                lines.extend(new_lines)
+            else:
+                frames[-1][2 if frames[-1][0] == _W_P else 1].extend(new_lines)
+        
+        with zipfile.ZipFile(io.BytesIO(file_content)) as archive:
+            with archive.open("word/document.xml") as xml_stream:
+                for event, elem in ET.iterparse(xml_stream, events=("start", "end")):
+                    tag = elem.tag
+                    if tag == _MC_FALLBACK:
+                        fallback_depth += 1 if event == "start" else -1
+                        continue
+                    if fallback_depth:
+                        continue
+                    
+                    if event == "start":
+                        if tag == _W_P:
+                            frames.append([_W_P, [], []])
+                        elif tag == _W_TC:
+                            frames.append([_W_TC, [], False])
+                        continue
+                    
+                    in_paragraph = bool(frames) and frames[-1][0] == _W_P
+                    if tag == _W_T and in_paragraph:
+                        frames[-1][1].append(elem.text or "")
+                    elif tag == _W_TAB and in_paragraph and elem.get(_W_POS) is None:
+                        # Tab stop definitions carry w:pos; run tabs do not
+                        frames[-1][1].append("\t")
+                    elif tag in (_W_BR, _W_CR) and in_paragraph:
+                        frames[-1][1].append("\n")
+                    elif tag == _W_VMERGE:
+                        # No val (or "continue") marks a continuation of the cell above
+                        if frames and frames[-1][0] == _W_TC and elem.get(_W_VAL, "continue") == "continue":
+                            frames[-1][2] = True
+                    elif tag == _W_P:
+                        _, runs, anchored = frames.pop()
+                        emit(["".join(runs)] + anchored)
+                    elif tag == _W_TC:
+                        _, cell_lines, skip = frames.pop()
+                        if not skip:
+                            emit(cell_lines)
+                    elif tag == _W_BODY:
+                        break
+                    
+                    # Paragraph-level and larger elements are fully consumed
+                    if tag in (_W_P, _W_TC, _W_TBL):
+                        elem.clear()
+        
+        return "\n".join(lines).strip()
+    
+    @staticmethod
+    def _parse_docx_python_docx(file_content: bytes) -> str:
+        """Extract DOCX text via python-docx's object model (fallback)."""
+        # Lazy import: only needed when the streaming extractor fails
+        from docx import Document
+        doc = Document(io.BytesIO(file_content))
+        text = ""
+        for paragraph in doc.paragraphs:
+            text += paragraph.text + "\n"
+        
+        # Also extract text from tables
+        for table in doc.tables:
+            for row in table.rows:
+                for cell in row.cells:
+                    text += cell.text + "\n"
+        
+        return text.strip()
+    
+    @staticmethod
+    def parse_docx_with_report(file_content: bytes) -> Tuple[str, Dict[str, Any]]:
         """
         Extract text from DOCX file.
+        Uses the streaming XML extractor and falls back to python-docx.
         
         Args:
             file_content: DOCX file content as bytes
             
         Returns:
-            Extracted text as string
+            Tuple of extracted text and an extraction report
         """
         try:
-            doc = Document(io.BytesIO(file_content))
-            text = ""
-            for paragraph in doc.paragraphs:
-                text += paragraph.text + "\n"
-            
-            # Also extract text from tables
-            for table in doc.tables:
-                for row in table.rows:
-                    for cell in row.cells:
-                        text += cell.text + "\n"
-            
-            return text.strip()
+            text = DocumentParser._parse_docx_stream(file_content)
+            return text, {"engine": "docx-stream", "reason": "streaming XML parse", "quality": None}
+        except Exception as e:
+            print(f"Error parsing DOCX with streaming parser: {e}")
+            reason = f"docx-stream failed: {e}"
+        
+        try:
+            text = DocumentParser._parse_docx_python_docx(file_content)
+            return text, {"engine": "python-docx", "reason": reason, "quality": None}
         except Exception as e:
             print(f"Error parsing DOCX: {e}")
             raise Exception("Failed to parse DOCX file")
     
+    @staticmethod
+    def parse_docx(file_content: bytes) -> str:
+        """
+        Extract text from DOCX file.
+        
+        Args:
+            file_content: DOCX file content as bytes
+            
+        Returns:
+            Extracted text as string
+        """
+        text, _ = DocumentParser.parse_docx_with_report(file_content)
+        return text
+    
     @staticmethod
     def parse_txt(file_content: bytes) -> str:
         """
@@ -115,3 +324,24 @@ class DocumentParser:
             return DocumentParser.parse_txt(file_content)
         else:
             raise Exception(f"Unsupported file format: {filename}")
+    
+    @staticmethod
+    def parse_file_with_report(filename: str, file_content: bytes) -> Tuple[str, Dict[str, Any]]:
+        """
+        Parse file based on extension and report which engine produced the text.
+        
+        Args:
+            filename: Name of the file
+            file_content: File content as bytes
+            
+        Returns:
+            Tuple of extracted text and an extraction report
+        """
+        filename_lower = filename.lower()
+        if filename_lower.endswith('.pdf'):
+            return DocumentParser.parse_pdf_with_report(file_content)
+        if filename_lower.endswith('.docx'):
+            return DocumentParser.parse_docx_with_report(file_content)
+        
+        text = DocumentParser.parse_file(filename, file_content)
+        return text, {"engine": "text", "reason": "single engine for file type", "quality": None}
@@ -0,0 +1,79 @@
+"""
+Full-text resume search service.
+Ranks resumes through the MongoDB text index and builds result snippets.
+"""
+import re
+from typing import Dict, Any, List, Tuple
+
+from app.database.mongodb import ResumeDB
+from app.database.schema import SEARCH_TOKEN_PATTERN
+
+SNIPPET_CHARS = 200
+
+
+def query_terms(query: str) -> List[str]:
+    """Search words of a query, ignoring -excluded words."""
+    terms = []
+    for word in query.split():
+        if not word.startswith("-"):
+            terms.extend(SEARCH_TOKEN_PATTERN.findall(word.lower()))
+    return list(dict.fromkeys(terms))
+
+
+def make_snippet(text: str, terms: List[str], width: int = SNIPPET_CHARS) -> str:
+    """
+    Window of text around the first occurrence of any term, collapsed to one line.
+    Falls back to the start of the text when no term appears verbatim
+    (e.g. the index matched a stemmed form).
+    """
+    text = " ".join(text.split())
+    match = None
+    if terms:
+        pattern = re.compile("|".join(re.escape(term) for term in terms), re.IGNORECASE)
+        match = pattern.search(text)
+    start = max(0, match.start() - width // 3) if match else 0
+    end = min(len(text), start + width)
+
+    snippet = text[start:end]
+    if start > 0:
+        snippet = "…" + snippet
+    if end < len(text):
+        snippet += "…"
+    return snippet
+
+
+class ResumeSearch:
+    """Search resumes by free text."""
+
+    @staticmethod
+    async def search(query: str, limit: int = 20, offset: int = 0) -> Tuple[List[Dict[str, Any]], int]:
+        """
+        Run a ranked search and attach a snippet to each result.
+        Only the texts of the returned page are read and decompressed.
+
+        Args:
+            query: Free-text query
+            limit: Results per page
+            offset: Results to skip
+
+        Returns:
+            Tuple of results and the total number of matching resumes
+        """
+        resumes, total = await ResumeDB.search_resumes(query, limit, offset)
+        texts = await ResumeDB.get_resume_texts([resume["_id"] for resume in resumes])
+        terms = query_terms(query)
+
+        results = []
+        for resume in resumes:
+            parsed_data = resume.get("parsed_data") or {}
+            results.append({
+                "resume_id": resume["_id"],
+                "filename": resume.get("filename", ""),
+                "name": parsed_data.get("name"),
+                "email": parsed_data.get("email"),
+                "skills": parsed_data.get("skills") or [],
+                "status": resume.get("status", "ready"),
+                "score": round(resume.get("score", 0.0), 4),
+                "snippet": make_snippet(texts.get(resume["_id"], ""), terms)
+            })
+        return results, total
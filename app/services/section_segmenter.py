@@ -0,0 +1,123 @@
+"""
+Resume section segmentation service.
+Splits resume text into labeled sections with character offsets.
+"""
+import re
+from typing import Dict, Any, List, Optional
+
+# Canonical section names; text before the first heading is "contact"
+CONTACT = "contact"
+SUMMARY = "summary"
+EXPERIENCE = "experience"
+EDUCATION = "education"
+SKILLS = "skills"
+CERTIFICATIONS = "certifications"
+OTHER = "other"
+
+SECTION_ORDER = [CONTACT, SUMMARY, EXPERIENCE, EDUCATION, SKILLS, CERTIFICATIONS, OTHER]
+
+_HEADINGS = {
+    SUMMARY: [
+        "summary", "professional summary", "career summary", "executive summary",
+        "profile", "professional profile", "about", "about me", "objective",
+        "career objective", "overview"
+    ],
+    EXPERIENCE: [
+        "experience", "work experience", "professional experience", "employment",
+        "employment history", "work history", "career history", "relevant experience",
+        "internships", "internship experience"
+    ],
+    EDUCATION: [
+        "education", "academic background", "academics", "education and training",
+        "educational background", "academic qualifications", "qualifications"
+    ],
+    SKILLS: [
+        "skills", "technical skills", "core skills", "key skills", "core competencies",
+        "competencies", "technologies", "tech stack", "tools and technologies",
+        "skills and tools", "areas of expertise", "expertise"
+    ],
+    CERTIFICATIONS: [
+        "certifications", "certificates", "licenses", "licenses and certifications",
+        "certifications and licenses", "professional certifications", "courses"
+    ],
+    OTHER: [
+        "projects", "personal projects", "key projects", "awards", "honors",
+        "honors and awards", "achievements", "publications", "languages",
+        "interests", "hobbies", "volunteer", "volunteering", "volunteer experience",
+        "references", "activities", "extracurricular activities"
+    ],
+}
+
+_HEADING_TO_SECTION = {
+    heading: section for section, headings in _HEADINGS.items() for heading in headings
+}
+
+# A heading line: optional bullet/number, heading words, optional trailing colon
+_HEADING_PATTERN = re.compile(
+    r'^[ \t]*(?:[#*•\-\d.]+[ \t]*)?(?P<heading>[A-Za-z][A-Za-z &/]{1,40}?)[ \t]*:?[ \t]*$',
+    re.MULTILINE
+)
+
+
+class SectionSegmenter:
+    """Segment resume text into contact, summary, experience, education, skills and certifications."""
+
+    @staticmethod
+    def segment(text: str) -> List[Dict[str, Any]]:
+        """
+        Split text into sections at recognized heading lines.
+
+        Args:
+            text: Resume text
+
+        Returns:
+            List of {"name", "start", "end"} with offsets into text, in document order
+        """
+        boundaries = []  # (heading line start, body start, section name)
+        for match in _HEADING_PATTERN.finditer(text):
+            heading = " ".join(match.group("heading").lower().replace("&", "and").split())
+            section = _HEADING_TO_SECTION.get(heading)
+            if section:
+                body_start = match.end() + 1 if match.end() < len(text) else match.end()
+                boundaries.append((match.start(), body_start, section))
+
+        sections = []
+        first_heading = boundaries[0][0] if boundaries else len(text)
+        if first_heading > 0:
+            sections.append({"name": CONTACT, "start": 0, "end": first_heading})
+
+        for i, (_, body_start, section) in enumerate(boundaries):
+            end = boundaries[i + 1][0] if i + 1 < len(boundaries) else len(text)
+            if end > body_start:
+                sections.append({"name": section, "start": body_start, "end": end})
+        return sections
+
+    @staticmethod
+    def section_text(text: str, sections: Optional[List[Dict[str, Any]]], *names: str) -> str:
+        """
+        Concatenate the text of the named sections.
+
+        Returns:
+            Section text, or "" if none of the sections exist
+        """
+        if not sections:
+            return ""
+        return "\n".join(
+            text[section["start"]:section["end"]].strip()
+            for section in sections if section["name"] in names
+        )
+
+    @staticmethod
+    def labeled_text(text: str, sections: Optional[List[Dict[str, Any]]]) -> str:
+        """
+        Render text as labeled sections in canonical order, for LLM prompts.
+        Falls back to the raw text when no sections were recognized.
+        """
+        if not sections or all(section["name"] == CONTACT for section in sections):
+            return text
+        parts = []
+        for name in SECTION_ORDER:
+            body = SectionSegmenter.section_text(text, sections, name)
+            if body:
+                parts.append(f"[{name.upper()}]\n{body}")
+        return "\n\n".join(parts)
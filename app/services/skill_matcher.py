@@ -0,0 +1,263 @@
+"""
+Skill matching service.
+Finds taxonomy skills in text with a compiled Aho-Corasick automaton.
+"""
+import bisect
+import json
+import os
+import re
+from functools import lru_cache
+from typing import Dict, Any, List, Optional, Tuple
+
+from app.config import settings
+
+DEFAULT_TAXONOMY_PATH = os.path.join(os.path.dirname(os.path.dirname(__file__)), "data", "skills_taxonomy.json")
+
+# Characters that continue a token: a skill must not be preceded or followed
+# by one of these ("go" in "google", "java" in "javascript", "c" in "c++",
+# "r" in "R&D")
+_WORD_CHARS = frozenset("+#_&")
+
+# Exact-case forms are also ordinary words or letters ("Go", "R", "Spring").
+# Such a mention only counts with a context cue: a list delimiter or line
+# break next to it, or another skill within this many characters, as in
+# "Go, Rust" or "Go and Kubernetes" but not "I can Go home"
+_LIST_DELIMITERS = frozenset(",;:/|()[]•·*\n")
+_CONTEXT_WINDOW = 40
+
+_WHITESPACE = re.compile(r"\s+")
+
+
+# Upper bound on edges per node, trie plus memoized failure transitions
+_MAX_MEMOIZED_EDGES = 128
+
+
+def _is_word_char(c: str) -> bool:
+    return c.isalnum() or c in _WORD_CHARS
+
+
+def _normalize_whitespace(text: str) -> str:
+    """Whitespace runs as one space, or one line break if they contain one."""
+    return _WHITESPACE.sub(lambda run: "\n" if "\n" in run.group() else " ", text.strip())
+
+
+def _listed(text: str, start: int, end: int, as_item: bool) -> bool:
+    """
+    Whether text[start:end] is delimited like a list item. The start and
+    end of text only count if text is itself one item (as_item).
+    """
+    before = text[start - 1] if start > 0 else ""
+    if before == " ":
+        before = text[start - 2] if start > 1 else ""
+    after = text[end] if end < len(text) else ""
+    if after == " ":
+        after = text[end + 1] if end + 1 < len(text) else ""
+    if as_item and (not before or not after):
+        return True
+    return (before != "" and before in _LIST_DELIMITERS) or (after != "" and after in _LIST_DELIMITERS)
+
+
+class SkillMatcher:
+    """
+    Multi-pattern skill matcher over a skill taxonomy.
+
+    The taxonomy maps canonical skill IDs to a display name, a category and
+    aliases. All surface forms are compiled into one Aho-Corasick automaton,
+    so matching is a single pass over the text regardless of taxonomy size.
+
+    Each skill ID is also interned to an integer (its position in the
+    taxonomy), which indexes the bit in stored skill bitsets. Taxonomy files
+    are therefore append-only: add new skills at the end, never reorder.
+    """
+
+    def __init__(self, taxonomy: Dict[str, Dict[str, Any]]):
+        """
+        Compile the automaton.
+
+        Args:
+            taxonomy: {skill_id: {"name": str, "category": str,
+                       "aliases": [str], "exact_case": [str]}}
+        """
+        self.taxonomy = taxonomy
+        self.skill_ids = list(taxonomy)
+        self.index = {skill_id: i for i, skill_id in enumerate(self.skill_ids)}
+        self._synonyms = {}  # type: Dict[str, str]
+        # Trie: per-node transition dicts, failure links and outputs
+        self._goto = [{}]  # type: List[Dict[str, int]]
+        self._fail = [0]
+        self._output = [[]]  # type: List[List[Tuple[int, str, Optional[str]]]]
+
+        for skill_id, entry in taxonomy.items():
+            exact_forms = set(entry.get("exact_case", []))
+            for form in [entry["name"]] + entry.get("aliases", []):
+                normalized = " ".join(form.split())
+                if normalized:
+                    exact = normalized if normalized in exact_forms else None
+                    self._add_pattern(normalized.lower(), skill_id, exact)
+                    self._synonyms.setdefault(normalized.lower(), skill_id)
+
+        self._build_failure_links()
+
+    @classmethod
+    def from_file(cls, path: str) -> "SkillMatcher":
+        """Load a taxonomy JSON file ({"skills": {...}}) and compile it."""
+        with open(path, encoding="utf-8") as f:
+            data = json.load(f)
+        return cls(data.get("skills", data))
+
+    def _add_pattern(self, pattern: str, skill_id: str, exact: Optional[str]):
+        node = 0
+        for c in pattern:
+            next_node = self._goto[node].get(c)
+            if next_node is None:
+                next_node = len(self._goto)
+                self._goto[node][c] = next_node
+                self._goto.append({})
+                self._fail.append(0)
+                self._output.append([])
+            node = next_node
+        self._output[node].append((len(pattern), skill_id, exact))
+
+    def _build_failure_links(self):
+        queue = list(self._goto[0].values())
+        head = 0
+        while head < len(queue):
+            node = queue[head]
+            head += 1
+            for c, child in self._goto[node].items():
+                queue.append(child)
+                fallback = self._fail[node]
+                while fallback and c not in self._goto[fallback]:
+                    fallback = self._fail[fallback]
+                target = self._goto[fallback].get(c, 0)
+                self._fail[child] = target if target != child else 0
+                # Inherit matches that end at the failure target
+                self._output[child] = self._output[child] + self._output[self._fail[child]]
+
+    def _transition(self, node: int, c: str) -> int:
+        """Follow failure links for a missing edge and memoize the result."""
+        target = node
+        while target and c not in self._goto[target]:
+            target = self._fail[target]
+        next_node = self._goto[target].get(c, 0)
+        if len(self._goto[node]) < _MAX_MEMOIZED_EDGES:
+            self._goto[node][c] = next_node
+        return next_node
+
+    def find_spans(self, text: str, as_item: bool = False) -> List[Tuple[int, int, str]]:
+        """
+        Find skill mentions as non-overlapping (start, end, skill_id) spans.
+        Overlaps resolve leftmost-longest, so "react native" wins over "react".
+        Exact-case forms need a context cue (see _CONTEXT_WINDOW).
+
+        Args:
+            text: Text to search (whitespace runs are treated as one space,
+                or one line break if they contain one)
+            as_item: text is a single skill string, so its start and end
+                count as delimiters
+
+        Returns:
+            Spans over the whitespace-normalized text, in text order
+        """
+        text = _normalize_whitespace(text)
+        lowered = text.lower()
+        if len(lowered) != len(text):
+            # Rare case-mappings that change length; keep offsets aligned
+            lowered = "".join(c if len(c.lower()) != 1 else c.lower() for c in text)
+        goto, output = self._goto, self._output
+        candidates = []
+        node = 0
+        for i, c in enumerate(lowered):
+            next_node = goto[node].get(c)
+            if next_node is None:
+                next_node = self._transition(node, c)
+            node = next_node
+            if not output[node]:
+                continue
+            for length, skill_id, exact in output[node]:
+                start = i - length + 1
+                if start > 0 and _is_word_char(text[start - 1]):
+                    continue
+                if i + 1 < len(text) and _is_word_char(text[i + 1]):
+                    continue
+                if exact is not None and text[start:i + 1] != exact:
+                    continue
+                candidates.append((start, i + 1, skill_id, exact is not None))
+
+        candidates.sort(key=lambda span: (span[0], -span[1]))
+        resolved = []
+        last_end = 0
+        for candidate in candidates:
+            if candidate[0] >= last_end:
+                resolved.append(candidate)
+                last_end = candidate[1]
+
+        # Unambiguous mentions are the context for exact-case ones
+        anchor_starts = [start for start, _, _, ambiguous in resolved if not ambiguous]
+        anchor_ends = [end for _, end, _, ambiguous in resolved if not ambiguous]
+        spans = []
+        for start, end, skill_id, ambiguous in resolved:
+            if ambiguous and not _listed(text, start, end, as_item):
+                # Nearest anchor after the mention and nearest one before it
+                after = bisect.bisect_left(anchor_starts, end)
+                before = bisect.bisect_right(anchor_ends, start) - 1
+                if not (
+                    (after < len(anchor_starts) and anchor_starts[after] - end <= _CONTEXT_WINDOW)
+                    or (before >= 0 and start - anchor_ends[before] <= _CONTEXT_WINDOW)
+                ):
+                    continue
+            spans.append((start, end, skill_id))
+        return spans
+
+    def find(self, text: str, as_item: bool = False) -> List[str]:
+        """Return canonical skill IDs found in text, in order of first mention (see find_spans)."""
+        found = {}
+        for _, _, skill_id in self.find_spans(text, as_item):
+            found.setdefault(skill_id, None)
+        return list(found)
+
+    def canonicalize(self, skills: List[str]) -> List[str]:
+        """
+        Map free-text skill strings ("JS", "Javascript", "javascript ES6")
+        to canonical skill IDs. Exact synonyms are looked up directly; other
+        strings are scanned for taxonomy mentions. Unknown skills are dropped.
+        """
+        found = {}
+        for skill in skills:
+            if not isinstance(skill, str):
+                continue
+            skill_id = self._synonyms.get(" ".join(skill.lower().split()))
+            if skill_id:
+                found.setdefault(skill_id, None)
+            else:
+                for skill_id in self.find(skill, as_item=True):
+                    found.setdefault(skill_id, None)
+        return list(found)
+
+    @property
+    def bitset_size(self) -> int:
+        """Bytes needed for a bitset over the whole taxonomy."""
+        return (len(self.skill_ids) + 7) // 8
+
+    def to_bits(self, skill_ids: List[str]) -> bytes:
+        """Encode canonical skill IDs as a bitset (bit i = skill with index i)."""
+        bits = bytearray(self.bitset_size)
+        for skill_id in skill_ids:
+            i = self.index.get(skill_id)
+            if i is not None:
+                bits[i >> 3] |= 0x80 >> (i & 7)
+        return bytes(bits)
+
+    def to_document_fields(self, skill_ids: List[str]) -> Dict[str, Any]:
+        """Stored skill fields for a resume or job: canonical IDs and bitset."""
+        return {"skill_ids": skill_ids, "skill_bits": self.to_bits(skill_ids)}
+
+    def name(self, skill_id: str) -> str:
+        """Display name for a canonical skill ID."""
+        return self.taxonomy[skill_id]["name"]
+
+
+@lru_cache(maxsize=1)
+def get_skill_matcher() -> SkillMatcher:
+    """Shared matcher for the configured taxonomy, compiled on first use."""
+    return SkillMatcher.from_file(settings.skills_taxonomy_path or DEFAULT_TAXONOMY_PATH)
@@ -0,0 +1,39 @@
+"""
+Vectorized skill overlap scoring over stored skill bitsets.
+"""
+from typing import List, Tuple
+
+import numpy as np
+
+# Set-bit count for every byte value
+_POPCOUNT = np.array([bin(i).count("1") for i in range(256)], dtype=np.uint16)
+
+
+def bits_matrix(bitsets: List[bytes], width: int) -> np.ndarray:
+    """
+    Stack bitsets into an (n, width) uint8 matrix.
+    Shorter bitsets (stored before the taxonomy grew) are zero-padded.
+    """
+    matrix = np.zeros((len(bitsets), width), dtype=np.uint8)
+    for row, bits in enumerate(bitsets):
+        if bits:
+            data = np.frombuffer(bits[:width], dtype=np.uint8)
+            matrix[row, :len(data)] = data
+    return matrix
+
+
+def skill_overlap(job_bits: bytes, matrix: np.ndarray) -> Tuple[np.ndarray, int]:
+    """
+    Count the job's skills present in every resume row in one operation.
+
+    Args:
+        job_bits: Job skill bitset
+        matrix: Resume bitsets from bits_matrix
+
+    Returns:
+        Tuple of per-resume matched skill counts and the job's skill count
+    """
+    job = bits_matrix([job_bits], matrix.shape[1])[0]
+    # Signed, so callers can rank with argsort(-matched)
+    matched = _POPCOUNT[matrix & job].sum(axis=1, dtype=np.int64)
+    return matched, int(_POPCOUNT[job].sum())
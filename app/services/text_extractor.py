@@ -3,34 +3,162 @@ Text extraction and preprocessing service.
 Extracts structured information from resume text.
 """
 import re
-from typing import Dict, List, Optional
+from typing import Any, Dict, List, Optional
+
+from pydantic import BaseModel, Field
+
+from app.services.section_segmenter import (
+    SectionSegmenter, CONTACT, EDUCATION, EXPERIENCE, CERTIFICATIONS
+)
+from app.services.skill_matcher import get_skill_matcher
+
+# Precompiled patterns shared by the per-field extractors and extract_all
+EMAIL_PATTERN = re.compile(r'\b[A-Za-z0-9._%+-]+@[A-Za-z0-9.-]+\.[A-Z|a-z]{2,}\b')
+PHONE_PATTERNS = [
+    re.compile(r'\+?\d{1,3}[-.\s]?\(?\d{3}\)?[-.\s]?\d{3}[-.\s]?\d{4}'),
+    re.compile(r'\(?\d{3}\)?[-.\s]?\d{3}[-.\s]?\d{4}'),
+    re.compile(r'\d{10}'),
+]
+# Bullet or numbering at the start of a section line
+BULLET_PATTERN = re.compile(r'^[\s•*\-–·\d.)]+')
+# Weight of each heuristic signal in HeuristicResult.confidence (sums to 1)
+CONFIDENCE_WEIGHTS = {
+    "name": 0.2,
+    "email": 0.2,
+    "phone": 0.1,
+    "skills": 0.2,  # Scaled by skills found, full weight at CONFIDENT_SKILL_COUNT
+    "experience_section": 0.1,
+    "experience_years": 0.1,
+    "education": 0.1,
+}
+CONFIDENT_SKILL_COUNT = 5
+# Experience and education patterns run on lowercased text; case-insensitive
+# alternations are several times slower in the re engine
+EXPERIENCE_PATTERNS = [
+    re.compile(r'(\d+)\+?\s*years?\s+(?:of\s+)?experience'),
+    re.compile(r'experience\s*:\s*(\d+)\+?\s*years?'),
+]
+NAME_EXCLUDE_PATTERN = re.compile(r'resume|cv|curriculum|vitae|email|phone|address', re.IGNORECASE)
+EDUCATION_PATTERN = re.compile(
+    '|'.join(re.escape(keyword) for keyword in [
+        'bachelor', 'master', 'phd', 'doctorate', 'diploma', 'degree',
+        'b.tech', 'm.tech', 'b.e', 'm.e', 'bsc', 'msc', 'mba', 'bba'
+    ])
+)
+
+
+class HeuristicResult(BaseModel):
+    """Every heuristic field extracted from resume text."""
+    name: Optional[str] = None
+    email: Optional[str] = None
+    phone: Optional[str] = None
+    skills: List[str] = Field(default_factory=list)
+    skill_ids: List[str] = Field(default_factory=list)
+    experience_years: Optional[int] = None
+    education: List[str] = Field(default_factory=list)
+    certifications: List[str] = Field(default_factory=list)
+    sections: List[Dict[str, Any]] = Field(default_factory=list)
+    confidence: float = 0.0
+    
+    def to_parsed_data(self) -> Dict[str, Any]:
+        """parsed_data document fields served when the LLM is not needed."""
+        return {
+            "name": self.name,
+            "email": self.email,
+            "phone": self.phone,
+            "skills": self.skills,
+            "education": [{"degree": line} for line in self.education],
+            "certifications": self.certifications,
+            "total_experience_years": self.experience_years or 0
+        }
+
 
 class TextExtractor:
     """Extract structured data from resume text."""
     
+    @staticmethod
+    def extract_all(text: str, sections: Optional[List[Dict[str, Any]]] = None) -> HeuristicResult:
+        """
+        Extract every heuristic field with one scan per precompiled pattern.
+        The text is lowercased once and only the first 5 lines are split.
+        
+        Args:
+            text: Resume text
+            sections: Stored segmentation of text; computed here when omitted
+        """
+        if sections is None:
+            sections = SectionSegmenter.segment(text)
+        lowered = text.lower()
+        contact = SectionSegmenter.section_text(text, sections, CONTACT)
+        education = SectionSegmenter.section_text(text, sections, EDUCATION)
+        result = HeuristicResult(
+            email=TextExtractor.extract_email(contact) or TextExtractor.extract_email(text),
+            phone=TextExtractor.extract_phone(contact) or TextExtractor.extract_phone(text),
+            experience_years=TextExtractor._experience_years(lowered),
+            sections=sections
+        )
+        if education:
+            result.education = TextExtractor._education_lines(education, education.lower())
+        else:
+            result.education = TextExtractor._education_lines(text, lowered)
+        
+        # The name sits in the header block when one was recognized
+        for line in (contact or text).split('\n', 5)[:5]:
+            line = line.strip()
+            if line and TextExtractor._is_name_line(line):
+                result.name = line
+                break
+        
+        certifications = SectionSegmenter.section_text(text, sections, CERTIFICATIONS)
+        for line in certifications.split('\n'):
+            line = BULLET_PATTERN.sub('', line).strip()
+            if line:
+                result.certifications.append(line)
+        
+        matcher = get_skill_matcher()
+        result.skill_ids = matcher.find(text)
+        result.skills = [matcher.name(skill_id) for skill_id in result.skill_ids]
+        result.confidence = TextExtractor.confidence(result)
+        return result
+    
+    @staticmethod
+    def confidence(result: HeuristicResult) -> float:
+        """
+        How completely the heuristics covered the resume, from 0 to 1.
+        Used to decide whether LLM extraction is worth calling.
+        """
+        has_experience = any(section["name"] == EXPERIENCE for section in result.sections)
+        signals = {
+            "name": 1.0 if result.name else 0.0,
+            "email": 1.0 if result.email else 0.0,
+            "phone": 1.0 if result.phone else 0.0,
+            "skills": min(len(result.skill_ids), CONFIDENT_SKILL_COUNT) / CONFIDENT_SKILL_COUNT,
+            "experience_section": 1.0 if has_experience else 0.0,
+            "experience_years": 1.0 if result.experience_years else 0.0,
+            "education": 1.0 if result.education else 0.0,
+        }
+        return round(sum(CONFIDENCE_WEIGHTS[key] * value for key, value in signals.items()), 3)
+    
     @staticmethod
     def extract_email(text: str) -> Optional[str]:
         """Extract email address from text."""
-        email_pattern = r'\b[A-Za-z0-9._%+-]+@[A-Za-z0-9.-]+\.[A-Z|a-z]{2,}\b'
-        match = re.search(email_pattern, text)
+        match = EMAIL_PATTERN.search(text)
         return match.group(0) if match else None
     
     @staticmethod
     def extract_phone(text: str) -> Optional[str]:
         """Extract phone number from text."""
-        # Match various phone formats
-        phone_patterns = [
-            r'\+?\d{1,3}[-.\s]?\(?\d{3}\)?[-.\s]?\d{3}[-.\s]?\d{4}',
-            r'\(?\d{3}\)?[-.\s]?\d{3}[-.\s]?\d{4}',
-            r'\d{10}',
-        ]
-        
-        for pattern in phone_patterns:
-            match = re.search(pattern, text)
+        for pattern in PHONE_PATTERNS:
+            match = pattern.search(text)
             if match:
                 return match.group(0)
         return None
     
+    @staticmethod
+    def _is_name_line(line: str) -> bool:
+        """Name is usually 2-4 capitalized words without resume keywords."""
+        return len(line.split()) <= 4 and line[0].isupper() and not NAME_EXCLUDE_PATTERN.search(line)
+    
     @staticmethod
     def extract_name(text: str) -> Optional[str]:
         """
@@ -40,73 +168,62 @@ class TextExtractor:
         lines = text.split('\n')
         for line in lines[:5]:  # Check first 5 lines
             line = line.strip()
-            # Name is usually 2-4 words, capitalized
-            if line and len(line.split()) <= 4 and line[0].isupper():
-                # Avoid lines with common keywords
-                keywords = ['resume', 'cv', 'curriculum', 'vitae', 'email', 'phone', 'address']
-                if not any(keyword in line.lower() for keyword in keywords):
-                    return line
+            if line and TextExtractor._is_name_line(line):
+                return line
         return None
     
     @staticmethod
     def extract_skills_basic(text: str) -> List[str]:
         """
-        Basic skill extraction using keyword matching.
+        Basic skill extraction using the skill taxonomy.
         This will be enhanced by LLM extraction.
         """
-        # Common technical skills
-        skill_keywords = [
-            'python', 'java', 'javascript', 'typescript', 'react', 'angular', 'vue',
-            'node.js', 'express', 'django', 'flask', 'fastapi', 'sql', 'mongodb',
-            'postgresql', 'mysql', 'aws', 'azure', 'gcp', 'docker', 'kubernetes',
-            'git', 'ci/cd', 'machine learning', 'deep learning', 'nlp', 'data analysis',
-            'html', 'css', 'rest api', 'graphql', 'microservices', 'agile', 'scrum'
-        ]
-        
-        text_lower = text.lower()
-        found_skills = []
-        
-        for skill in skill_keywords:
-            if skill in text_lower:
-                found_skills.append(skill.title())
-        
-        return list(set(found_skills))  # Remove duplicates
+        matcher = get_skill_matcher()
+        return [matcher.name(skill_id) for skill_id in matcher.find(text)]
     
     @staticmethod
-    def extract_experience_years(text: str) -> Optional[int]:
-        """Extract years of experience from text."""
-        # Look for patterns like "5 years", "5+ years", etc.
-        patterns = [
-            r'(\d+)\+?\s*years?\s+(?:of\s+)?experience',
-            r'experience\s*:\s*(\d+)\+?\s*years?',
-        ]
-        
-        for pattern in patterns:
-            match = re.search(pattern, text.lower())
+    def _experience_years(lowered: str) -> Optional[int]:
+        """Years of experience from already-lowercased text."""
+        for pattern in EXPERIENCE_PATTERNS:
+            match = pattern.search(lowered)
             if match:
                 return int(match.group(1))
         return None
     
     @staticmethod
-    def extract_education_keywords(text: str) -> List[str]:
-        """Extract education-related information."""
-        education_keywords = [
-            'bachelor', 'master', 'phd', 'doctorate', 'diploma', 'degree',
-            'b.tech', 'm.tech', 'b.e', 'm.e', 'bsc', 'msc', 'mba', 'bba'
-        ]
-        
-        text_lower = text.lower()
+    def extract_experience_years(text: str) -> Optional[int]:
+        """Extract years of experience from text."""
+        # Look for patterns like "5 years", "5+ years", etc.
+        return TextExtractor._experience_years(text.lower())
+    
+    @staticmethod
+    def _education_lines(text: str, lowered: str) -> List[str]:
+        """Up to 5 lines of text containing an education keyword."""
         found_education = []
-        
-        lines = text.split('\n')
-        for line in lines:
-            line_lower = line.lower()
-            for keyword in education_keywords:
-                if keyword in line_lower:
+        if len(lowered) != len(text):
+            # Lowercasing changed offsets; fall back to a per-line scan
+            for line in text.split('\n'):
+                if EDUCATION_PATTERN.search(line.lower()):
                     found_education.append(line.strip())
-                    break
+            return found_education[:5]
         
-        return found_education[:5]  # Limit to 5 entries
+        line_end = -1
+        for match in EDUCATION_PATTERN.finditer(lowered):
+            if match.start() <= line_end:
+                continue  # Line already taken
+            line_start = text.rfind('\n', 0, match.start()) + 1
+            line_end = text.find('\n', match.end())
+            if line_end == -1:
+                line_end = len(text)
+            found_education.append(text[line_start:line_end].strip())
+            if len(found_education) == 5:  # Limit to 5 entries
+                break
+        return found_education
+    
+    @staticmethod
+    def extract_education_keywords(text: str) -> List[str]:
+        """Extract education-related information."""
+        return TextExtractor._education_lines(text, text.lower())
     
     @staticmethod
     def clean_text(text: str) -> str:
@@ -7,6 +7,7 @@ import re
 import os
 from typing import Optional
 from app.config import settings
+from app.services.text_extractor import TextExtractor
 
 
 def validate_file_type(filename: str) -> bool:
@@ -71,9 +72,7 @@ def extract_email(text: str) -> Optional[str]:
     Returns:
         First email found or None
     """
-    email_pattern = r'\b[A-Za-z0-9._%+-]+@[A-Za-z0-9.-]+\.[A-Z|a-z]{2,}\b'
-    match = re.search(email_pattern, text)
-    return match.group(0) if match else None
+    return TextExtractor.extract_email(text)
 
 
 def extract_phone(text: str) -> Optional[str]:
@@ -86,19 +85,7 @@ def extract_phone(text: str) -> Optional[str]:
     Returns:
         First phone number found or None
     """
-    # Pattern for various phone formats
-    phone_patterns = [
-        r'\+?\d{1,3}[-.\s]?\(?\d{3}\)?[-.\s]?\d{3}[-.\s]?\d{4}',  # +1-234-567-8900
-        r'\(?\d{3}\)?[-.\s]?\d{3}[-.\s]?\d{4}',  # (234) 567-8900
-        r'\d{10}',  # 2345678900
-    ]
-    
-    for pattern in phone_patterns:
-        match = re.search(pattern, text)
-        if match:
-            return match.group(0)
-    
-    return None
+    return TextExtractor.extract_phone(text)
 
 
 def clean_text(text: str) -> str:
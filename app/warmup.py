@@ -0,0 +1,62 @@
+"""
+Per-worker warmup.
+Runs in every server process from the lifespan, after the database client
+is created in that process, so first requests do not pay for connection
+setup or for building shared lookup structures.
+"""
+import asyncio
+import os
+import time
+from typing import Optional
+
+from app.config import settings
+from app.database.mongodb import MongoDB
+from app.services.llm_service_enhanced import load_enhanced_llm_service
+from app.services.skill_matcher import get_skill_matcher
+from app.services.text_extractor import TextExtractor
+
+# Hot collections touched concurrently so the pool opens one connection each
+WARM_COLLECTIONS = ("resumes", "jobs", "matches", "versions")
+WARM_TEXT = "Jane Doe\njane@example.com\n+1 555 0100\n\nSkills\nPython, FastAPI, MongoDB\n"
+
+# Background LLM service build; referenced so the task is not garbage collected
+_llm_preload: Optional[asyncio.Task] = None
+
+
+async def warm_up() -> float:
+    """
+    Open pooled connections and build per-process lookup structures.
+
+    Returns:
+        Warmup time in milliseconds
+    """
+    start = time.perf_counter()
+    await asyncio.gather(*(
+        MongoDB.get_collection(name).estimated_document_count() for name in WARM_COLLECTIONS
+    ))
+    get_skill_matcher()
+    TextExtractor.extract_all(WARM_TEXT)
+    elapsed_ms = (time.perf_counter() - start) * 1000
+    print(f"🔥 Worker {os.getpid()} warmed up in {elapsed_ms:.0f} ms ({settings.storage_backend})")
+    if settings.llm_preload:
+        start_llm_preload()
+    return elapsed_ms
+
+
+def start_llm_preload():
+    """
+    Build the LLM service in a worker thread without delaying readiness.
+    Requests that need it before it is done wait for the same build.
+    """
+    global _llm_preload
+
+    async def preload():
+        start = time.perf_counter()
+        try:
+            await load_enhanced_llm_service()
+            print(f"🤖 Worker {os.getpid()} loaded the LLM service in {(time.perf_counter() - start) * 1000:.0f} ms")
+        except Exception as e:
+            print(f"⚠️  LLM service preload failed (retried on first use): {e}")
+
+    if _llm_preload is None:
+        _llm_preload = asyncio.create_task(preload())
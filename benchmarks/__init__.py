@@ -0,0 +1,4 @@
+"""
+Benchmarks Package
+Performance benchmarks, run with: python -m benchmarks.<name>
+"""
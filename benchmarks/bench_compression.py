@@ -0,0 +1,89 @@
+"""
+Benchmark: body bytes transferred for a dashboard load (index.html, its CSS and
+JS, and the first resume and job pages) without compression, with gzip or
+brotli, and on a repeat visit with cached fingerprinted assets and ETags.
+Runs the app in-process on the memory backend; CDN assets are not counted.
+
+Usage:
+    python -m benchmarks.bench_compression
+"""
+import os
+import re
+import time
+
+os.environ["STORAGE_BACKEND"] = "memory"
+
+from fastapi.testclient import TestClient  # noqa: E402
+
+from app.api.compression import available_encodings  # noqa: E402
+from app.database import ResumeDB, JobDB  # noqa: E402
+from app.main import app  # noqa: E402
+from benchmarks.bench_storage_backends import make_resumes  # noqa: E402
+
+RESUMES = 200
+JOBS = 50
+LOCAL_ASSET_PATTERN = re.compile(r'(?:href|src)="((?:css|js)/[^"]+)"')
+
+
+def wire_bytes(response) -> int:
+    return int(response.headers.get("content-length", len(response.content)))
+
+
+def dashboard_load(client: TestClient, accept_encoding: str, cache: dict) -> int:
+    """Fetch what a dashboard load fetches; cache holds ETags and loaded URLs of a previous visit."""
+    total = 0
+
+    def get(url: str):
+        nonlocal total
+        headers = {"Accept-Encoding": accept_encoding}
+        if url in cache:
+            headers["If-None-Match"] = cache[url]
+        response = client.get(url, headers=headers)
+        total += wire_bytes(response)
+        if "etag" in response.headers:
+            cache[url] = response.headers["etag"]
+        return response
+
+    index = get("/")
+    for asset in LOCAL_ASSET_PATTERN.findall(index.text or ""):
+        url = f"/{asset}"
+        if url in cache and "immutable" in cache.get(f"{url}#cache-control", ""):
+            continue  # Served from the browser cache without a request
+        response = get(url)
+        cache[f"{url}#cache-control"] = response.headers.get("cache-control", "")
+    get("/api/resumes?limit=50")
+    get("/api/jobs?limit=50")
+    return total
+
+
+def main():
+    with TestClient(app) as client:
+        async def seed():
+            await ResumeDB.create_resumes(make_resumes(RESUMES))
+            for i in range(JOBS):
+                await JobDB.create_job({
+                    "title": f"Backend Engineer {i}",
+                    "description": "We are hiring a backend engineer with Python, FastAPI and MongoDB experience. " * 4,
+                    "requirements": ["Required Skills: Python, FastAPI, MongoDB"]
+                })
+        client.portal.call(seed)
+
+        print(f"{'scenario':>28}{'body bytes':>12}{'vs identity':>13}")
+        baseline = None
+        for label, accept_encoding in [("identity", "identity")] + [
+            (encoding, encoding) for encoding in reversed(available_encodings())
+        ]:
+            start = time.perf_counter()
+            first = dashboard_load(client, accept_encoding, {})
+            elapsed = (time.perf_counter() - start) * 1000
+            baseline = baseline or first
+            print(f"{'first load, ' + label:>28}{first:>12}{first / baseline:>12.0%}  ({elapsed:.0f} ms)")
+
+        cache = {}
+        dashboard_load(client, available_encodings()[0], cache)
+        repeat = dashboard_load(client, available_encodings()[0], cache)
+        print(f"{'repeat load, ' + available_encodings()[0]:>28}{repeat:>12}{repeat / baseline:>12.0%}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,51 @@
+"""
+Benchmark: streaming DOCX extractor vs python-docx on tabular resumes.
+
+Usage:
+    python -m benchmarks.bench_docx_parser
+"""
+import io
+
+from docx import Document
+
+from app.services.pdf_parser import DocumentParser
+from benchmarks.common import load_test_texts, timeit
+
+
+def make_tabular_docx(text: str, rows: int) -> bytes:
+    """Build a resume with body paragraphs and a large table with merged cells."""
+    doc = Document()
+    for line in text.splitlines():
+        doc.add_paragraph(line)
+
+    table = doc.add_table(rows=rows, cols=4)
+    for r, row in enumerate(table.rows):
+        for c, cell in enumerate(row.cells):
+            cell.text = f"Skill {r}.{c} - Python, FastAPI, MongoDB"
+    # Merge a header across the row and every second cell down the first column
+    table.cell(0, 0).merge(table.cell(0, 3))
+    for r in range(1, rows - 1, 2):
+        table.cell(r, 0).merge(table.cell(r + 1, 0))
+
+    buffer = io.BytesIO()
+    doc.save(buffer)
+    return buffer.getvalue()
+
+
+def main():
+    text = load_test_texts()[-1]
+    print(f"{'table rows':>10}{'python-docx ms':>16}{'stream ms':>11}{'speedup':>9}{'lines':>13}")
+    for rows in (20, 200, 1000):
+        docx = make_tabular_docx(text, rows)
+        legacy_ms = timeit(lambda: DocumentParser._parse_docx_python_docx(docx), repeat=3)
+        stream_ms = timeit(lambda: DocumentParser._parse_docx_stream(docx), repeat=3)
+        legacy_lines = len(DocumentParser._parse_docx_python_docx(docx).splitlines())
+        stream_lines = len(DocumentParser._parse_docx_stream(docx).splitlines())
+        print(
+            f"{rows:>10}{legacy_ms:>16.1f}{stream_ms:>11.1f}{legacy_ms / stream_ms:>8.1f}x"
+            f"{f'{legacy_lines}->{stream_lines}':>13}"
+        )
+
+
+if __name__ == "__main__":
+    main()
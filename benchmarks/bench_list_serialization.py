@@ -0,0 +1,80 @@
+"""
+Benchmark: list and match response serialization through response_model
+validation and the stdlib encoder (FastAPI's default path) vs the trusted
+path for normalized documents, with the stdlib encoder and with orjson.
+Times are microseconds per item.
+
+Usage:
+    python -m benchmarks.bench_list_serialization
+"""
+import json
+
+import orjson
+from pydantic import TypeAdapter
+
+from app.api.schemas import ResumeListResponse, JobListResponse, MatchListResponse
+from app.api.serialization import trusted_dump
+from app.database.schema import stamp_new
+from app.services.text_extractor import TextExtractor
+from benchmarks.common import load_test_texts, timeit
+
+COUNTS = (1_000, 10_000)
+
+
+def make_payloads(count: int):
+    """(name, response model, content) as the list and match endpoints build them."""
+    parsed = [TextExtractor.extract_all(text).to_parsed_data() for text in load_test_texts()]
+    resumes = []
+    for i in range(count):
+        p = stamp_new("resumes", {"parsed_data": dict(parsed[i % len(parsed)])})["parsed_data"]
+        resumes.append({
+            "_id": f"{i:024x}", "filename": f"resume_{i}.pdf", "upload_date": "2024-01-01T00:00:00+00:00",
+            "status": "ready", "file_type": "pdf", "file_size": 48_213,
+            "parsed_data": {"name": p.get("name"), "email": p.get("email"), "phone": p.get("phone"), "skills": p["skills"]}
+        })
+    jobs = [
+        {"_id": f"{i:024x}", "title": f"Job {i}", "created_date": "2024-01-01T00:00:00+00:00",
+         "description_preview": "We are looking for a backend engineer with Python and MongoDB experience " * 2}
+        for i in range(count)
+    ]
+    matches = [
+        {"_id": f"{i:024x}", "resume_id": f"{i:024x}", "job_id": "0" * 24, "candidate_name": f"Candidate {i}",
+         "score": (i % 101) / 10, "recommendation": "Consider", "confidence_level": 0.8,
+         "score_breakdown": {"skills_score": 3.2, "experience_score": 2.1}, "skills_analysis": {"matching_skills": ["Python"]},
+         "matching_points": ["5 years of Python", "Led a team of 4"], "missing_qualifications": ["Kubernetes"],
+         "strengths": ["Backend depth"], "concerns": [], "justification": "Strong backend match with minor gaps. " * 3,
+         "interviewer_notes": None, "resume_filename": f"resume_{i}.pdf", "job_title": "Backend Engineer",
+         "timestamp": "2024-01-01T00:00:00+00:00"}
+        for i in range(count)
+    ]
+    return [
+        ("resumes", ResumeListResponse, {"resumes": resumes, "total": count, "next_cursor": None}),
+        ("jobs", JobListResponse, {"jobs": jobs, "total": count, "next_cursor": None}),
+        ("matches", MatchListResponse, {"matches": matches, "total": count, "job_id": "0" * 24, "job_title": "Backend Engineer"}),
+    ]
+
+
+def main():
+    print(f"{'items':>7}{'list':>9}{'validated+json':>16}{'trusted+json':>14}{'trusted+orjson':>16}{'speedup':>9}")
+    for count in COUNTS:
+        for name, model, content in make_payloads(count):
+            adapter = TypeAdapter(model)
+
+            def validated():
+                value = adapter.dump_python(adapter.validate_python(content), mode="json", by_alias=True)
+                return json.dumps(value, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+
+            def trusted_json():
+                return json.dumps(trusted_dump(model, content), ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+
+            def trusted_orjson():
+                return orjson.dumps(trusted_dump(model, content))
+
+            assert json.loads(validated()) == json.loads(trusted_orjson())
+            timings = [timeit(func, repeat=5) * 1000 / count for func in (validated, trusted_json, trusted_orjson)]
+            print(f"{count:>7}{name:>9}{timings[0]:>16.2f}{timings[1]:>14.2f}{timings[2]:>16.2f}"
+                  f"{timings[0] / timings[2]:>8.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,28 @@
+"""
+Benchmark: adaptive PDF engine selection vs always-pdfplumber.
+
+Usage:
+    python -m benchmarks.bench_pdf_parser
+"""
+from app.services.pdf_parser import DocumentParser
+from benchmarks.common import load_test_texts, make_pdf, timeit
+
+
+def main():
+    print(f"{'document':<12}{'pages':>6}{'pdfplumber ms':>15}{'adaptive ms':>13}{'speedup':>9}  engine")
+    for index, text in enumerate(load_test_texts()):
+        # Repeat the sample so multi-page documents are represented too
+        for copies in (1, 4):
+            pdf = make_pdf("\n".join([text] * copies))
+            plumber_ms = timeit(lambda: DocumentParser._parse_pdf_pdfplumber(pdf), repeat=5)
+            adaptive_ms = timeit(lambda: DocumentParser.parse_pdf_with_report(pdf), repeat=5)
+            _, report = DocumentParser.parse_pdf_with_report(pdf)
+            pages = pdf.count(b"/Type /Page ")
+            print(
+                f"{f'sample{index}x{copies}':<12}{pages:>6}{plumber_ms:>15.1f}{adaptive_ms:>13.1f}"
+                f"{plumber_ms / adaptive_ms:>8.1f}x  {report['engine']} ({report['reason']})"
+            )
+
+
+if __name__ == "__main__":
+    main()
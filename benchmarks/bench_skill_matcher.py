@@ -0,0 +1,47 @@
+"""
+Benchmark: Aho-Corasick skill matcher vs per-keyword substring checks.
+Shows matcher time tracking text length, not taxonomy size.
+
+Usage:
+    python -m benchmarks.bench_skill_matcher
+"""
+import random
+import string
+
+from app.services.skill_matcher import SkillMatcher, get_skill_matcher
+from benchmarks.common import load_test_texts, timeit
+
+
+def synthetic_taxonomy(size: int, seed: int = 7) -> dict:
+    """Bundled taxonomy padded with random multi-word skills up to size entries."""
+    taxonomy = dict(get_skill_matcher().taxonomy)
+    rng = random.Random(seed)
+    while len(taxonomy) < size:
+        words = ["".join(rng.choices(string.ascii_lowercase, k=rng.randint(3, 9))) for _ in range(rng.randint(1, 3))]
+        name = " ".join(words)
+        taxonomy[name.replace(" ", "-")] = {"name": name, "aliases": [name + " framework"]}
+    return taxonomy
+
+
+def naive_find(forms: list, text: str) -> list:
+    """The previous approach: one substring check per surface form."""
+    text_lower = text.lower()
+    return [form for form in forms if form in text_lower]
+
+
+def main():
+    base_text = "\n".join(load_test_texts())
+    print(f"{'taxonomy':>9}{'text KB':>9}{'automaton ms':>14}{'naive ms':>10}")
+    for size in (250, 2_000, 10_000, 50_000):
+        taxonomy = synthetic_taxonomy(size)
+        matcher = SkillMatcher(taxonomy)
+        forms = [f.lower() for entry in taxonomy.values() for f in [entry["name"]] + entry.get("aliases", [])]
+        for copies in (1, 8, 32):
+            text = "\n".join([base_text] * copies)
+            automaton_ms = timeit(lambda: matcher.find(text), repeat=3)
+            naive_ms = timeit(lambda: naive_find(forms, text), repeat=3)
+            print(f"{size:>9}{len(text) / 1024:>9.1f}{automaton_ms:>14.2f}{naive_ms:>10.2f}")
+
+
+if __name__ == "__main__":
+    main()
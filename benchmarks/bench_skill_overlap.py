@@ -0,0 +1,36 @@
+"""
+Benchmark: vectorized bitset skill overlap vs per-pair string comparison.
+
+Usage:
+    python -m benchmarks.bench_skill_overlap
+"""
+import random
+
+from app.services.skill_matcher import get_skill_matcher
+from app.services.skill_overlap import bits_matrix, skill_overlap
+from benchmarks.common import timeit
+
+
+def main():
+    matcher = get_skill_matcher()
+    rng = random.Random(7)
+    job_ids = rng.sample(matcher.skill_ids, 12)
+    job_bits = matcher.to_bits(job_ids)
+    job_names = {matcher.name(skill_id).lower() for skill_id in job_ids}
+
+    print(f"{'resumes':>9}{'string sets ms':>16}{'bitset ms':>11}{'speedup':>9}")
+    for count in (1_000, 10_000, 100_000):
+        resume_ids = [rng.sample(matcher.skill_ids, rng.randint(5, 30)) for _ in range(count)]
+        resume_names = [[matcher.name(skill_id) for skill_id in ids] for ids in resume_ids]
+        matrix = bits_matrix([matcher.to_bits(ids) for ids in resume_ids], matcher.bitset_size)
+
+        strings_ms = timeit(
+            lambda: [len(job_names & {name.lower() for name in names}) for names in resume_names],
+            repeat=3
+        )
+        bitset_ms = timeit(lambda: skill_overlap(job_bits, matrix), repeat=3)
+        print(f"{count:>9}{strings_ms:>16.1f}{bitset_ms:>11.2f}{strings_ms / bitset_ms:>8.0f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,58 @@
+"""
+Benchmark: cold-start import time and peak RSS of the application, as
+started (LLM services and fallback parsers load on first use) and with both
+LLM services built at import time, as every process used to do. Each sample
+is a fresh interpreter.
+
+Usage:
+    python -m benchmarks.bench_startup
+"""
+import os
+import statistics
+import subprocess
+import sys
+
+RUNS = 5
+HEAVY_MODULES = ("langchain_core", "langchain_google_genai", "pdfplumber", "docx")
+
+SCENARIOS = {
+    "lazy (current)": "import app.main",
+    "eager LLM services": (
+        "import app.main\n"
+        "from app.services.llm_service_enhanced import get_enhanced_llm_service\n"
+        "from app.services.llm_service import get_llm_service\n"
+        "get_enhanced_llm_service(); get_llm_service()"
+    ),
+}
+
+PROBE = """
+import resource, sys, time
+start = time.perf_counter()
+exec({code!r})
+elapsed = (time.perf_counter() - start) * 1000
+heavy = sum(name in sys.modules for name in {heavy!r})
+print(elapsed, resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024, heavy)
+"""
+
+
+def sample(code: str):
+    env = {**os.environ, "GEMINI_API_KEY": os.environ.get("GEMINI_API_KEY") or "benchmark"}
+    output = subprocess.run(
+        [sys.executable, "-c", PROBE.format(code=code, heavy=HEAVY_MODULES)],
+        env=env, capture_output=True, text=True, check=True
+    ).stdout.strip().splitlines()[-1]
+    elapsed, rss, heavy = output.split()
+    return float(elapsed), float(rss), int(heavy)
+
+
+def main():
+    print(f"{'scenario':>20}{'import ms':>11}{'peak RSS MB':>13}{'heavy modules':>15}")
+    for label, code in SCENARIOS.items():
+        samples = [sample(code) for _ in range(RUNS)]
+        print(f"{label:>20}{statistics.median(s[0] for s in samples):>11.0f}"
+              f"{statistics.median(s[1] for s in samples):>13.0f}"
+              f"{samples[0][2]:>10}/{len(HEAVY_MODULES)}")
+
+
+if __name__ == "__main__":
+    main()
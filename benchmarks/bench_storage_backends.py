@@ -0,0 +1,122 @@
+"""
+Benchmark: the embedded memory backend vs MongoDB on the same DB-layer workload
+(bulk insert, keyset paging, single reads, text search, match upserts, analytics).
+MongoDB is measured only when MONGODB_URL is reachable.
+
+Usage:
+    python -m benchmarks.bench_storage_backends
+"""
+import asyncio
+import time
+from typing import Any, Dict, List
+
+from app.config import settings
+from app.database import MongoDB, ResumeDB, MatchDB, AnalyticsDB, entity_cache, ensure_indexes
+from app.services.skill_matcher import get_skill_matcher
+from app.services.text_extractor import TextExtractor
+from benchmarks.common import load_test_texts
+
+BENCH_DB_NAME = "resume_screener_bench"
+COUNTS = (1_000, 10_000)
+
+
+def make_resumes(count: int) -> List[Dict[str, Any]]:
+    """Resume documents shaped like ingest output, cycling through test_data."""
+    texts = load_test_texts()
+    matcher = get_skill_matcher()
+    templates = []
+    for text in texts:
+        heuristics = TextExtractor.extract_all(text)
+        templates.append({
+            "text_content": text,
+            "parsed_data": heuristics.to_parsed_data(),
+            "status": "ready",
+            **matcher.to_document_fields(heuristics.skill_ids)
+        })
+    return [
+        {**templates[i % len(templates)], "filename": f"resume_{i}.txt", "content_hash": f"hash_{i}"}
+        for i in range(count)
+    ]
+
+
+async def timed(results: Dict[str, float], name: str, coroutine):
+    start = time.perf_counter()
+    value = await coroutine
+    results[name] = (time.perf_counter() - start) * 1000
+    return value
+
+
+async def run_workload(count: int) -> Dict[str, float]:
+    """Time each step on a freshly emptied database."""
+    for name in ("resumes", "resume_texts", "matches"):
+        await MongoDB.get_collection(name).delete_many({})
+    await ensure_indexes()
+    entity_cache.clear()
+    entity_cache.max_entries = 0  # Measure the backend, not the cache
+
+    results = {}
+    created = await timed(results, "create_resumes", ResumeDB.create_resumes(make_resumes(count)))
+    resume_ids = created["inserted_ids"]
+
+    async def page_through():
+        cursor = None
+        while True:
+            _, cursor = await ResumeDB.get_resumes_page(50, cursor)
+            if not cursor:
+                break
+
+    async def read_some():
+        for resume_id in resume_ids[:200]:
+            await ResumeDB.get_resume(resume_id)
+
+    matches = [
+        {"job_id": "bench_job", "job_title": "Bench", "resume_id": resume_id,
+         "score": (i % 101) / 10, "recommendation": "Consider",
+         "missing_qualifications": ["Kubernetes"] if i % 3 else []}
+        for i, resume_id in enumerate(resume_ids)
+    ]
+
+    await timed(results, "page_through_all", page_through())
+    await timed(results, "get_resume x200", read_some())
+    await timed(results, "search_resumes", ResumeDB.search_resumes("python developer", 20))
+    await timed(results, "upsert_matches", MatchDB.upsert_matches(matches))
+    await timed(results, "score_histogram", AnalyticsDB.score_histogram("bench_job"))
+    await timed(results, "top_missing_quals", AnalyticsDB.top_missing_qualifications("bench_job"))
+    await timed(results, "skill_frequency", AnalyticsDB.skill_frequency())
+    return results
+
+
+async def measure(backend: str) -> Dict[int, Dict[str, float]]:
+    settings.storage_backend = backend
+    settings.memory_storage_path = ""
+    settings.mongodb_db_name = BENCH_DB_NAME
+    settings.mongodb_server_selection_timeout_ms = 2000
+    try:
+        await MongoDB.connect_db()
+    except Exception:
+        return {}
+    try:
+        return {count: await run_workload(count) for count in COUNTS}
+    finally:
+        if backend == "mongodb":
+            await MongoDB.client.drop_database(BENCH_DB_NAME)
+        await MongoDB.close_db()
+
+
+async def main():
+    backends = {backend: await measure(backend) for backend in ("memory", "mongodb")}
+    if not backends["mongodb"]:
+        print("MongoDB not reachable; reporting the memory backend only\n")
+
+    for count in COUNTS:
+        print(f"{count} resumes")
+        print(f"{'step':>20}{'memory ms':>12}{'mongodb ms':>13}")
+        for step, memory_ms in backends["memory"][count].items():
+            mongo_ms = backends["mongodb"].get(count, {}).get(step)
+            mongo_column = f"{mongo_ms:>13.1f}" if mongo_ms is not None else f"{'-':>13}"
+            print(f"{step:>20}{memory_ms:>12.1f}{mongo_column}")
+        print()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,85 @@
+"""
+Benchmark: single-pass TextExtractor.extract_all vs the previous per-field calls.
+
+Usage:
+    python -m benchmarks.bench_text_extractor
+"""
+import re
+
+from app.services.text_extractor import TextExtractor
+from benchmarks.common import load_test_texts, timeit
+
+
+def legacy_per_field(text: str):
+    """
+    The upload path before extract_all: uncompiled patterns, one pass (and
+    one lower()/split()) per field. Skills use the current matcher so both
+    sides do the same skill work.
+    """
+    lines = text.split('\n')
+    name = None
+    for line in lines[:5]:
+        line = line.strip()
+        if line and len(line.split()) <= 4 and line[0].isupper():
+            keywords = ['resume', 'cv', 'curriculum', 'vitae', 'email', 'phone', 'address']
+            if not any(keyword in line.lower() for keyword in keywords):
+                name = line
+                break
+
+    match = re.search(r'\b[A-Za-z0-9._%+-]+@[A-Za-z0-9.-]+\.[A-Z|a-z]{2,}\b', text)
+    email = match.group(0) if match else None
+
+    phone = None
+    for pattern in [
+        r'\+?\d{1,3}[-.\s]?\(?\d{3}\)?[-.\s]?\d{3}[-.\s]?\d{4}',
+        r'\(?\d{3}\)?[-.\s]?\d{3}[-.\s]?\d{4}',
+        r'\d{10}',
+    ]:
+        match = re.search(pattern, text)
+        if match:
+            phone = match.group(0)
+            break
+
+    experience = None
+    for pattern in [
+        r'(\d+)\+?\s*years?\s+(?:of\s+)?experience',
+        r'experience\s*:\s*(\d+)\+?\s*years?',
+    ]:
+        match = re.search(pattern, text.lower())
+        if match:
+            experience = int(match.group(1))
+            break
+
+    education_keywords = [
+        'bachelor', 'master', 'phd', 'doctorate', 'diploma', 'degree',
+        'b.tech', 'm.tech', 'b.e', 'm.e', 'bsc', 'msc', 'mba', 'bba'
+    ]
+    education = []
+    for line in text.split('\n'):
+        line_lower = line.lower()
+        for keyword in education_keywords:
+            if keyword in line_lower:
+                education.append(line.strip())
+                break
+
+    skills = TextExtractor.extract_skills_basic(text)
+    return name, email, phone, skills, experience, education[:5]
+
+
+def main():
+    texts = load_test_texts()
+    print(f"{'text KB':>8}{'per-field ms':>14}{'extract_all ms':>16}{'heuristics only':>17}")
+    for copies in (1, 4, 16):
+        docs = ["\n".join([text] * copies) for text in texts]
+        size_kb = sum(len(doc) for doc in docs) / len(docs) / 1024
+        skills_ms = timeit(lambda: [TextExtractor.extract_skills_basic(doc) for doc in docs]) / len(docs)
+        before_ms = timeit(lambda: [legacy_per_field(doc) for doc in docs]) / len(docs)
+        after_ms = timeit(lambda: [TextExtractor.extract_all(doc) for doc in docs]) / len(docs)
+        print(
+            f"{size_kb:>8.1f}{before_ms:>14.3f}{after_ms:>16.3f}"
+            f"{f'{before_ms - skills_ms:.3f} -> {after_ms - skills_ms:.3f}':>17}"
+        )
+
+
+if __name__ == "__main__":
+    main()
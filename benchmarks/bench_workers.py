@@ -0,0 +1,166 @@
+"""
+Benchmark: API throughput and latency by number of uvicorn worker processes.
+Each run starts the server with --workers N, waits until every worker has
+warmed up, then drives a read-heavy dashboard mix (resume and job pages,
+full-text search, skill analytics) from CONCURRENCY concurrent clients.
+
+Uses MongoDB when MONGODB_URL is reachable. Otherwise every worker loads its
+own copy of a seeded memory-backend snapshot, which is fine for this
+read-only workload but not for serving (the memory backend is single-process).
+The load generator runs on the same machine and takes CPU from the workers.
+
+Usage:
+    python -m benchmarks.bench_workers
+"""
+import asyncio
+import os
+import shutil
+import socket
+import statistics
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+from typing import Dict, List
+
+import httpx
+
+from app.config import settings
+from app.database import MongoDB, ResumeDB, JobDB, ensure_indexes
+from benchmarks.bench_storage_backends import make_resumes
+
+BENCH_DB_NAME = "resume_screener_bench_workers"
+RESUMES = 2_000
+JOBS = 100
+CONCURRENCY = 32
+DURATION_SECONDS = 10
+ENDPOINTS = (
+    "/api/resumes?limit=50",
+    "/api/jobs?limit=50",
+    "/api/resumes/search?q=python%20developer",
+    "/api/analytics/skills",
+)
+
+
+def worker_counts() -> List[int]:
+    cores = os.cpu_count() or 1
+    return sorted({1, 2, cores, cores * 2})
+
+
+async def seed(backend: str, snapshot_path: str) -> bool:
+    """Fill the benchmark database; False if the backend is unreachable."""
+    settings.storage_backend = backend
+    settings.memory_storage_path = snapshot_path
+    settings.mongodb_db_name = BENCH_DB_NAME
+    settings.mongodb_server_selection_timeout_ms = 2000
+    try:
+        await MongoDB.connect_db()
+    except Exception:
+        return False
+    try:
+        if backend == "mongodb":
+            await MongoDB.client.drop_database(BENCH_DB_NAME)
+        await ensure_indexes()
+        await ResumeDB.create_resumes(make_resumes(RESUMES))
+        for i in range(JOBS):
+            await JobDB.create_job({
+                "title": f"Backend Engineer {i}",
+                "description": "We are hiring a backend engineer with Python, FastAPI and MongoDB experience. " * 4,
+                "requirements": ["Required Skills: Python, FastAPI, MongoDB"]
+            })
+    finally:
+        await MongoDB.close_db()  # Writes the memory snapshot
+    return True
+
+
+def free_port() -> int:
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        return s.getsockname()[1]
+
+
+def start_server(workers: int, port: int, env: Dict[str, str]) -> subprocess.Popen:
+    """Start uvicorn and return once every worker has printed its warmup line."""
+    process = subprocess.Popen(
+        [sys.executable, "-m", "uvicorn", "app.main:app", "--host", "127.0.0.1", "--port", str(port),
+         "--workers", str(workers), "--log-level", "warning"],
+        env=env, stdout=subprocess.PIPE, stderr=subprocess.STDOUT, text=True
+    )
+    warmed = threading.Semaphore(0)
+
+    def watch():
+        for line in process.stdout:
+            if "warmed up" in line:
+                warmed.release()
+
+    threading.Thread(target=watch, daemon=True).start()
+    for _ in range(workers):
+        if not warmed.acquire(timeout=120):
+            process.terminate()
+            raise RuntimeError(f"Server with {workers} worker(s) did not start")
+    return process
+
+
+async def drive(port: int) -> Dict[str, float]:
+    """Run the request mix for DURATION_SECONDS; requests/s and latency percentiles."""
+    latencies = []
+    errors = 0
+    deadline = time.perf_counter() + DURATION_SECONDS
+
+    async def client_loop(client: httpx.AsyncClient, offset: int):
+        nonlocal errors
+        i = offset
+        while time.perf_counter() < deadline:
+            start = time.perf_counter()
+            response = await client.get(ENDPOINTS[i % len(ENDPOINTS)])
+            latencies.append(time.perf_counter() - start)
+            errors += response.status_code != 200
+            i += 1
+
+    limits = httpx.Limits(max_connections=CONCURRENCY, max_keepalive_connections=CONCURRENCY)
+    async with httpx.AsyncClient(base_url=f"http://127.0.0.1:{port}", limits=limits,
+                                 headers={"Accept-Encoding": "gzip"}, timeout=30) as client:
+        await asyncio.gather(*(client_loop(client, i) for i in range(CONCURRENCY)))
+
+    latencies.sort()
+    return {
+        "rps": len(latencies) / DURATION_SECONDS,
+        "p50_ms": statistics.median(latencies) * 1000,
+        "p99_ms": latencies[int(len(latencies) * 0.99) - 1] * 1000,
+        "errors": errors
+    }
+
+
+def main():
+    snapshot_path = tempfile.mkdtemp(prefix="bench_workers_")
+    backend = "mongodb" if asyncio.run(seed("mongodb", "")) else "memory"
+    if backend == "memory":
+        asyncio.run(seed("memory", snapshot_path))
+
+    print(f"{backend} backend, {os.cpu_count()} CPU core(s), {CONCURRENCY} concurrent clients\n")
+    print(f"{'workers':>8}{'req/s':>10}{'p50 ms':>9}{'p99 ms':>9}{'errors':>8}")
+    try:
+        for workers in worker_counts():
+            run_path = tempfile.mkdtemp(prefix="bench_workers_run_")
+            shutil.copytree(snapshot_path, run_path, dirs_exist_ok=True)
+            env = {
+                **os.environ, "STORAGE_BACKEND": backend, "MEMORY_STORAGE_PATH": run_path,
+                "MONGODB_DB_NAME": BENCH_DB_NAME, "DEBUG": "false", "ENRICHMENT_WORKERS": "1"
+            }
+            port = free_port()
+            process = start_server(workers, port, env)
+            try:
+                result = asyncio.run(drive(port))
+            finally:
+                process.terminate()
+                process.wait(timeout=60)
+                shutil.rmtree(run_path, ignore_errors=True)
+            print(f"{workers:>8}{result['rps']:>10.0f}{result['p50_ms']:>9.1f}"
+                  f"{result['p99_ms']:>9.1f}{result['errors']:>8}")
+    finally:
+        shutil.rmtree(snapshot_path, ignore_errors=True)
+
+
+if __name__ == "__main__":
+    main()
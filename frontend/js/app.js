@@ -1,5 +1,6 @@
 // ===== Configuration =====
 const API_BASE_URL = 'http://localhost:8000';
+const PAGE_SIZE = 50;  // Items per /api/resumes and /api/jobs page
 
 // ===== State Management =====
 const state = {
@@ -10,6 +11,26 @@ const state = {
     currentMatchResults: null  // Store match results for theme switching
 };
 
+// ===== Conditional Fetch =====
+// Last body and ETag per URL; unchanged lists come back as an empty 304
+const responseCache = new Map();
+
+async function fetchJSONConditional(url) {
+    const cached = responseCache.get(url);
+    const headers = cached ? { 'If-None-Match': cached.etag } : {};
+    const response = await fetch(url, { headers });
+
+    if (response.status === 304 && cached) {
+        return cached.data;
+    }
+    const data = await response.json();
+    const etag = response.headers.get('ETag');
+    if (response.ok && etag) {
+        responseCache.set(url, { etag, data });
+    }
+    return data;
+}
+
 // ===== Initialization =====
 document.addEventListener('DOMContentLoaded', () => {
     initializeApp();
@@ -158,7 +179,10 @@ async function uploadResume(file) {
         if (response.ok) {
             // Extract just success message without ID
             const cleanMessage = data.message.split('.')[0]; // Get text before ID
-            showResult(resultEl, `✓ Resume uploaded and parsed successfully!`, 'success');
+            const detail = data.status === 'pending'
+                ? 'AI analysis is running in the background.'
+                : 'Details extracted.';
+            showResult(resultEl, `✓ Resume uploaded! ${detail}`, 'success');
             showToast('Resume uploaded successfully!', 'success');
             loadResumes();
         } else {
@@ -219,15 +243,19 @@ async function handleJobSubmit(e) {
 }
 
 // ===== Load Resumes =====
-async function loadResumes() {
+async function loadResumes(cursor = null) {
     const listEl = document.getElementById('resumes-list');
-    listEl.innerHTML = '<div class="loading"><i class="fas fa-spinner fa-spin"></i> Loading...</div>';
+    if (!cursor) {
+        listEl.innerHTML = '<div class="loading"><i class="fas fa-spinner fa-spin"></i> Loading...</div>';
+    }
 
     try {
-        const response = await fetch(`${API_BASE_URL}/api/resumes`);
-        const data = await response.json();
+        const params = new URLSearchParams({ limit: PAGE_SIZE });
+        if (cursor) params.set('cursor', cursor);
+        const data = await fetchJSONConditional(`${API_BASE_URL}/api/resumes?${params}`);
 
-        state.resumes = data.resumes || [];
+        const page = data.resumes || [];
+        state.resumes = cursor ? state.resumes.concat(page) : page;
 
         if (state.resumes.length === 0) {
             listEl.innerHTML = `
@@ -239,7 +267,8 @@ async function loadResumes() {
             return;
         }
 
-        listEl.innerHTML = state.resumes.map(resume => createResumeCard(resume)).join('');
+        listEl.innerHTML = state.resumes.map(resume => createResumeCard(resume)).join('')
+            + loadMoreButton('loadResumes', data.next_cursor);
     } catch (error) {
         listEl.innerHTML = `
             <div class="empty-state">
@@ -250,15 +279,93 @@ async function loadResumes() {
     }
 }
 
+// ===== Resume Search =====
+async function searchResumes(offset = 0) {
+    const query = document.getElementById('resume-search').value.trim();
+    if (!query) {
+        loadResumes();
+        return;
+    }
+
+    const listEl = document.getElementById('resumes-list');
+    if (offset === 0) {
+        listEl.innerHTML = '<div class="loading"><i class="fas fa-spinner fa-spin"></i> Searching...</div>';
+    }
+
+    try {
+        const params = new URLSearchParams({ q: query, limit: PAGE_SIZE, offset });
+        const response = await fetch(`${API_BASE_URL}/api/resumes/search?${params}`);
+        const data = await response.json();
+        if (!response.ok) throw new Error(data.detail || 'Search failed');
+
+        const cards = data.results.map(result => createSearchResultCard(result)).join('');
+        const nextOffset = offset + data.results.length;
+        const more = nextOffset < data.total
+            ? `<button class="btn btn-small" style="width: 100%; margin-top: 12px;" onclick="this.remove(); searchResumes(${nextOffset})">Load more</button>`
+            : '';
+
+        if (offset === 0) {
+            listEl.innerHTML = data.total === 0
+                ? `<div class="empty-state"><i class="fas fa-search"></i><p>No resumes match "${escapeHtml(query)}"</p></div>`
+                : `<div style="font-size: 13px; color: var(--text-secondary); margin-bottom: 8px;">${data.total} match(es)</div>` + cards + more;
+        } else {
+            listEl.insertAdjacentHTML('beforeend', cards + more);
+        }
+    } catch (error) {
+        listEl.innerHTML = `
+            <div class="empty-state">
+                <i class="fas fa-exclamation-circle"></i>
+                <p>Error searching resumes</p>
+            </div>
+        `;
+    }
+}
+
+function createSearchResultCard(result) {
+    return `
+        <div class="item-card" onclick="openResumeDetails('${result.resume_id}')">
+            <div class="item-header">
+                <div>
+                    <div class="item-title">${escapeHtml(result.name || result.filename)}</div>
+                    <p style="font-size: 13px; color: var(--text-secondary); margin-top: 8px;">
+                        ${escapeHtml(result.snippet)}
+                    </p>
+                </div>
+            </div>
+            <div class="item-meta">
+                ${result.skills.slice(0, 3).map(skill => `<span class="tag">${escapeHtml(skill)}</span>`).join('')}
+            </div>
+        </div>
+    `;
+}
+
+function escapeHtml(value) {
+    const div = document.createElement('div');
+    div.textContent = value ?? '';
+    return div.innerHTML;
+}
+
+// Button that fetches the next page, or nothing on the last page
+function loadMoreButton(loader, nextCursor) {
+    if (!nextCursor) return '';
+    return `
+        <button class="btn btn-small" style="width: 100%; margin-top: 12px;" onclick="${loader}('${nextCursor}')">
+            Load more
+        </button>
+    `;
+}
+
 function createResumeCard(resume) {
     const parsed = resume.parsed_data || {};
     const name = parsed.name || 'Unknown Candidate';
     const email = parsed.email || 'No email';
     const skills = parsed.skills?.slice(0, 3) || [];
     const date = new Date(resume.upload_date).toLocaleDateString();
+    const status = resume.status || 'ready';
+    const statusTag = status === 'ready' ? '' : `<span class="tag">${status === 'pending' ? 'AI analysis pending' : 'AI analysis failed'}</span>`;
 
     return `
-        <div class="item-card" onclick='viewResumeDetails(${JSON.stringify(resume).replace(/'/g, "&apos;")})'>
+        <div class="item-card" onclick="openResumeDetails('${resume._id}')">
             <div class="item-header">
                 <div>
                     <div class="item-title">${name}</div>
@@ -271,6 +378,7 @@ function createResumeCard(resume) {
             <div class="item-meta">
                 ${skills.map(skill => `<span class="tag">${skill}</span>`).join('')}
                 ${skills.length > 0 ? '' : '<span class="tag">No skills extracted</span>'}
+                ${statusTag}
                 <button class="btn-delete" onclick="event.stopPropagation(); deleteResume('${resume._id}')">
                     <i class="fas fa-trash"></i> Delete
                 </button>
@@ -280,15 +388,19 @@ function createResumeCard(resume) {
 }
 
 // ===== Load Jobs =====
-async function loadJobs() {
+async function loadJobs(cursor = null) {
     const listEl = document.getElementById('jobs-list');
-    listEl.innerHTML = '<div class="loading"><i class="fas fa-spinner fa-spin"></i> Loading...</div>';
+    if (!cursor) {
+        listEl.innerHTML = '<div class="loading"><i class="fas fa-spinner fa-spin"></i> Loading...</div>';
+    }
 
     try {
-        const response = await fetch(`${API_BASE_URL}/api/jobs`);
-        const data = await response.json();
+        const params = new URLSearchParams({ limit: PAGE_SIZE });
+        if (cursor) params.set('cursor', cursor);
+        const data = await fetchJSONConditional(`${API_BASE_URL}/api/jobs?${params}`);
 
-        state.jobs = data.jobs || [];
+        const page = data.jobs || [];
+        state.jobs = cursor ? state.jobs.concat(page) : page;
 
         if (state.jobs.length === 0) {
             listEl.innerHTML = `
@@ -300,7 +412,8 @@ async function loadJobs() {
             return;
         }
 
-        listEl.innerHTML = state.jobs.map(job => createJobCard(job)).join('');
+        listEl.innerHTML = state.jobs.map(job => createJobCard(job)).join('')
+            + loadMoreButton('loadJobs', data.next_cursor);
     } catch (error) {
         listEl.innerHTML = `
             <div class="empty-state">
@@ -313,10 +426,10 @@ async function loadJobs() {
 
 function createJobCard(job) {
     const date = new Date(job.created_date).toLocaleDateString();
-    const descriptionPreview = job.description.slice(0, 150) + '...';
+    const descriptionPreview = (job.description_preview || '') + '...';
 
     return `
-        <div class="item-card" style="cursor: pointer;" onclick='viewJobDetails(${JSON.stringify(job)})'>
+        <div class="item-card" style="cursor: pointer;" onclick="openJobDetails('${job._id}')">
             <div class="item-header">
                 <div>
                     <div class="item-title">${job.title}</div>
@@ -373,16 +486,25 @@ async function deleteJob(id) {
 }
 
 // ===== Matching =====
-function populateJobSelector() {
+// Every job, not just the pages loaded in the jobs tab
+async function populateJobSelector() {
     const select = document.getElementById('job-select');
+    const selected = select.value;
     select.innerHTML = '<option value="">Choose a job description...</option>';
 
-    state.jobs.forEach(job => {
-        const option = document.createElement('option');
-        option.value = job._id;
-        option.textContent = job.title;
-        select.appendChild(option);
-    });
+    try {
+        const data = await fetchJSONConditional(`${API_BASE_URL}/api/jobs/options`);
+        (data.jobs || []).forEach(job => {
+            const option = document.createElement('option');
+            option.value = job._id;
+            option.textContent = job.title;
+            select.appendChild(option);
+        });
+        select.value = selected;  // Cleared if that job is gone
+        document.getElementById('start-matching-btn').disabled = !select.value;
+    } catch (error) {
+        showToast('Failed to load job descriptions', 'error');
+    }
 }
 
 async function startMatching() {
@@ -655,6 +777,17 @@ function toggleMatchDetails(index) {
 }
 
 // ===== Resume Details Modal =====
+// List pages carry summaries only; fetch the full resume for the modal
+async function openResumeDetails(id) {
+    try {
+        const response = await fetch(`${API_BASE_URL}/api/resumes/${id}`);
+        if (!response.ok) throw new Error('Failed to load resume');
+        viewResumeDetails(await response.json());
+    } catch (error) {
+        showToast('Error loading resume details', 'error');
+    }
+}
+
 function viewResumeDetails(resume) {
     const modal = document.getElementById('resume-modal');
     const modalBody = document.getElementById('modal-body');
@@ -716,6 +849,17 @@ document.getElementById('resume-modal').addEventListener('click', (e) => {
     }
 });
 
+// Fetch the full job (list pages carry a description preview only)
+async function openJobDetails(id) {
+    try {
+        const response = await fetch(`${API_BASE_URL}/api/jobs/${id}`);
+        if (!response.ok) throw new Error('Failed to load job');
+        viewJobDetails(await response.json());
+    } catch (error) {
+        showToast('Error loading job details', 'error');
+    }
+}
+
 // View job details in modal
 function viewJobDetails(job) {
     const modal = document.getElementById('job-modal');
@@ -0,0 +1,24 @@
+# Shared pytest configuration
+import os
+
+import pytest
+
+# Settings are read when app.config is first imported; tests never call the LLM
+# and run against a fresh in-RAM memory backend, never a real database
+os.environ.setdefault("GEMINI_API_KEY", "test")
+os.environ["STORAGE_BACKEND"] = "memory"
+os.environ["MEMORY_STORAGE_PATH"] = ""
+os.environ["LLM_PRELOAD"] = "false"
+
+
+@pytest.fixture
+def client(tmp_path, monkeypatch):
+    """API client on an empty memory database; uploaded files go to tmp_path."""
+    from fastapi.testclient import TestClient
+
+    from app.database.blob_store import blob_store
+    from app.main import app
+
+    monkeypatch.setattr(blob_store, "root", str(tmp_path / "blobs"))
+    with TestClient(app) as test_client:
+        yield test_client
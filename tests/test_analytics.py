@@ -0,0 +1,71 @@
+# Unit tests for the aggregation analytics endpoints
+import pytest
+
+from app.database import MongoDB
+from app.services.skill_matcher import get_skill_matcher
+
+MATCHES = [
+    {"job_id": "j1", "job_title": "Backend", "resume_id": "r1", "score": 9.5,
+     "recommendation": "Strong Match", "missing_qualifications": []},
+    {"job_id": "j1", "job_title": "Backend", "resume_id": "r2", "score": 10.0,
+     "recommendation": "Strong Match", "missing_qualifications": ["Kubernetes"]},
+    {"job_id": "j1", "job_title": "Backend", "resume_id": "r3", "score": 4.2,
+     "recommendation": "Weak Match", "missing_qualifications": ["Kubernetes", "AWS"]},
+    {"job_id": "j2", "job_title": "Frontend", "resume_id": "r1", "score": 6.0,
+     "missing_qualifications": ["React"]},
+]
+
+
+@pytest.fixture
+def matches(client):
+    client.portal.call(MongoDB.get_collection("matches").insert_many, [dict(match) for match in MATCHES])
+
+
+def test_score_histogram_includes_empty_buckets_and_perfect_scores(client, matches):
+    response = client.get("/api/analytics/jobs/j1/score-histogram", params={"bucket_width": 2.5}).json()
+    assert response["total"] == 3
+    assert [(bucket["min"], bucket["max"], bucket["count"]) for bucket in response["buckets"]] == [
+        (0.0, 2.5, 0), (2.5, 5.0, 1), (5.0, 7.5, 0), (7.5, 10.0, 2)
+    ]
+
+
+def test_recommendations_fall_back_to_unknown(client, matches):
+    overall = client.get("/api/analytics/recommendations").json()["distribution"]
+    assert overall == [
+        {"recommendation": "Strong Match", "count": 2},
+        {"recommendation": "Unknown", "count": 1},
+        {"recommendation": "Weak Match", "count": 1},
+    ]
+    frontend = client.get("/api/analytics/recommendations", params={"job_id": "j2"}).json()
+    assert frontend == {"job_id": "j2", "distribution": [{"recommendation": "Unknown", "count": 1}]}
+
+
+def test_missing_qualifications_are_ranked_and_limited(client, matches):
+    response = client.get("/api/analytics/missing-qualifications", params={"limit": 2}).json()
+    assert response["qualifications"] == [
+        {"qualification": "Kubernetes", "count": 2}, {"qualification": "AWS", "count": 1}
+    ]
+    frontend = client.get("/api/analytics/missing-qualifications", params={"job_id": "j2"}).json()
+    assert frontend["qualifications"] == [{"qualification": "React", "count": 1}]
+
+
+def test_candidate_counts_per_job(client, matches):
+    assert client.get("/api/analytics/jobs").json()["jobs"] == [
+        {"job_id": "j1", "job_title": "Backend", "candidates": 3, "average_score": 7.9, "top_score": 10.0},
+        {"job_id": "j2", "job_title": "Frontend", "candidates": 1, "average_score": 6.0, "top_score": 6.0},
+    ]
+
+
+def test_skill_frequency_names_known_skills(client):
+    matcher = get_skill_matcher()
+    client.portal.call(MongoDB.get_collection("resumes").insert_many, [
+        {"filename": "a.txt", "skill_ids": ["python", "docker"]},
+        {"filename": "b.txt", "skill_ids": ["python", "retired-skill"]},
+        {"filename": "c.txt"},
+    ])
+    skills = client.get("/api/analytics/skills").json()["skills"]
+    assert skills == [
+        {"skill_id": "python", "name": matcher.name("python"), "count": 2},
+        {"skill_id": "docker", "name": matcher.name("docker"), "count": 1},
+        {"skill_id": "retired-skill", "name": "retired-skill", "count": 1},
+    ]
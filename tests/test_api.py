@@ -1 +1,169 @@
 # Unit tests for API endpoints
+from app.database import JobDB, MatchDB, MongoDB, ResumeDB
+
+RESUME_TEXT = """Jane Roe
+jane.roe@example.com | +1 555 010 2030
+
+Summary
+Backend engineer building APIs in Python with FastAPI and MongoDB.
+
+Experience
+Senior Engineer, Acme Corp, 2019 - 2024
+Built Python services on Kubernetes and PostgreSQL.
+
+Skills
+Python, FastAPI, MongoDB, Docker, Kubernetes, PostgreSQL
+
+Education
+BSc Computer Science, State University, 2018
+"""
+
+
+def create_resumes(client, count):
+    result = client.portal.call(ResumeDB.create_resumes, [
+        {"filename": f"resume_{i}.txt", "text_content": f"Candidate {i} knows Python",
+         "parsed_data": {"name": f"Candidate {i}", "skills": ["Python"]}, "status": "ready"}
+        for i in range(count)
+    ])
+    return result["inserted_ids"]
+
+
+def create_job(client, title="Backend Engineer"):
+    return client.portal.call(JobDB.create_job, {
+        "title": title,
+        "description": "We are hiring a backend engineer with Python and MongoDB experience.",
+        "requirements": ["Required Skills: Python, MongoDB"]
+    })
+
+
+def test_health(client):
+    response = client.get("/health")
+    assert response.status_code == 200
+    assert response.json()["status"] == "healthy"
+    assert response.json()["database"] == "connected"
+
+
+def test_upload_confident_resume_is_ready_without_llm(client):
+    response = client.post(
+        "/api/upload-resume", files={"file": ("jane.txt", RESUME_TEXT.encode(), "text/plain")}
+    )
+    assert response.status_code == 202
+    assert response.json()["status"] == "ready"
+    resume_id = response.json()["resume_id"]
+
+    resume = client.get(f"/api/resumes/{resume_id}").json()
+    assert resume["parsed_data"]["email"] == "jane.roe@example.com"
+    assert "Kubernetes" in resume["parsed_data"]["skills"]
+
+    hits = client.get("/api/resumes/search", params={"q": "kubernetes"}).json()
+    assert [hit["resume_id"] for hit in hits["results"]] == [resume_id]
+
+
+def test_unsupported_upload_is_rejected(client):
+    response = client.post("/api/upload-resume", files={"file": ("jane.exe", b"MZ", "application/octet-stream")})
+    assert response.status_code == 400
+
+
+def test_resume_pages_follow_the_cursor(client):
+    resume_ids = create_resumes(client, 5)
+    seen, cursor = [], None
+    while True:
+        params = {"limit": 2, **({"cursor": cursor} if cursor else {})}
+        page = client.get("/api/resumes", params=params).json()
+        seen.extend(resume["_id"] for resume in page["resumes"])
+        cursor = page["next_cursor"]
+        if cursor is None:
+            break
+    assert seen == list(reversed(resume_ids))  # Newest first, each once
+    assert page["total"] == 5
+
+
+def test_old_resume_documents_are_upgraded_when_listed(client):
+    collection = MongoDB.get_collection("resumes")
+    client.portal.call(collection.insert_one, {
+        "filename": "legacy.pdf", "text_content": "Legacy Lee, COBOL programmer",
+        "upload_date": "2023-05-01T00:00:00+00:00",
+        "parsed_data": {"name": "Legacy Lee", "email": None, "skills": None,
+                        "certifications": [{"name": "CKA", "issuer": "CNCF", "year": 2023}]}
+    })
+
+    response = client.get("/api/resumes")
+    assert response.status_code == 200
+    [resume] = response.json()["resumes"]
+    assert resume["parsed_data"]["skills"] == [] and resume["status"] == "ready"
+    assert resume["parsed_data"]["certifications"] == [] and "text_content" not in resume  # Not listed
+
+    stored = client.portal.call(collection.find_one, {})
+    assert stored["schema_version"] == 4 and "text_content" not in stored
+    assert stored["parsed_data"]["certifications"] == ["CKA (CNCF, 2023)"]
+    hits = client.get("/api/resumes/search", params={"q": "cobol"}).json()["results"]
+    assert [hit["resume_id"] for hit in hits] == [resume["_id"]]
+
+
+def test_invalid_cursor_is_a_bad_request(client):
+    assert client.get("/api/resumes", params={"cursor": "!!!"}).status_code == 400
+
+
+def test_job_list_revalidates_with_etag(client):
+    create_job(client)
+    first = client.get("/api/jobs")
+    etag = first.headers["etag"]
+    assert first.json()["total"] == 1
+
+    assert client.get("/api/jobs", headers={"If-None-Match": etag}).status_code == 304
+    create_job(client, "Data Engineer")
+    second = client.get("/api/jobs", headers={"If-None-Match": etag})
+    assert second.status_code == 200
+    assert second.headers["etag"] != etag
+
+
+def test_job_options_list_every_job(client):
+    job_ids = [create_job(client, f"Job {i}") for i in range(60)]
+    page = client.get("/api/jobs", params={"limit": 50}).json()
+    options = client.get("/api/jobs/options").json()["jobs"]
+    assert len(page["jobs"]) == 50
+    assert [option["_id"] for option in options] == list(reversed(job_ids))
+    assert options[0]["title"] == "Job 59"
+
+
+def test_matches_for_unknown_job(client):
+    assert client.get(f"/api/matches/{'0' * 24}").status_code == 404
+
+
+def test_stored_matches_are_served_by_score(client):
+    job_id = create_job(client)
+    client.portal.call(MatchDB.upsert_matches, [
+        {"job_id": job_id, "resume_id": resume_id, "candidate_name": name, "score": score,
+         "matching_points": [], "missing_qualifications": [], "strengths": [],
+         "justification": "", "resume_filename": f"{name}.pdf", "job_title": "Backend Engineer"}
+        for resume_id, name, score in [("r1", "Ann", 6.5), ("r2", "Bob", 9.0)]
+    ])
+    matches = client.get(f"/api/matches/{job_id}").json()["matches"]
+    assert [(match["candidate_name"], match["score"]) for match in matches] == [("Bob", 9.0), ("Ann", 6.5)]
+
+
+def test_old_match_documents_are_upgraded_when_served(client):
+    job_id = create_job(client)
+    collection = MongoDB.get_collection("matches")
+    client.portal.call(collection.insert_many, [
+        {"job_id": job_id, "resume_id": "r1", "candidate_name": None, "score": 14},
+        {"job_id": job_id, "resume_id": "r2", "candidate_name": "Bob", "score": "7.5",
+         "justification": "Solid", "timestamp": "2024-01-01T00:00:00+00:00"},
+    ])
+
+    response = client.get(f"/api/matches/{job_id}")
+    assert response.status_code == 200
+    matches = response.json()["matches"]
+    assert [(match["candidate_name"], match["score"]) for match in matches] == [("Unknown", 10.0), ("Bob", 7.5)]
+    assert matches[0]["timestamp"] and matches[0]["matching_points"] == []
+
+    async def stored_versions():
+        return [match["schema_version"] async for match in collection.find({})]
+    assert client.portal.call(stored_versions) == [2, 2]
+
+
+def test_large_lists_are_compressed(client):
+    create_resumes(client, 50)
+    response = client.get("/api/resumes", params={"limit": 50}, headers={"Accept-Encoding": "gzip"})
+    assert response.headers["content-encoding"] == "gzip"
+    assert len(response.json()["resumes"]) == 50
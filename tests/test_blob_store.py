@@ -0,0 +1,63 @@
+# Unit tests for original file storage and its lifecycle
+import os
+
+from app.database import MongoDB, ResumeDB
+from app.database.blob_store import blob_store
+from tests.test_api import RESUME_TEXT
+
+
+def upload(client, filename="jane.txt", content=RESUME_TEXT.encode()):
+    return client.post("/api/upload-resume", files={"file": (filename, content, "text/plain")})
+
+
+def stored_files():
+    return sorted(name for _, _, names in os.walk(blob_store.root) for name in names)
+
+
+def test_identical_uploads_share_one_blob_until_the_last_is_deleted(client):
+    first = upload(client).json()["resume_id"]
+    second = upload(client, "copy.txt").json()["resume_id"]
+    digest = blob_store.content_hash(RESUME_TEXT.encode())
+    assert client.get(f"/api/resumes/{first}").json()["content_hash"] == digest
+    assert stored_files() == [digest]
+
+    assert client.delete(f"/api/resumes/{first}").status_code == 200
+    assert stored_files() == [digest]
+    assert client.delete(f"/api/resumes/{second}").status_code == 200
+    assert stored_files() == []
+
+
+def test_bulk_delete_keeps_blobs_still_referenced(client):
+    shared = [upload(client, f"{i}.txt").json()["resume_id"] for i in range(2)]
+    other = upload(client, "other.txt", (RESUME_TEXT + "Golang\n").encode()).json()["resume_id"]
+
+    assert client.portal.call(ResumeDB.delete_resumes, [shared[0], other])["deleted"] == 2
+    assert stored_files() == [blob_store.content_hash(RESUME_TEXT.encode())]
+
+
+def test_failed_insert_stores_no_blob(client, monkeypatch):
+    async def failing_insert(resume_data):
+        raise RuntimeError("insert failed")
+    monkeypatch.setattr(ResumeDB, "create_resume", failing_insert)
+
+    assert upload(client).status_code == 500
+    assert stored_files() == []
+
+
+def test_blob_referenced_during_release_is_restored(client, monkeypatch):
+    resume_id = upload(client).json()["resume_id"]
+    digest = blob_store.content_hash(RESUME_TEXT.encode())
+    collection = MongoDB.get_collection("resumes")
+    client.portal.call(collection.delete_one, {})
+    detach = blob_store.detach
+
+    async def detach_then_upload(content_hash):
+        detached = await detach(content_hash)
+        # An upload of the same file inserts its resume after the reference check
+        await collection.insert_one({"filename": "late.txt", "content_hash": content_hash})
+        return detached
+    monkeypatch.setattr(blob_store, "detach", detach_then_upload)
+
+    client.portal.call(ResumeDB.release_blobs, [digest])
+    assert stored_files() == [digest]
+    assert client.get(f"/api/resumes/{resume_id}").status_code == 404
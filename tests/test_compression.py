@@ -0,0 +1,71 @@
+# Unit tests for negotiated response compression
+import gzip
+
+import pytest
+from starlette.applications import Starlette
+from starlette.responses import JSONResponse, PlainTextResponse
+from starlette.routing import Route
+from starlette.testclient import TestClient
+
+from app.api.compression import CompressionMiddleware, compress, negotiate_encoding
+
+BOTH = ["br", "gzip"]
+
+
+@pytest.mark.parametrize("accept_encoding, expected", [
+    (None, None),
+    ("", None),
+    ("gzip", "gzip"),
+    ("gzip, deflate, br", "br"),  # Ties go to the preferred coding
+    ("br;q=0.5, gzip", "gzip"),
+    ("GZIP;q=0.8", "gzip"),
+    ("*", "br"),
+    ("*;q=0.2, br;q=0", "gzip"),
+    ("gzip;q=0, br;q=0", None),
+    ("gzip;q=oops", None),
+    ("deflate, identity", None),
+])
+def test_negotiate_encoding(accept_encoding, expected):
+    assert negotiate_encoding(accept_encoding, BOTH) == expected
+
+
+def test_only_offered_codings_are_chosen():
+    assert negotiate_encoding("br, gzip;q=0.1", ["gzip"]) == "gzip"
+
+
+def test_gzip_is_deterministic():
+    body = b'{"items": []}' * 50
+    assert compress(body, "gzip") == compress(body, "gzip")
+    assert gzip.decompress(compress(body, "gzip", level=1)) == body
+    with pytest.raises(ValueError):
+        compress(body, "deflate")
+
+
+@pytest.fixture
+def client():
+    items = {"items": ["resume"] * 200}
+    app = Starlette(routes=[
+        Route("/large", lambda request: JSONResponse(items)),
+        Route("/small", lambda request: JSONResponse({"ok": True})),
+        Route("/text", lambda request: PlainTextResponse("resume " * 200)),
+    ])
+    app.add_middleware(CompressionMiddleware, minimum_size=500)
+    return TestClient(app)
+
+
+def test_large_json_is_compressed(client):
+    response = client.get("/large", headers={"Accept-Encoding": "gzip"})
+    assert response.headers["content-encoding"] == "gzip"
+    assert int(response.headers["content-length"]) < len(response.content)
+    assert response.headers["vary"] == "Accept-Encoding"
+    assert response.json() == {"items": ["resume"] * 200}
+
+
+@pytest.mark.parametrize("path, accept_encoding", [
+    ("/small", "gzip"),
+    ("/large", "identity"),
+    ("/text", "gzip"),
+])
+def test_other_responses_pass_through(client, path, accept_encoding):
+    response = client.get(path, headers={"Accept-Encoding": accept_encoding})
+    assert "content-encoding" not in response.headers
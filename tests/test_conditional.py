@@ -0,0 +1,22 @@
+# Unit tests for conditional GET helpers
+import pytest
+
+from app.api.conditional import etag_matches
+
+ETAG = 'W/"5f1c-42"'
+
+
+@pytest.mark.parametrize("if_none_match", [
+    'W/"5f1c-42"',
+    '"5f1c-42"',  # Weak comparison ignores W/
+    '"other", W/"5f1c-42"',
+    ' W/"5f1c-42" ',
+    "*",
+])
+def test_matching_tags(if_none_match):
+    assert etag_matches(if_none_match, ETAG)
+
+
+@pytest.mark.parametrize("if_none_match", [None, "", 'W/"5f1c-41"', '"5f1c-42-gzip"', "5f1c-42"])
+def test_non_matching_tags(if_none_match):
+    assert not etag_matches(if_none_match, ETAG)
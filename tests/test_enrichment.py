@@ -0,0 +1,147 @@
+# Unit tests for background resume enrichment
+import time
+
+import pytest
+
+from app.config import settings
+from app.database import ResumeDB
+from app.services import enrichment
+from app.services.enrichment import EnrichmentWorker, enrichment_worker, needs_llm
+from app.services.text_extractor import HeuristicResult
+from tests.test_api import RESUME_TEXT
+
+WEAK_RESUME = b"Worked on several projects over the years in different teams and roles.\n"
+
+
+class FakeLLMService:
+    def __init__(self, error=None):
+        self.error = error
+        self.calls = 0
+
+    async def extract_structured_data(self, text):
+        self.calls += 1
+        if self.error:
+            raise self.error
+        return {"name": "Pat Lee", "email": "pat@example.com", "skills": ["Python"], "technical_skills": ["Docker"]}
+
+
+@pytest.fixture
+def llm(monkeypatch):
+    """The LLM service the enrichment worker gets; set .error to make it fail."""
+    service = FakeLLMService()
+
+    async def load():
+        return service
+    monkeypatch.setattr(enrichment, "load_enhanced_llm_service", load)
+    return service
+
+
+def wait_for_status(client, resume_id, status, timeout=5.0):
+    deadline = time.monotonic() + timeout
+    while True:
+        resume = client.get(f"/api/resumes/{resume_id}").json()
+        if resume["status"] == status or time.monotonic() > deadline:
+            return resume
+        time.sleep(0.02)
+
+
+def test_weak_resume_is_enriched_in_the_background(client, llm):
+    response = client.post("/api/upload-resume", files={"file": ("pat.txt", WEAK_RESUME, "text/plain")})
+    assert response.status_code == 202 and response.json()["status"] == "pending"
+
+    resume = wait_for_status(client, response.json()["resume_id"], "ready")
+    assert resume["status"] == "ready" and llm.calls == 1
+    assert resume["parsed_data"]["email"] == "pat@example.com"
+    assert {"python", "docker"} <= set(resume["skill_ids"])
+
+
+def test_failed_llm_extraction_marks_the_resume_failed(client, llm):
+    llm.error = RuntimeError("quota exceeded")
+    response = client.post("/api/upload-resume", files={"file": ("pat.txt", WEAK_RESUME, "text/plain")})
+
+    resume = wait_for_status(client, response.json()["resume_id"], "failed")
+    assert resume["status"] == "failed" and resume["error"] == "quota exceeded"
+
+
+def test_llm_values_win_and_heuristics_fill_gaps():
+    merged = EnrichmentWorker.merge_parsed_data(
+        {"name": "Pat Lee", "email": "pat@example.com", "skills": ["Go"]},
+        {"name": "Patricia Lee", "email": None, "skills": [], "education": []}
+    )
+    assert merged == {"name": "Patricia Lee", "email": "pat@example.com", "skills": ["Go"],
+                      "phone": None, "education": []}
+
+
+def test_sweep_queues_resumes_stored_pending_elsewhere(client, llm):
+    # As stored by `python -m app.ingest --skip-llm` while the server runs
+    resume_id = client.portal.call(ResumeDB.create_resume, {
+        "filename": "pat.txt", "text_content": WEAK_RESUME.decode(), "parsed_data": {}, "status": "pending"
+    })
+    assert client.portal.call(enrichment_worker.sweep) == 1
+    assert wait_for_status(client, resume_id, "ready")["status"] == "ready"
+    assert client.portal.call(enrichment_worker.sweep) == 0
+
+
+COMPLETE = {"name": "Jane Roe", "email": "jane@example.com", "skills": ["Python"]}
+
+
+@pytest.mark.parametrize("fields, confidence, expected", [
+    (COMPLETE, 0.9, False),
+    (COMPLETE, 0.8, False),  # The threshold itself is confident enough
+    (COMPLETE, 0.79, True),
+    ({**COMPLETE, "email": None}, 0.95, True),
+    ({**COMPLETE, "skills": []}, 0.95, True),
+])
+def test_llm_is_needed_below_the_threshold_or_without_required_fields(fields, confidence, expected):
+    assert needs_llm(HeuristicResult(**fields, confidence=confidence)) is expected
+
+
+def test_required_fields_and_threshold_are_configurable(monkeypatch):
+    heuristics = HeuristicResult(**{**COMPLETE, "skills": []}, confidence=0.5)
+    monkeypatch.setattr(settings, "llm_required_fields", "name, email")
+    monkeypatch.setattr(settings, "llm_extraction_threshold", 0.5)
+    assert not needs_llm(heuristics)
+
+
+def test_extraction_stats_count_uploads_served_without_llm(client, llm):
+    statuses = [
+        client.post("/api/upload-resume", files={"file": (filename, content, "text/plain")}).json()
+        for filename, content in [("jane.txt", RESUME_TEXT.encode()), ("pat.txt", WEAK_RESUME)]
+    ]
+    assert [upload["status"] for upload in statuses] == ["ready", "pending"]
+    wait_for_status(client, statuses[1]["resume_id"], "ready")
+    assert llm.calls == 1  # Only the weak resume went to the LLM
+
+    stats = client.get("/api/stats/extraction").json()
+    assert (stats["total"], stats["heuristic"], stats["llm"], stats["heuristic_share"]) == (2, 1, 1, 0.5)
+
+
+def store_pending(client):
+    return client.portal.call(ResumeDB.create_resume, {
+        "filename": "pat.txt", "text_content": WEAK_RESUME.decode(), "parsed_data": {}, "status": "pending"
+    })
+
+
+def test_only_one_worker_process_claims_a_resume(client):
+    resume_id = store_pending(client)
+    claim = ResumeDB.claim_for_enrichment
+    assert client.portal.call(claim, resume_id, "pending", 60)
+    assert not client.portal.call(claim, resume_id, "pending", 60)  # Held by the first claim
+    assert not client.portal.call(claim, resume_id, "ready", 60)
+
+
+def test_expired_lease_is_claimed_again(client):
+    resume_id = store_pending(client)
+    claim = ResumeDB.claim_for_enrichment
+    assert client.portal.call(claim, resume_id, "pending", -1)  # A worker that died mid-enrichment
+    assert client.portal.call(claim, resume_id, "pending", 60)
+    assert not client.portal.call(claim, resume_id, "pending", 60)
+
+
+def test_resume_leased_elsewhere_is_not_sent_to_the_llm(client, llm):
+    resume_id = store_pending(client)
+    assert client.portal.call(ResumeDB.claim_for_enrichment, resume_id, "pending", 60)
+
+    client.portal.call(enrichment_worker.enrich_resume, resume_id)
+    assert llm.calls == 0
+    assert client.get(f"/api/resumes/{resume_id}").json()["status"] == "pending"
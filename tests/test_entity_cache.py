@@ -0,0 +1,118 @@
+# Unit tests for the entity cache
+import asyncio
+import time
+
+import pytest
+
+from app.database.entity_cache import EntityCache
+
+
+def loader(document):
+    async def load():
+        return document
+    return load
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    now = [1000.0]
+    monkeypatch.setattr(time, "monotonic", lambda: now[0])
+    return now
+
+
+def test_least_recently_used_entry_is_evicted():
+    cache = EntityCache(max_entries=2, ttl_seconds=60)
+    cache.put("job", "a", {"title": "A"})
+    cache.put("job", "b", {"title": "B"})
+    assert cache.get("job", "a") == {"title": "A"}  # b is now least recently used
+    cache.put("job", "c", {"title": "C"})
+
+    assert cache.get("job", "b") is None
+    assert cache.get("job", "a") and cache.get("job", "c")
+    assert cache.metrics()["kinds"]["job"]["evictions"] == 1
+
+
+def test_entries_expire_after_ttl(clock):
+    cache = EntityCache(max_entries=10, ttl_seconds=30)
+    cache.put("job", "a", {"title": "A"})
+    clock[0] += 29
+    assert cache.get("job", "a") == {"title": "A"}
+    clock[0] += 2
+    assert cache.get("job", "a") is None
+    assert cache.metrics()["entries"] == 0
+
+
+def test_cached_copies_are_independent():
+    cache = EntityCache(max_entries=10, ttl_seconds=60)
+    document = {"skills": ["Python"]}
+    cache.put("resume", "a", document)
+    document["skills"].append("Go")
+    cache.get("resume", "a")["skills"].append("Rust")
+    assert cache.get("resume", "a") == {"skills": ["Python"]}
+
+
+def test_invalidate_drops_entries():
+    cache = EntityCache(max_entries=10, ttl_seconds=60)
+    for key in "abc":
+        cache.put("job", key, {"title": key})
+    cache.invalidate("job", "a", "b")
+    assert cache.get("job", "a") is None and cache.get("job", "b") is None
+    assert cache.get("job", "c") == {"title": "c"}
+
+
+def test_read_through_loads_once_and_skips_missing():
+    cache = EntityCache(max_entries=10, ttl_seconds=60)
+    loads = []
+
+    async def load():
+        loads.append(1)
+        return {"title": "A"}
+
+    async def load_missing():
+        loads.append(1)
+        return None
+
+    async def scenario():
+        assert await cache.read_through("job", "a", load) == {"title": "A"}
+        assert await cache.read_through("job", "a", load) == {"title": "A"}
+        assert await cache.read_through("job", "b", load_missing) is None
+        assert await cache.read_through("job", "b", load_missing) is None
+
+    asyncio.run(scenario())
+    assert len(loads) == 3
+
+
+def test_document_invalidated_while_loading_is_not_cached():
+    cache = EntityCache(max_entries=10, ttl_seconds=60)
+
+    async def load_then_concurrent_write():
+        document = {"title": "Old"}
+        cache.invalidate("job", "a")  # Write lands after the read
+        return document
+
+    async def scenario():
+        assert await cache.read_through("job", "a", load_then_concurrent_write) == {"title": "Old"}
+        assert cache.get("job", "a") is None
+        assert await cache.read_through("job", "a", loader({"title": "New"})) == {"title": "New"}
+        assert cache.get("job", "a") == {"title": "New"}
+
+    asyncio.run(scenario())
+
+
+def test_request_scope_reads_each_document_once_even_when_disabled():
+    cache = EntityCache(max_entries=0, ttl_seconds=60)
+    loads = []
+
+    async def load():
+        loads.append(1)
+        return {"title": "A"}
+
+    async def scenario():
+        with cache.request_scope():
+            await cache.read_through("job", "a", load)
+            await cache.read_through("job", "a", load)
+        await cache.read_through("job", "a", load)
+
+    asyncio.run(scenario())
+    assert len(loads) == 2
+    assert cache.metrics()["kinds"]["job"]["scope_hits"] == 1
@@ -0,0 +1,46 @@
+# Unit tests for the bulk ingestion tool
+import os
+
+from app.database import ResumeDB
+from app.database.blob_store import blob_store
+from app.ingest import Checkpoint, Ingester
+from tests.test_api import RESUME_TEXT
+
+
+def ingester(directory, checkpoint_path):
+    return Ingester(directory=str(directory), checkpoint_path=str(checkpoint_path), workers=1,
+                    batch_size=10, llm_concurrency=1, llm_rate=0, skip_llm=True)
+
+
+def test_checkpoint_persists_done_and_failed_paths(tmp_path):
+    path = tmp_path / "checkpoint.json"
+    checkpoint = Checkpoint(str(path))
+    checkpoint.mark(["a.pdf"], {"b.pdf": "no meaningful text"})
+
+    reloaded = Checkpoint(str(path))
+    assert reloaded.done == {"a.pdf"} and reloaded.failed == {"b.pdf": "no meaningful text"}
+    reloaded.mark(["b.pdf"])
+    assert Checkpoint(str(path)).failed == {}
+
+
+def test_files_that_failed_to_parse_are_retried(client, tmp_path):
+    directory = tmp_path / "resumes"
+    directory.mkdir()
+    (directory / "jane.txt").write_text(RESUME_TEXT)
+    (directory / "short.txt").write_text("Too short")
+    checkpoint_path = tmp_path / "checkpoint.json"
+
+    first = ingester(directory, checkpoint_path)
+    client.portal.call(first.run)
+    assert first.stats["inserted"] == 1 and first.stats["parse_failed"] == 1
+    assert first.checkpoint.failed == {"short.txt": "no meaningful text"}
+
+    (directory / "short.txt").write_text(RESUME_TEXT.replace("Jane Roe", "John Roe"))
+    second = ingester(directory, checkpoint_path)
+    client.portal.call(second.run)
+    assert second.stats["skipped"] == 1 and second.stats["inserted"] == 1
+    assert second.checkpoint.done == {"jane.txt", "short.txt"} and second.checkpoint.failed == {}
+
+    resumes = client.portal.call(ResumeDB.get_all_resumes)
+    assert sorted(resume["filename"] for resume in resumes) == ["jane.txt", "short.txt"]
+    assert all(os.path.exists(blob_store.path_for(resume["content_hash"])) for resume in resumes)
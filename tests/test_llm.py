@@ -1 +1,77 @@
 # Unit tests for LLM service
+import asyncio
+import os
+import subprocess
+import sys
+import threading
+import time
+
+import pytest
+
+from app import warmup
+from app.config import settings
+from app.services import llm_service_enhanced
+
+HEAVY_MODULES = ("langchain_google_genai", "pdfplumber", "docx", "app.services.llm_service")
+
+
+class CountingService:
+    """Stands in for EnhancedLLMService; records how and where it is built."""
+    built = []
+
+    def __init__(self):
+        CountingService.built.append(threading.current_thread())
+
+
+@pytest.fixture
+def service_class(monkeypatch):
+    CountingService.built = []
+    monkeypatch.setattr(llm_service_enhanced, "EnhancedLLMService", CountingService)
+    monkeypatch.setattr(llm_service_enhanced, "_service", None)
+    return CountingService
+
+
+def test_importing_the_app_loads_no_llm_or_fallback_parser_modules():
+    script = f"import sys, app.main; print([m for m in {HEAVY_MODULES!r} if m in sys.modules])"
+    env = {**os.environ, "GEMINI_API_KEY": "test", "STORAGE_BACKEND": "memory", "MEMORY_STORAGE_PATH": ""}
+    result = subprocess.run([sys.executable, "-c", script], capture_output=True, text=True, env=env,
+                            cwd=os.path.dirname(os.path.dirname(os.path.abspath(__file__))), check=True)
+    assert result.stdout.strip() == "[]"
+
+
+def test_startup_without_preload_builds_no_llm_service(service_class, client):
+    # service_class is requested first, so it is patched before the app starts
+    assert client.get("/health").status_code == 200
+    assert service_class.built == []
+
+
+@pytest.fixture
+def preload(monkeypatch):
+    monkeypatch.setattr(settings, "llm_preload", True)
+    monkeypatch.setattr(warmup, "_llm_preload", None)
+
+
+def test_preload_builds_the_service_in_the_background(service_class, preload, client):
+    deadline = time.monotonic() + 5
+    while not service_class.built and time.monotonic() < deadline:
+        time.sleep(0.01)
+    assert len(service_class.built) == 1 and service_class.built[0] is not threading.main_thread()
+
+
+def test_concurrent_callers_share_one_service_built_off_the_event_loop(service_class):
+    async def load_many():
+        return await asyncio.gather(*(llm_service_enhanced.load_enhanced_llm_service() for _ in range(5)))
+
+    services = asyncio.run(load_many())
+    assert len(service_class.built) == 1 and service_class.built[0] is not threading.main_thread()
+    assert all(service is services[0] for service in services)
+    assert asyncio.run(llm_service_enhanced.load_enhanced_llm_service()) is services[0]
+
+
+def test_former_module_instance_is_built_on_first_access(service_class):
+    service = llm_service_enhanced.enhanced_llm_service
+    assert isinstance(service, CountingService)
+    assert llm_service_enhanced.get_enhanced_llm_service() is service
+    assert len(service_class.built) == 1
+    with pytest.raises(AttributeError):
+        llm_service_enhanced.no_such_service
@@ -0,0 +1,30 @@
+# Unit tests for storing match results
+from pymongo import IndexModel
+
+from app.config import settings
+from app.database import MatchDB, MongoDB
+from app.services.matcher import MatcherService
+
+
+async def fake_score_resume(resume, job):
+    return {"job_id": str(job["_id"]), "resume_id": str(resume["_id"]),
+            "candidate_name": resume["parsed_data"]["name"], "score": resume["score"]}
+
+
+def test_matches_whose_upsert_failed_are_reported_not_returned(client, monkeypatch):
+    monkeypatch.setattr(MatcherService, "score_resume", staticmethod(fake_score_resume))
+    monkeypatch.setattr(settings, "db_batch_size", 2)
+    # A second unique key makes the last upsert, in the second batch, fail
+    collection = MongoDB.get_collection("matches")
+    client.portal.call(collection.create_indexes, [IndexModel("candidate_name", name="name", unique=True)])
+
+    job = {"_id": "job1"}
+    resumes = [{"_id": f"r{i}", "parsed_data": {"name": name}, "score": score}
+               for i, (name, score) in enumerate([("Ann", 6.0), ("Sam", 9.0), ("Sam", 7.0)])]
+    matches, errors = client.portal.call(MatcherService.match_resumes, job, resumes)
+
+    assert [match["resume_id"] for match in matches] == ["r1", "r0"]
+    assert all("_id" in match for match in matches)
+    assert len(errors) == 1 and errors[0].startswith("r2: ")
+    stored = client.portal.call(MatchDB.get_matches_by_job, "job1")
+    assert sorted(match["resume_id"] for match in stored) == ["r0", "r1"]
@@ -0,0 +1,25 @@
+# Unit tests for page cursors
+import pytest
+from bson import ObjectId
+
+from app.database.mongodb import decode_cursor, encode_cursor
+
+
+def test_cursor_round_trip():
+    object_id = ObjectId()
+    cursor = encode_cursor(object_id)
+    assert len(cursor) == 16 and "=" not in cursor
+    assert decode_cursor(cursor) == object_id
+
+
+def test_cursor_is_url_safe():
+    object_id = ObjectId(b"\xfb\xff\xbf" * 4)
+    cursor = encode_cursor(object_id)
+    assert cursor == "-_-_-_-_-_-_-_-_"
+    assert decode_cursor(cursor) == object_id
+
+
+@pytest.mark.parametrize("cursor", ["", "a", "AAAA", "!!!!", encode_cursor(ObjectId()) + "AA"])
+def test_malformed_cursors_raise_value_error(cursor):
+    with pytest.raises(ValueError, match="Invalid cursor"):
+        decode_cursor(cursor)
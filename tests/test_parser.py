@@ -1 +1,187 @@
 # Unit tests for PDF/DOCX parser
+import io
+import zipfile
+
+import pytest
+
+from app.services.pdf_parser import DocumentParser
+
+NAMESPACES = (
+    'xmlns:w="http://schemas.openxmlformats.org/wordprocessingml/2006/main" '
+    'xmlns:mc="http://schemas.openxmlformats.org/markup-compatibility/2006" '
+    'xmlns:wps="http://schemas.microsoft.com/office/word/2010/wordprocessingShape" '
+    'xmlns:v="urn:schemas-microsoft-com:vml"'
+)
+
+
+def make_docx(body: str) -> bytes:
+    """A minimal DOCX whose word/document.xml holds body."""
+    buffer = io.BytesIO()
+    with zipfile.ZipFile(buffer, "w") as archive:
+        archive.writestr(
+            "word/document.xml",
+            f'<?xml version="1.0" encoding="UTF-8"?><w:document {NAMESPACES}><w:body>{body}</w:body></w:document>'
+        )
+    return buffer.getvalue()
+
+
+def paragraph(text: str) -> str:
+    return f"<w:p><w:r><w:t>{text}</w:t></w:r></w:p>"
+
+
+def cell(content: str, merge: str = "") -> str:
+    return f"<w:tc><w:tcPr>{merge}</w:tcPr>{content}</w:tc>"
+
+
+def text_box(text: str) -> str:
+    """A text box as Word writes it: the same content in mc:Choice and mc:Fallback."""
+    content = f"<w:txbxContent>{paragraph(text)}</w:txbxContent>"
+    return (
+        "<w:r><mc:AlternateContent>"
+        f"<mc:Choice Requires=\"wps\"><w:drawing><wps:txbx>{content}</wps:txbx></w:drawing></mc:Choice>"
+        f"<mc:Fallback><w:pict><v:textbox>{content}</v:textbox></w:pict></mc:Fallback>"
+        "</mc:AlternateContent></w:r>"
+    )
+
+
+def test_paragraphs_and_runs_in_document_order():
+    body = (
+        "<w:p><w:r><w:t>John</w:t></w:r><w:r><w:tab/><w:t>Doe</w:t></w:r></w:p>"
+        "<w:p><w:r><w:t>Line one</w:t><w:br/><w:t>Line two</w:t></w:r></w:p>"
+        + paragraph("Experience")
+    )
+    text = DocumentParser._parse_docx_stream(make_docx(body))
+    assert text == "John\tDoe\nLine one\nLine two\nExperience"
+
+
+def test_text_box_emitted_once_after_anchoring_paragraph():
+    body = (
+        f"<w:p><w:r><w:t>Header para</w:t></w:r>{text_box('John Doe TextBox')}</w:p>"
+        + paragraph("Summary")
+    )
+    text = DocumentParser._parse_docx_stream(make_docx(body))
+    assert text == "Header para\nJohn Doe TextBox\nSummary"
+
+
+def test_vertically_merged_cells_appear_once():
+    restart = '<w:vMerge w:val="restart"/>'
+    body = (
+        "<w:tbl>"
+        f"<w:tr>{cell(paragraph('Skills'), restart)}{cell(paragraph('Python'))}</w:tr>"
+        f"<w:tr>{cell(paragraph('Skills'), '<w:vMerge/>')}{cell(paragraph('Go'))}</w:tr>"
+        "</w:tbl>"
+    )
+    text = DocumentParser._parse_docx_stream(make_docx(body))
+    assert text.split("\n") == ["Skills", "Python", "Go"]
+
+
+def test_legacy_vml_text_box_is_read():
+    vml_box = f"<w:r><w:pict><v:textbox><w:txbxContent>{paragraph('Jane Roe')}</w:txbxContent></v:textbox></w:pict></w:r>"
+    body = f"<w:p>{vml_box}</w:p>" + paragraph("Summary")
+    assert DocumentParser._parse_docx_stream(make_docx(body)) == "Jane Roe\nSummary"
+
+
+def test_text_box_in_merged_cell_appears_once():
+    restart = '<w:vMerge w:val="restart"/>'
+    anchored = f"<w:p><w:r><w:t>Contact</w:t></w:r>{text_box('jane@example.com')}</w:p>"
+    body = (
+        "<w:tbl>"
+        f"<w:tr>{cell(anchored, restart)}{cell(paragraph('Python'))}</w:tr>"
+        f"<w:tr>{cell(anchored, '<w:vMerge/>')}{cell(paragraph('Go'))}</w:tr>"
+        "</w:tbl>"
+    )
+    text = DocumentParser._parse_docx_stream(make_docx(body))
+    assert text.split("\n") == ["Contact", "jane@example.com", "Python", "Go"]
+
+
+def renamed_main_part(docx_bytes: bytes) -> bytes:
+    """A valid DOCX whose main part is not word/document.xml, as some generators write it."""
+    source = zipfile.ZipFile(io.BytesIO(docx_bytes))
+    buffer = io.BytesIO()
+    with zipfile.ZipFile(buffer, "w") as archive:
+        for item in source.infolist():
+            data = source.read(item.filename)
+            if item.filename in ("[Content_Types].xml", "_rels/.rels"):
+                data = data.replace(b"word/document.xml", b"word/main.xml")
+            archive.writestr("word/main.xml" if item.filename == "word/document.xml" else item.filename, data)
+    return buffer.getvalue()
+
+
+def test_python_docx_is_the_fallback():
+    from docx import Document
+
+    document = Document()
+    document.add_paragraph("Jane Roe")
+    document.add_table(rows=1, cols=1).cell(0, 0).text = "Python"
+    saved = io.BytesIO()
+    document.save(saved)
+
+    text, report = DocumentParser.parse_docx_with_report(renamed_main_part(saved.getvalue()))
+    assert text == "Jane Roe\nPython"
+    assert report["engine"] == "python-docx" and report["reason"].startswith("docx-stream failed")
+
+
+def test_unreadable_docx_raises():
+    with pytest.raises(Exception, match="Failed to parse DOCX file"):
+        DocumentParser.parse_docx_with_report(b"not a zip")
+
+
+def test_parse_docx_reports_streaming_engine():
+    text, report = DocumentParser.parse_docx_with_report(make_docx(paragraph("Jane Roe")))
+    assert text == "Jane Roe"
+    assert report["engine"] == "docx-stream"
+
+
+GOOD_PAGE = "Senior engineer building Python services and APIs for payments. " * 5
+
+
+def test_quality_scores_flag_bad_extractions():
+    assert DocumentParser.score_text_quality(GOOD_PAGE, 1) == {
+        "chars_per_page": len(GOOD_PAGE), "garbage_ratio": 0.0, "broken_word_ratio": 0.0
+    }
+    garbled = DocumentParser.score_text_quality("(cid:3)(cid:4) resume", 1)
+    assert garbled["garbage_ratio"] > DocumentParser.MAX_GARBAGE_RATIO
+    spaced = DocumentParser.score_text_quality("S o f t w a r e engineer", 1)
+    assert spaced["broken_word_ratio"] == round(7 / 9, 4)  # "a" is a word
+
+
+@pytest.fixture
+def pdf_engines(monkeypatch):
+    """Stub PDF engines: set engines["pypdf"] to (text, pages) and engines["pdfplumber"] to text."""
+    engines = {"pypdf": (GOOD_PAGE, 1), "pdfplumber": "pdfplumber text"}
+
+    def engine(name):
+        def parse(file_content):
+            if isinstance(engines[name], Exception):
+                raise engines[name]
+            return engines[name]
+        return parse
+    monkeypatch.setattr(DocumentParser, "_parse_pdf_pypdf", staticmethod(engine("pypdf")))
+    monkeypatch.setattr(DocumentParser, "_parse_pdf_pdfplumber", staticmethod(engine("pdfplumber")))
+    return engines
+
+
+def test_pypdf_output_that_passes_quality_checks_is_kept(pdf_engines):
+    text, report = DocumentParser.parse_pdf_with_report(b"%PDF")
+    assert text == GOOD_PAGE and report["engine"] == "pypdf"
+
+
+@pytest.mark.parametrize("pypdf, reason", [
+    (("Jane Roe", 1), "low text density"),
+    ((GOOD_PAGE + "�" * 20, 1), "high garbage ratio"),
+    ((" ".join(GOOD_PAGE.replace(" ", "")), 1), "high broken word ratio"),
+    (ValueError("bad xref"), "pypdf failed: bad xref"),
+])
+def test_poor_pypdf_output_escalates_to_pdfplumber(pdf_engines, pypdf, reason):
+    pdf_engines["pypdf"] = pypdf
+    text, report = DocumentParser.parse_pdf_with_report(b"%PDF")
+    assert text == "pdfplumber text" and report["engine"] == "pdfplumber"
+    assert report["reason"].startswith(reason)
+
+
+def test_pypdf_output_is_kept_when_pdfplumber_fails(pdf_engines):
+    pdf_engines["pypdf"] = ("Jane Roe", 1)
+    pdf_engines["pdfplumber"] = ValueError("no layout")
+    text, report = DocumentParser.parse_pdf_with_report(b"%PDF")
+    assert text == "Jane Roe" and report["engine"] == "pypdf"
+    assert report["reason"].endswith("pdfplumber failed: no layout")
@@ -0,0 +1,73 @@
+# Unit tests for connection pool monitoring
+import threading
+from types import SimpleNamespace
+
+from app.database.pool_monitor import PoolMonitor
+
+PRIMARY = SimpleNamespace(address=("db1", 27017))
+SECONDARY = SimpleNamespace(address=("db2", 27017))
+
+
+def check_out(monitor, server, count, complete=True):
+    for _ in range(count):
+        monitor.connection_check_out_started(server)
+        if complete:
+            monitor.connection_checked_out(server)
+
+
+def test_checkouts_wait_only_beyond_free_connections():
+    monitor = PoolMonitor()
+    for _ in range(2):
+        monitor.connection_created(PRIMARY)
+    check_out(monitor, PRIMARY, 2)
+    check_out(monitor, PRIMARY, 1, complete=False)  # Pool exhausted
+
+    assert monitor.snapshot(max_pool_size=2) == {"size": 2, "in_use": 2, "wait_queue": 1}
+    assert monitor.snapshot(max_pool_size=10)["wait_queue"] == 0
+    assert monitor.snapshot(max_pool_size=0)["wait_queue"] == 0  # Unlimited
+
+
+def test_checkouts_in_progress_below_the_limit_are_not_waiting():
+    monitor = PoolMonitor()
+    check_out(monitor, PRIMARY, 3, complete=False)
+    assert monitor.snapshot(max_pool_size=5)["wait_queue"] == 0
+
+
+def test_waiting_is_computed_per_server():
+    monitor = PoolMonitor()
+    check_out(monitor, PRIMARY, 2)
+    check_out(monitor, PRIMARY, 1, complete=False)
+    check_out(monitor, SECONDARY, 1, complete=False)
+    assert monitor.snapshot(max_pool_size=2) == {"size": 0, "in_use": 2, "wait_queue": 1}
+
+
+def test_check_ins_failures_and_closed_pools_release_counts():
+    monitor = PoolMonitor()
+    monitor.connection_created(PRIMARY)
+    check_out(monitor, PRIMARY, 1)
+    monitor.connection_check_out_started(PRIMARY)
+    monitor.connection_check_out_failed(PRIMARY)
+    monitor.connection_checked_in(PRIMARY)
+    monitor.connection_checked_in(PRIMARY)  # Never below zero
+    assert monitor.snapshot(max_pool_size=1) == {"size": 1, "in_use": 0, "wait_queue": 0}
+
+    check_out(monitor, SECONDARY, 2)
+    monitor.pool_closed(SECONDARY)
+    assert monitor.snapshot(max_pool_size=1) == {"size": 1, "in_use": 0, "wait_queue": 0}
+
+
+def test_counts_are_consistent_under_concurrent_events():
+    monitor = PoolMonitor()
+
+    def churn():
+        for _ in range(2000):
+            monitor.connection_check_out_started(PRIMARY)
+            monitor.connection_checked_out(PRIMARY)
+            monitor.connection_checked_in(PRIMARY)
+
+    threads = [threading.Thread(target=churn) for _ in range(4)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert monitor.snapshot(max_pool_size=1) == {"size": 0, "in_use": 0, "wait_queue": 0}
@@ -0,0 +1,38 @@
+# Unit tests for compressed resume text storage
+from bson import ObjectId
+
+from app.database import MongoDB, ResumeDB
+from app.database.schema import compress_text, decompress_text
+from tests.test_api import RESUME_TEXT
+
+UNICODE_TEXT = "Zoë Ångström — Müller GmbH, 東京\n\tC++ / C# / Go\n" * 40
+
+
+def test_compress_round_trip():
+    for text in ("", RESUME_TEXT, UNICODE_TEXT):
+        assert decompress_text(compress_text(text)) == text
+    assert len(compress_text(UNICODE_TEXT)) < len(UNICODE_TEXT.encode()) / 5
+
+
+def test_text_is_stored_compressed_off_the_resume(client):
+    resume_id = client.portal.call(ResumeDB.create_resume, {
+        "filename": "zoe.txt", "text_content": UNICODE_TEXT, "parsed_data": {"name": "Zoë"}
+    })
+    stored = client.portal.call(MongoDB.get_collection("resumes").find_one, {"_id": ObjectId(resume_id)})
+    text_doc = client.portal.call(MongoDB.get_collection("resume_texts").find_one, {"_id": ObjectId(resume_id)})
+    assert "text_content" not in stored
+    assert decompress_text(text_doc["text_z"]) == UNICODE_TEXT
+
+    assert client.portal.call(ResumeDB.get_resume_text, resume_id) == UNICODE_TEXT
+    assert client.get(f"/api/resumes/{resume_id}").json()["text_content"] == UNICODE_TEXT
+
+
+def test_embedded_text_of_legacy_resumes_is_still_read(client):
+    collection = MongoDB.get_collection("resumes")
+    legacy = client.portal.call(collection.insert_one, {"filename": "old.txt", "text_content": RESUME_TEXT})
+    new_id = client.portal.call(ResumeDB.create_resume, {"filename": "new.txt", "text_content": UNICODE_TEXT})
+    legacy_id = str(legacy.inserted_id)
+
+    assert client.portal.call(ResumeDB.get_resume_text, legacy_id) == RESUME_TEXT
+    texts = client.portal.call(ResumeDB.get_resume_texts, [legacy_id, new_id, str(ObjectId())])
+    assert texts == {legacy_id: RESUME_TEXT, new_id: UNICODE_TEXT}
@@ -0,0 +1,123 @@
+# Unit tests for document schema versions and migrations
+from datetime import datetime, timezone
+
+from bson import ObjectId
+from pymongo import UpdateOne
+
+from app.database.schema import (
+    SCHEMA_VERSIONS, UNSET, apply_migrations, compress_text, migration_inputs,
+    migration_update, outdated_filter, stamp_new
+)
+
+
+def v1_resume(**fields):
+    return {
+        "_id": ObjectId(),
+        "filename": "jane.pdf",
+        "text_content": "Jane Roe, Python developer. Python and Go.",
+        "parsed_data": {
+            "name": "Jane Roe",
+            "skills": ["Python", "Go"],
+            "technical_skills": None,
+            "certifications": [{"name": "CKA", "issuer": "CNCF", "year": 2023}, "AWS SA"],
+            "experience": [{"title": "Engineer", "company": None}],
+            "total_experience_years": 4.6,
+        },
+        **fields
+    }
+
+
+def test_resume_v1_upgrades_to_current_shape():
+    resume = v1_resume()
+    update, _ = migration_update("resumes", resume)
+
+    assert update == UpdateOne({"_id": resume["_id"], "schema_version": {"$exists": False}}, {
+        "$set": {
+            "parsed_data.certifications": ["CKA (CNCF, 2023)", "AWS SA"],
+            "parsed_data.experience": [{"title": "Engineer", "company": ""}],
+            "parsed_data.technical_skills": [],
+            "parsed_data.total_experience_years": 5,
+            "schema_version": SCHEMA_VERSIONS["resumes"],
+        },
+        "$unset": {"text_content": ""}
+    })
+    # The reader's copy is upgraded in place
+    assert "text_content" not in resume
+    assert resume["parsed_data"]["technical_skills"] == []
+
+
+def test_resume_text_and_search_fields_move_to_resume_texts():
+    resume = v1_resume()
+    _, side_writes = migration_update("resumes", resume)
+
+    assert side_writes == [
+        ("resume_texts", UpdateOne({"_id": resume["_id"]}, {"$set": {
+            "text_z": compress_text("Jane Roe, Python developer. Python and Go."),
+            "terms": "jane roe python developer and go",
+            "name": "Jane Roe", "skills": ["Python", "Go"], "filename": "jane.pdf",
+        }}, upsert=True)),
+    ]
+
+
+def test_partial_upgrade_only_runs_later_migrations():
+    resume = {"_id": ObjectId(), "schema_version": 3, "filename": "a.pdf",
+              "parsed_data": {"name": "Ann", "certifications": [{"name": "CKA"}]}}
+    update, side_writes = migration_update("resumes", resume)
+    assert update == UpdateOne(
+        {"_id": resume["_id"], "schema_version": 3}, {"$set": {"schema_version": SCHEMA_VERSIONS["resumes"]}}
+    )
+    assert side_writes == [("resume_texts", UpdateOne(
+        {"_id": resume["_id"]}, {"$set": {"name": "Ann", "skills": [], "filename": "a.pdf"}}, upsert=True
+    ))]
+    assert migration_inputs("resumes", 3) == {"text_content"}
+    assert migration_inputs("resumes", 4) == set()
+
+
+def test_current_documents_are_left_alone():
+    assert migration_update("resumes", {"_id": ObjectId(), "schema_version": SCHEMA_VERSIONS["resumes"]}) is None
+
+
+def test_stamp_new_normalizes_and_is_idempotent():
+    job = stamp_new("jobs", {"title": "Engineer", "requirements": {
+        "required_skills": ["Python", "Go"], "experience_required": "3 years"
+    }})
+    assert job["requirements"] == ["Required Skills: Python, Go", "Experience: 3 years"]
+    assert job["schema_version"] == SCHEMA_VERSIONS["jobs"]
+    assert apply_migrations("jobs", dict(job)) == {"requirements": job["requirements"]}
+
+
+def test_old_matches_take_the_served_shape():
+    match_id = ObjectId.from_datetime(datetime(2024, 5, 1, tzinfo=timezone.utc))
+    match = {"_id": match_id, "job_id": "j", "resume_id": "r", "candidate_name": None,
+             "score": 14, "justification": None, "matching_points": ["a", 3]}
+    changes = apply_migrations("matches", match)
+    assert changes == {
+        "score": 10.0,
+        "candidate_name": "Unknown",
+        "justification": "",
+        "resume_filename": "",
+        "job_title": "",
+        "matching_points": ["a", "3"],
+        "missing_qualifications": [],
+        "strengths": [],
+        "timestamp": "2024-05-01T00:00:00+00:00",
+    }
+    assert apply_migrations("matches", match) == {}
+
+
+def test_match_scores_are_clamped_floats():
+    assert apply_migrations("matches", {"score": "7.5"})["score"] == 7.5
+    assert apply_migrations("matches", {"score": "n/a"})["score"] == 0.0
+    assert apply_migrations("matches", {"score": -1})["score"] == 0.0
+
+
+def test_migration_changes_can_unset_fields():
+    changes = apply_migrations("resumes", {"text_content": "x"}, from_version=3)
+    assert changes == {"text_content": UNSET}
+
+
+def test_outdated_filter_matches_missing_and_old_versions():
+    assert outdated_filter("matches") == {"$or": [
+        {"schema_version": {"$exists": False}},
+        {"schema_version": {"$lt": SCHEMA_VERSIONS["matches"]}}
+    ]}
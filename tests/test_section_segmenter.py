@@ -0,0 +1,57 @@
+# Unit tests for resume section segmentation
+from app.services.section_segmenter import SectionSegmenter
+
+RESUME = (
+    "Jane Roe\n"
+    "jane@example.com\n"
+    "\n"
+    "PROFESSIONAL SUMMARY\n"
+    "Backend engineer.\n"
+    "Work Experience:\n"
+    "Acme Corp, 2019-2024\n"
+    "• Skills & Tools\n"
+    "Python, Go\n"
+    "Education\n"
+    "BSc Computer Science\n"
+)
+
+
+def texts(text, sections):
+    return [(section["name"], text[section["start"]:section["end"]]) for section in sections]
+
+
+def test_segments_at_heading_lines_in_document_order():
+    sections = SectionSegmenter.segment(RESUME)
+    assert texts(RESUME, sections) == [
+        ("contact", "Jane Roe\njane@example.com\n\n"),
+        ("summary", "Backend engineer.\n"),
+        ("experience", "Acme Corp, 2019-2024\n"),
+        ("skills", "Python, Go\n"),
+        ("education", "BSc Computer Science\n"),
+    ]
+
+
+def test_heading_words_inside_sentences_do_not_split():
+    text = "Jane Roe\nExperience with Python and education in CS\n"
+    assert texts(text, SectionSegmenter.segment(text)) == [("contact", text)]
+
+
+def test_empty_sections_are_dropped():
+    text = "Skills\nEducation\nMIT"
+    assert texts(text, SectionSegmenter.segment(text)) == [("education", "MIT")]
+
+
+def test_section_text_joins_named_sections():
+    sections = SectionSegmenter.segment(RESUME)
+    assert SectionSegmenter.section_text(RESUME, sections, "skills", "education") == (
+        "Python, Go\nBSc Computer Science"
+    )
+    assert SectionSegmenter.section_text(RESUME, None, "skills") == ""
+
+
+def test_labeled_text_orders_sections_canonically():
+    labeled = SectionSegmenter.labeled_text(RESUME, SectionSegmenter.segment(RESUME))
+    assert labeled.split("\n\n")[-2:] == ["[EDUCATION]\nBSc Computer Science", "[SKILLS]\nPython, Go"]
+    assert SectionSegmenter.labeled_text("no headings here", [{"name": "contact", "start": 0, "end": 16}]) == (
+        "no headings here"
+    )
@@ -0,0 +1,47 @@
+# Unit tests for trusted response serialization
+import pytest
+from pydantic import ValidationError
+
+from app.api.schemas import JobListResponse, JobOptionsResponse, MatchListResponse, ResumeListResponse
+from app.api.serialization import trusted_dump
+
+RESUME = {
+    "_id": "65f0c0ffee0000000000000a", "filename": "jane.pdf", "upload_date": "2024-03-01T09:00:00+00:00",
+    "status": "ready", "file_type": "pdf", "file_size": 48213, "content_hash": "ab12",
+    "parsed_data": {"name": "Jane Roe", "email": "jane@example.com", "phone": None, "skills": ["Python", "Go"]},
+}
+JOB = {
+    "_id": "65f0c0ffee0000000000000b", "title": "Backend Engineer",
+    "description_preview": "We are hiring", "created_date": "2024-03-02T09:00:00+00:00", "schema_version": 2,
+}
+MATCH = {
+    "_id": "65f0c0ffee0000000000000c", "resume_id": RESUME["_id"], "job_id": JOB["_id"],
+    "candidate_name": "Jane Roe", "score": 8.5, "matching_points": ["Python"], "missing_qualifications": [],
+    "strengths": ["APIs"], "justification": "Strong fit", "resume_filename": "jane.pdf",
+    "job_title": "Backend Engineer", "timestamp": "2024-03-03T09:00:00+00:00", "recommendation": "Strong Match",
+}
+
+
+@pytest.mark.parametrize("model, content", [
+    (ResumeListResponse, {"resumes": [RESUME, {**RESUME, "status": "failed", "error": "Unreadable"}],
+                          "total": 2, "next_cursor": "ZfDA_-4AAAAAAAAA"}),
+    (JobListResponse, {"jobs": [JOB], "total": 1}),
+    (JobOptionsResponse, {"jobs": [{"_id": JOB["_id"], "title": JOB["title"]}]}),
+    (MatchListResponse, {"matches": [MATCH], "total": 1, "job_id": JOB["_id"], "job_title": "Backend Engineer"}),
+    (MatchListResponse, {"matches": [], "total": 0, "job_id": JOB["_id"], "errors": ["r1: Timed out"]}),
+])
+def test_trusted_dump_matches_pydantic(model, content):
+    assert trusted_dump(model, content) == model.model_validate(content).model_dump(mode="json", by_alias=True)
+
+
+def test_documents_that_do_not_fit_are_validated():
+    # Field names instead of aliases: copying misses _id, validation accepts id
+    match = {("id" if key == "_id" else key): value for key, value in MATCH.items()}
+    content = {"matches": [match], "total": 1, "job_id": JOB["_id"]}
+    assert trusted_dump(MatchListResponse, content)["matches"][0]["_id"] == MATCH["_id"]
+
+    incomplete = {key: value for key, value in MATCH.items() if key != "strengths"}
+    with pytest.raises(ValidationError):
+        trusted_dump(MatchListResponse, {"matches": [incomplete], "total": 1, "job_id": JOB["_id"]})
+    with pytest.raises(ValidationError):
+        trusted_dump(JobListResponse, {"jobs": [{**JOB, "title": None}, None], "total": 2})
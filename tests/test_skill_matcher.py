@@ -0,0 +1,78 @@
+# Unit tests for the taxonomy skill matcher
+import pytest
+
+from app.services.skill_matcher import SkillMatcher, get_skill_matcher
+
+TAXONOMY = {
+    "react": {"name": "React", "category": "framework", "aliases": ["reactjs"]},
+    "react-native": {"name": "React Native", "category": "framework", "aliases": []},
+    "java": {"name": "Java", "category": "language", "aliases": []},
+    "javascript": {"name": "JavaScript", "category": "language", "aliases": ["js"]},
+    "c": {"name": "C", "category": "language", "aliases": [], "exact_case": ["C"]},
+    "cpp": {"name": "C++", "category": "language", "aliases": []},
+    "go": {"name": "Go", "category": "language", "aliases": ["golang"], "exact_case": ["Go"]},
+    "kubernetes": {"name": "Kubernetes", "category": "devops", "aliases": ["k8s"]},
+}
+
+
+@pytest.fixture
+def matcher():
+    return SkillMatcher(TAXONOMY)
+
+
+def test_spans_are_offsets_into_normalized_text(matcher):
+    text = "Built  apps with\tReactJS"
+    spans = matcher.find_spans(text)
+    assert spans == [(16, 23, "react")]
+    assert "Built apps with ReactJS"[16:23] == "ReactJS"
+
+
+def test_overlaps_resolve_leftmost_longest(matcher):
+    assert matcher.find("React Native and React") == ["react-native", "react"]
+
+
+def test_mentions_need_token_boundaries(matcher):
+    assert matcher.find("JavaScript") == ["javascript"]
+    assert matcher.find("C++, Java") == ["cpp", "java"]
+    assert matcher.find("Googled it") == []
+
+
+def test_exact_case_forms_only_match_their_case(matcher):
+    assert matcher.find("Languages: go, c") == []
+    assert matcher.find("Languages: Go, C") == ["go", "c"]
+
+
+@pytest.mark.parametrize("text", [
+    "I can Go to the store tomorrow",
+    "Managed the R&D and C&D budgets",
+    "Go team",
+])
+def test_exact_case_forms_need_a_context_cue(matcher, text):
+    assert matcher.find(text) == []
+
+
+@pytest.mark.parametrize("text, expected", [
+    ("Skills: Go, C", ["go", "c"]),
+    ("Skills\nGo\nKubernetes", ["go", "kubernetes"]),
+    ("Wrote services in Go on Kubernetes", ["go", "kubernetes"]),
+    ("Golang, C++", ["go", "cpp"]),
+])
+def test_exact_case_forms_with_a_context_cue(matcher, text, expected):
+    assert matcher.find(text) == expected
+
+
+def test_canonicalize_maps_synonyms_and_free_text(matcher):
+    assert matcher.canonicalize(["js", "K8S", "Go programming", "COBOL", None]) == [
+        "javascript", "kubernetes", "go"
+    ]
+
+
+def test_bitset_sets_one_bit_per_taxonomy_index(matcher):
+    bits = matcher.to_bits(["react", "go", "unknown"])
+    assert len(bits) == matcher.bitset_size == 1
+    assert bits == bytes([0b10000010])
+
+
+def test_bundled_taxonomy_compiles():
+    matcher = get_skill_matcher()
+    assert matcher.find("Python, FastAPI and MongoDB") == ["python", "fastapi", "mongodb"]
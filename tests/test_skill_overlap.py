@@ -0,0 +1,51 @@
+# Unit tests for bitset skill overlap scoring
+import random
+
+from app.database import ResumeDB
+from app.services.skill_matcher import SkillMatcher, get_skill_matcher
+from app.services.skill_overlap import bits_matrix, skill_overlap
+from tests.test_api import create_job
+
+TAXONOMY = {skill_id: {"name": skill_id} for skill_id in ("python", "go", "sql", "docker", "aws", "react", "java", "c", "rust")}
+
+
+def test_bit_i_is_the_skill_at_taxonomy_position_i():
+    matcher = SkillMatcher(TAXONOMY)
+    assert matcher.bitset_size == 2
+    assert matcher.to_bits(["python"]) == b"\x80\x00"
+    assert matcher.to_bits(["go", "rust", "unknown"]) == b"\x40\x80"
+
+
+def test_overlap_equals_set_intersection():
+    matcher = SkillMatcher(TAXONOMY)
+    rng = random.Random(3)
+    job = rng.sample(list(TAXONOMY), 4)
+    resumes = [rng.sample(list(TAXONOMY), rng.randint(0, len(TAXONOMY))) for _ in range(50)]
+
+    matrix = bits_matrix([matcher.to_bits(skills) for skills in resumes], matcher.bitset_size)
+    matched, job_count = skill_overlap(matcher.to_bits(job), matrix)
+    assert job_count == 4
+    assert matched.tolist() == [len(set(job) & set(skills)) for skills in resumes]
+
+
+def test_bitsets_stored_before_the_taxonomy_grew_are_padded():
+    matrix = bits_matrix([b"\xc0", b"", b"\xff\x80\x01"], 2)
+    assert matrix.tolist() == [[0xC0, 0], [0, 0], [0xFF, 0x80]]
+    matched, _ = skill_overlap(b"\x80\x80", matrix)
+    assert matched.tolist() == [1, 0, 2]
+
+
+def test_resumes_are_ranked_by_overlap_with_the_job(client):
+    matcher = get_skill_matcher()
+    resumes = {"few": ["python"], "most": ["python", "mongodb"], "none": ["react"]}
+    ids = client.portal.call(ResumeDB.create_resumes, [
+        {"filename": f"{name}.txt", "text_content": name, **matcher.to_document_fields(skills)}
+        for name, skills in resumes.items()
+    ])["inserted_ids"]
+    by_id = dict(zip(ids, resumes))
+
+    response = client.get(f"/api/jobs/{create_job(client)}/skill-overlap").json()
+    assert response["job_skill_count"] == 2  # Python, MongoDB
+    assert [(by_id[result["resume_id"]], result["coverage"]) for result in response["results"]] == [
+        ("most", 1.0), ("few", 0.5), ("none", 0.0)
+    ]